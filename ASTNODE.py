@@ -3,6 +3,10 @@
 #  Course:  CSC386 Fall 2021
 # Purpose:  AST Node Class
 # History:
+#           2026-10-18, TP, added ASSIGNMENT_OPERATORS
+#           2026-10-18, TP, added append_child(); render_tree() draws the tree without recursion
+#           2026-10-18, TP, added SlotNode, statements(), to_records() and from_records()
+#           2026-10-18, TP, added node_count()
 #           2024-03-12, DMW, modified to make print value more concise
 #           2024-02-27, DMW, modified to print node value information if present for render_tree()
 #           2024-02-12, DMW, modified for CSC486 Compiler Design & Implementation
@@ -15,7 +19,7 @@
 #
 #           Copyright (2023) Deanna M. Wilborne
 
-from anytree import NodeMixin, RenderTree
+from anytree import NodeMixin
 from Common import Common
 from sys import platform
 
@@ -76,10 +80,17 @@ class ASTNODE(NodeMixin):
         output_str += " }"
         return output_str
 
+    # 2026-10-18, TP, add a child after the existing ones without rebuilding the children tuple
+    def append_child(self, child) -> None:
+        child.parent = self
+
     # 2024-02-12, DMW, added class static method
+    # 2026-10-18, TP, anytree's RenderTree recurses, draw the same picture with an explicit stack
     @staticmethod
     def render_tree(tree) -> None:
-        for pre, fill, node in RenderTree(tree):
+        pending = [(tree, "", "")]
+        while pending:
+            node, pre, fill = pending.pop()
             # print(str(node))
             # print("node value={}".format(node.value))
             if node.value is None:
@@ -87,6 +98,110 @@ class ASTNODE(NodeMixin):
             else:
                 node_info = node.name + "(" + str(node.value) + ")"
             print("%s%s" % (pre, node_info))
+            last = len(node.children) - 1
+            for position in range(last, -1, -1):
+                if position == last:
+                    pending.append((node.children[position], fill + "└── ", fill + "    "))
+                else:
+                    pending.append((node.children[position], fill + "├── ", fill + "│   "))
+
+
+# 2026-10-18, TP, an AST node with the same constructor, fields and printing as ASTNODE, kept in __slots__ with a
+# plain list of children instead of anytree's bookkeeping; assigning .children sets the parent of each child
+class SlotNode:
+    __slots__ = ("name", "value", "parent", "_children", "line", "index")
+    version = "2026-10-18"
+
+    def __init__(self, name: str, value=None, parent=None, children=None, line=None, index=None) -> None:
+        self.name = name
+        self.value = value
+        self.parent = parent
+        self.line = line
+        self.index = index
+        self._children = ()  # leaves share the empty tuple
+        if parent is not None:
+            parent._children = list(parent._children) + [self]
+        if children is not None:
+            self.children = children
+
+    # the list itself, not a copy; assign a new list to change it
+    @property
+    def children(self):
+        return self._children
+
+    @children.setter
+    def children(self, children) -> None:
+        for child in self._children:
+            child.parent = None
+        self._children = list(children)
+        for child in self._children:
+            child.parent = self
+
+    def append_child(self, child) -> None:
+        if type(self._children) is tuple:
+            self._children = list(self._children)
+        self._children.append(child)
+        child.parent = self
+
+    safe_value = ASTNODE.safe_value
+    __str__ = ASTNODE.__str__
+    render_tree = staticmethod(ASTNODE.render_tree)
+
+
+# the AST node classes the parser can build, see CompilerSession
+AST_BACKENDS = {"anytree": ASTNODE, "slots": SlotNode}
+
+# 2026-10-18, TP, the values of an assign node that stores a value: "=" assigns, ":=" declares (VAR); any other
+# value is a comparison operator
+ASSIGNMENT_OPERATORS = ("=", ":=")
+
+
+# 2026-10-18, TP, the statements below a program, block_statement or statement_list node in source order
+def statements(_node: ASTNODE) -> list:
+    if _node.name in ["program", "block_statement"]:
+        if not _node.children:
+            return []
+        _node = _node.children[0]
+    if _node.name == "statement_list":
+        return list(_node.children)
+    return [_node]
+
+
+# 2026-10-18, TP, a tree as a flat list of (name, value, line, index, number of children) records in preorder,
+# for pickling trees too deep for pickle's recursion
+def to_records(_node: ASTNODE) -> list:
+    records = []
+    pending = [_node]
+    while pending:
+        _node = pending.pop()
+        children = _node.children
+        records.append((_node.name, _node.value, _node.line, _node.index, len(children)))
+        pending.extend(reversed(children))
+    return records
+
+
+# 2026-10-18, TP, the number of nodes in a tree, counted without recursion
+def node_count(_node: ASTNODE) -> int:
+    count = 0
+    pending = [_node]
+    while pending:
+        _node = pending.pop()
+        count += 1
+        pending.extend(_node.children)
+    return count
+
+
+# 2026-10-18, TP, rebuild a tree from to_records(); children are attached before their parent so anytree's loop
+# check never walks up more than one level
+def from_records(records: list, node_class=ASTNODE) -> ASTNODE:
+    built = []
+    for name, value, line, index, child_count in reversed(records):
+        _node = node_class(name, value=value, line=line, index=index)
+        if child_count:
+            _node.children = built[-child_count:][::-1]
+            del built[-child_count:]
+        built.append(_node)
+    return built[0]
 
 
 # limited functional testing
@@ -99,5 +214,29 @@ if __name__ == "__main__":
         root = ASTNODE("root", value="\ntest\n", children=[child])
         ASTNODE.render_tree(root)
 
+    # 2026-10-18, TP, memory per node and parse throughput of each backend on a large generated program
+    def benchmark(statements: int = 20000) -> None:
+        import time
+        import tracemalloc
+        from CompilerSession import CompilerSession
+
+        source = "\n".join("var v{0} = v{1} * {2} + (v{1} - 3)\nfmt.Println(v{0})".format(i % 100, (i + 7) % 100, i)
+                           for i in range(statements // 2))
+        for backend, node_class in AST_BACKENDS.items():
+            session = CompilerSession(node_class=node_class)
+            start = time.perf_counter()
+            session.parse(source)
+            seconds = time.perf_counter() - start
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            ast = session.parse(source)
+            used = tracemalloc.get_traced_memory()[0] - before
+            tracemalloc.stop()
+            nodes = len(to_records(ast))
+            print("{:>8}: {} nodes, {:6.0f} bytes/node, parsed in {:.3f}s, {:.0f} statements/s".format(
+                backend, nodes, used / nodes, seconds, statements / seconds))
+
     test()
+    SlotNode.render_tree(from_records(to_records(ASTNODE("root", children=[ASTNODE("child")])), SlotNode))
+    benchmark()
 
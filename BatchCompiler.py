@@ -0,0 +1,192 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Compile many .go files at once, fanned out over a process pool; one .asm is written per input.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - usage: python BatchCompiler.py [-j N] [-o DIR] [--mode stack|register|ssa] [--no-fold] [--no-loops]
+                                   [--cache DIR] [--ast anytree|slots] [--lexer fast|ply] [--scaling]
+                                   [--stats] [--stats-json FILE] [--no-trace-memory] FILE|DIR|GLOB ...
+    A directory stands for the .go files in it; globs are expanded here, ** included, so they work on Windows too.
+  - Every worker builds one CompilerSession when it starts and keeps it, so the PLY tables are loaded once
+    per process rather than once per file.
+  - Sources are memory-mapped (ReadFile mapped=True) and lexed in place, see FastLexer.
+  - The diagnostics of all files are printed at the end as file:line:column; the exit status is 1 if any file
+    had errors.
+  - With -o DIR the .asm files keep the directories of the sources relative to the directory they are all in,
+    so src/a/main.go and src/b/main.go become DIR/a/main.asm and DIR/b/main.asm.
+  - --scaling compiles the same files with 1, 2, 4 ... up to -j workers and reports files/s and the speedup;
+    it ignores --cache, which would make every run after the first a run of cache hits.
+  - --cache DIR keeps compiled programs in a CompileCache shared by the workers; unchanged files are not
+    parsed again on the next run.
+  - --stats prints the time, memory, tokens, AST nodes and instructions of every compile phase, summed over
+    the files (see CompileStats); --stats-json FILE saves the same as JSON. --no-trace-memory leaves
+    tracemalloc off, which keeps the times closer to a run without --stats.
+
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from CompilerSession import CompilerSession, LOOP_MODES
+from CompileCache import CompileCache
+from CompileStats import CompileStats
+from ASTNODE import AST_BACKENDS
+from FastLexer import LEXER_BACKENDS
+from ReadFile import ReadFile
+
+# the session of a worker process, built by start_worker()
+session = None
+
+
+def start_worker(fold: bool, mode: str, cache_directory=None, ast_backend: str = "anytree",
+                 lexer_backend: str = "fast", loops: bool = None, stats: bool = False,
+                 trace_memory: bool = True) -> None:
+    global session
+    cache = CompileCache(cache_directory) if cache_directory is not None else None
+    session = CompilerSession(fold=fold, mode=mode, cache=cache, node_class=AST_BACKENDS[ast_backend],
+                              lexer_backend=lexer_backend, loops=loops, stats=stats, trace_memory=trace_memory)
+
+
+# the .go files named by a list of files, directories and glob patterns, in order and without repeats
+def expand_sources(patterns: list) -> list:
+    sources = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(pattern, "*.go")))
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        sources.extend(matches)
+    return list(dict.fromkeys(sources))
+
+
+# the .asm file of every source: next to it, or under output_dir in the same directory relative to the
+# directory all the sources are in, so sources of the same name in different directories don't collide
+def output_paths(sources: list, output_dir=None) -> list:
+    asm_file_names = [os.path.splitext(source_file_name)[0] + ".asm" for source_file_name in sources]
+    if output_dir is None or not sources:
+        return asm_file_names
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(source_file_name)) for source_file_name in sources])
+    return [os.path.join(output_dir, os.path.relpath(os.path.abspath(asm_file_name), root))
+            for asm_file_name in asm_file_names]
+
+
+# compile one file in a worker; returns (source file, .asm file or None, diagnostics, from the cache,
+# CompileStats or None)
+def compile_file(source_file_name: str, asm_file_name: str) -> tuple:
+    source = ReadFile(source_file_name, mapped=True)
+    if source.error:
+        return source_file_name, None, ["read error: " + source.error_message], False, None
+    with source:
+        result = session.compile(source.buffer)
+    if not result.success:
+        return source_file_name, None, [str(diagnostic) for diagnostic in result.diagnostics], False, result.stats
+    with open(asm_file_name, "w") as asm_file:
+        asm_file.write(result.assembly())
+    return source_file_name, asm_file_name, [], result.cached, result.stats
+
+
+def compile_files(sources: list, workers: int, output_dir=None, fold: bool = True, mode: str = "stack",
+                  cache_directory=None, ast_backend: str = "anytree", lexer_backend: str = "fast",
+                  loops: bool = None, stats: bool = False, trace_memory: bool = True) -> list:
+    asm_file_names = output_paths(sources, output_dir)
+    if output_dir is not None:
+        for directory in dict.fromkeys(os.path.dirname(asm_file_name) for asm_file_name in asm_file_names):
+            os.makedirs(directory, exist_ok=True)
+    if workers <= 1:
+        start_worker(fold, mode, cache_directory, ast_backend, lexer_backend, loops, stats, trace_memory)
+        return [compile_file(source_file_name, asm_file_name)
+                for source_file_name, asm_file_name in zip(sources, asm_file_names)]
+    # small files: hand them out in chunks so the workers don't wait on the queue
+    chunk_size = max(1, len(sources) // (workers * 8))
+    with ProcessPoolExecutor(workers, initializer=start_worker,
+                             initargs=(fold, mode, cache_directory, ast_backend, lexer_backend, loops, stats,
+                                       trace_memory)) as pool:
+        return list(pool.map(compile_file, sources, asm_file_names, chunksize=chunk_size))
+
+
+def report(results: list) -> int:
+    failed = 0
+    cached = 0
+    for source_file_name, _, diagnostics, from_cache, _ in results:
+        if diagnostics:
+            failed += 1
+        cached += from_cache
+        for diagnostic in diagnostics:
+            print("{}: {}".format(source_file_name, diagnostic), file=sys.stderr)
+    print("{} files compiled ({} from the cache), {} with errors".format(len(results) - failed, cached, failed))
+    return failed
+
+
+def main(arguments=None) -> int:
+    argument_parser = argparse.ArgumentParser(description="Compile .go files to MIPS32 assembly in parallel.")
+    argument_parser.add_argument("sources", nargs="+", help=".go files, directories or glob patterns")
+    argument_parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    argument_parser.add_argument("-o", "--output-dir", default=None, help="where to write the .asm files")
+    argument_parser.add_argument("--mode", choices=("stack", "register", "ssa"), default="stack")
+    argument_parser.add_argument("--no-fold", action="store_true", help="skip constant folding")
+    argument_parser.add_argument("--no-loops", action="store_true",
+                                 help="skip loop-invariant code motion and strength reduction, which only run "
+                                      "in register and ssa mode")
+    argument_parser.add_argument("--cache", default=None, help="compile cache directory")
+    argument_parser.add_argument("--ast", choices=tuple(AST_BACKENDS), default="anytree", help="AST node class")
+    argument_parser.add_argument("--lexer", choices=tuple(LEXER_BACKENDS), default="fast", help="lexer backend")
+    argument_parser.add_argument("--scaling", action="store_true", help="time 1, 2, 4 ... -j workers")
+    argument_parser.add_argument("--stats", action="store_true", help="report the time and memory of each phase")
+    argument_parser.add_argument("--stats-json", default=None, metavar="FILE", help="save the phase statistics")
+    argument_parser.add_argument("--no-trace-memory", action="store_true",
+                                 help="leave tracemalloc off when collecting statistics")
+    options = argument_parser.parse_args(arguments)
+
+    sources = expand_sources(options.sources)
+    if not sources:
+        print("No .go files found", file=sys.stderr)
+        return 1
+    fold = not options.no_fold
+    stats = options.stats or options.stats_json is not None
+    trace_memory = not options.no_trace_memory
+    loops = False if options.no_loops else None
+
+    worker_counts = [options.jobs]
+    cache_directory = options.cache
+    if options.scaling:
+        worker_counts = [count for count in (1, 2, 4, 8, 16, 32, 64) if count < options.jobs] + [options.jobs]
+        if cache_directory is not None:
+            # every run after the first would only time cache hits
+            print("--scaling compiles without the cache", file=sys.stderr)
+            cache_directory = None
+    single = None
+    results = []
+    for workers in worker_counts:
+        start = time.perf_counter()
+        results = compile_files(sources, workers, options.output_dir, fold, options.mode, cache_directory,
+                                options.ast, options.lexer, loops, stats, trace_memory)
+        seconds = time.perf_counter() - start
+        if workers == 1:
+            single = seconds
+        speedup = " ({:.2f}x)".format(single / seconds) if single else ""
+        print("{:3} workers: {} files in {:.3f}s, {:.0f} files/s{}".format(workers, len(sources), seconds,
+                                                                       len(sources) / seconds, speedup))
+    failed = report(results)
+    if stats:
+        totals = CompileStats(trace_memory)
+        for result in results:
+            if result[4] is not None:
+                totals.merge(result[4])
+        if options.stats:
+            print("\n".join(totals.report()))
+        if options.stats_json is not None:
+            totals.save(options.stats_json, mode=options.mode, fold=fold,
+                        loops=options.mode in LOOP_MODES and not options.no_loops, ast=options.ast,
+                        lexer=options.lexer, workers=worker_counts[-1])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
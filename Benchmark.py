@@ -0,0 +1,389 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Benchmark harness: generate Go programs of a given shape, time tokenizing, parsing and emitting them
+         separately, and compare the results against a saved baseline, benchmark_baseline.json by default.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - usage: python Benchmark.py [--workload NAME ...] [--statements N] [--depth D] [--nesting K] [--variables V]
+                               [--scale] [--repeat N] [--mode stack|register|ssa] [--ast anytree|slots]
+                               [--lexer fast|ply] [--save FILE] [--compare [FILE]] [--times]
+                               [--tolerance T] [--write-sources DIR]
+  - A workload is a program shape: statement count, expression depth, nesting depth of if and for
+    statements, and number of variables. The programs only use what go_grammar accepts and are generated
+    from a fixed seed, so a workload is the same program on every run and every machine.
+  - tokenize runs the lexer in a loop like show_tokenization() in go_grammar.py, parse is parser.parse() and
+    emit is MIPS32Emitter.emit_ast() into a BufferSink. Each stage is timed on its own, best of --repeat
+    runs with the garbage collector off; the peak memory comes from one more run under tracemalloc, so
+    tracing doesn't slow the timed runs down.
+  - --scale runs the workloads at 1, 2, 4, 8 and 16 times their statement count; the time per statement
+    stays flat when a stage is linear.
+  - --save FILE writes the results as JSON, with the compiler module hashes of CompileStats. --compare FILE
+    fails (exit status 1) when a stage needed more memory than the baseline by more than --tolerance, when
+    tokenize or parse saw a different program or when emit produced more instructions. Times are only
+    comparable on the same machine, so they are reported but only fail the comparison with --times.
+  - benchmark_baseline.json is the baseline of all the workloads with the default options, saved with
+    python Benchmark.py --save benchmark_baseline.json; --compare without a FILE compares against it. Save it
+    again when the compiler changes what it emits. To gate on times, --save a baseline on your own machine
+    and --compare FILE --times against that.
+
+"""
+import argparse
+import copy
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import go_grammar
+from ASTNODE import AST_BACKENDS, node_count
+from CompileCache import compiler_version
+from CompileStats import instruction_count, module_versions
+from FastLexer import LEXER_BACKENDS
+from MIPS32_Emitter import MIPS32Emitter, BufferSink
+
+STAGES = ("tokenize", "parse", "emit")
+STAGE_UNITS = {"tokenize": "tokens", "parse": "nodes", "emit": "instructions"}
+SCALE_FACTORS = (1, 2, 4, 8, 16)
+SEED = 486
+BASELINE_FILE_NAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+ARITHMETIC_OPERATORS = ("+", "-", "*")
+COMPARISON_OPERATORS = ("<", ">", "<=", "==")
+
+
+class Workload:
+    __slots__ = ("name", "statements", "depth", "nesting", "variables")
+
+    def __init__(self, name: str, statements: int, depth: int, nesting: int, variables: int) -> None:
+        self.name = name
+        self.statements = statements  # statements in the program, those nested in if and for included
+        self.depth = depth            # operators from the root of an expression to its deepest operand
+        self.nesting = nesting        # if and for statements nested inside each other, at most
+        self.variables = variables    # variables declared at the top
+
+    def __repr__(self) -> str:
+        return "Workload({}, statements={}, depth={}, nesting={}, variables={})".format(
+            self.name, self.statements, self.depth, self.nesting, self.variables)
+
+    def scaled(self, factor: int) -> "Workload":
+        return Workload("{}-x{}".format(self.name, factor), self.statements * factor, self.depth, self.nesting,
+                        self.variables)
+
+    def source(self) -> str:
+        return generate(self.statements, self.depth, self.nesting, self.variables)
+
+
+WORKLOADS = {
+    "small": Workload("small", 200, 3, 2, 10),
+    "statements": Workload("statements", 5000, 2, 1, 20),
+    "expressions": Workload("expressions", 1000, 10, 0, 20),
+    "nesting": Workload("nesting", 2000, 3, 8, 20),
+    "variables": Workload("variables", 2000, 2, 1, 1000),
+}
+
+
+class ProgramGenerator:
+    def __init__(self, depth: int, nesting: int, variables: int, seed: int = SEED) -> None:
+        self.random = random.Random(seed)
+        self.depth = depth
+        self.nesting = nesting
+        self.names = ["v{}".format(index) for index in range(max(1, variables))]
+        self.lines = []
+        self.count = 0  # statements generated so far
+
+    def operand(self, names: list) -> str:
+        if self.random.random() < 0.5:
+            return self.random.choice(names)
+        return str(self.random.randint(1, 99))
+
+    # an expression exactly depth operators deep along its left side, and shallower elsewhere
+    def expression(self, depth: int, names: list) -> str:
+        text = self.operand(names)
+        for level in range(depth):
+            right = self.operand(names)
+            if level and self.random.random() < 0.3:
+                right = "({})".format(self.expression(self.random.randint(1, level), names))
+            left = "({})".format(text) if level else text
+            choice = self.random.random()
+            if choice < 0.1:
+                text = "{}({}, {})".format(self.random.choice(("min", "max")), text, right)
+            elif choice < 0.15:
+                text = "abs({}) + {}".format(text, right)
+            elif choice < 0.2:
+                text = "{} / {}".format(left, self.random.randint(2, 9))
+            else:
+                text = "{} {} {}".format(left, self.random.choice(ARITHMETIC_OPERATORS), right)
+        return text
+
+    def simple_statement(self, names: list) -> None:
+        if self.random.random() < 0.75:
+            self.lines.append("{} = {}".format(self.random.choice(self.names), self.expression(self.depth, names)))
+        else:
+            self.lines.append("fmt.Println({})".format(self.expression(self.depth, names)))
+        self.count += 1
+
+    # if and for statements nested levels deep, with a few simple statements at the bottom
+    def nest(self, levels: int, names: list) -> None:
+        closing = []
+        for level in range(levels):
+            if self.random.random() < 0.5:
+                self.lines.append("if {} {} {} {{".format(self.random.choice(names),
+                                                          self.random.choice(COMPARISON_OPERATORS),
+                                                          self.operand(names)))
+                closing.append(None if self.random.random() < 0.5 else self.random.randint(1, 2))
+            else:
+                index = "i{}".format(level)
+                self.lines.append("for var {0} = 0; {0} < {1}; {0} = {0} + 1 {{".format(
+                    index, self.random.randint(2, 4)))
+                names = names + [index]
+                closing.append(None)
+            self.count += 1
+        for _ in range(self.random.randint(1, 3)):
+            self.simple_statement(names)
+        for else_statements in reversed(closing):
+            if else_statements is None:
+                self.lines.append("}")
+                continue
+            self.lines.append("} else {")
+            for _ in range(else_statements):
+                self.simple_statement(names)
+            self.lines.append("}")
+
+    def generate(self, statements: int) -> str:
+        for name in self.names:
+            self.lines.append("var {} = {}".format(name, self.random.randint(0, 99)))
+        self.count = len(self.names)
+        first = True
+        while self.count < statements:
+            if self.nesting and (first or self.random.random() < 0.2):
+                self.nest(self.nesting if first else self.random.randint(1, self.nesting), self.names)
+                first = False
+            else:
+                self.simple_statement(self.names)
+        return "\n".join(self.lines) + "\n"
+
+
+# a Go program of about the given shape, the same one for the same arguments
+def generate(statements: int, depth: int = 2, nesting: int = 1, variables: int = 10, seed: int = SEED) -> str:
+    return ProgramGenerator(depth, nesting, variables, seed).generate(statements)
+
+
+class Stages:
+    def __init__(self, mode: str = "stack", node_class=None, lexer_backend: str = "fast") -> None:
+        self.mode = mode
+        self.lexer = LEXER_BACKENDS[lexer_backend].clone()
+        self.lexer.lexerrorf = self.error
+        self.parser = copy.copy(go_grammar.parser)
+        self.parser.errorfunc = self.error
+        self.parser.node_class = node_class if node_class is not None else go_grammar.parser.node_class
+
+    # a generated program has to be free of errors, or the stages wouldn't measure the usual path
+    @staticmethod
+    def error(token) -> None:
+        if token is None:
+            raise ValueError("the generated program doesn't parse: syntax error at EOF")
+        raise ValueError("the generated program doesn't parse: {!r} at line {}".format(token.value, token.lineno))
+
+    # the number of tokens, in a loop like show_tokenization()
+    def tokenize(self, source: str) -> int:
+        lexer = self.lexer
+        lexer.lineno = 1
+        lexer.input(source)
+        count = 0
+        while True:
+            token = lexer.token()
+            if not token:
+                break
+            count += 1
+        return count
+
+    def parse(self, source: str):
+        self.lexer.lineno = 1
+        return self.parser.parse(source, lexer=self.lexer)
+
+    # the number of instructions emitted
+    def emit(self, ast) -> int:
+        sink = BufferSink()
+        MIPS32Emitter(sink=sink, mode=self.mode).emit_ast(ast)
+        return instruction_count(sink.lines)
+
+
+# the best time of repeat runs of function(argument), with the garbage collector off while it runs
+def best_time(function, argument, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            function(argument)
+            seconds = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+# the peak of the memory traced while function(argument) runs, above what was allocated before; returns
+# (peak bytes, result)
+def peak_memory(function, argument) -> tuple:
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    gc.collect()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        result = function(argument)
+        peak = tracemalloc.get_traced_memory()[1] - before
+    finally:
+        if started:
+            tracemalloc.stop()
+    return peak, result
+
+
+# time the stages of one workload; returns {stage: {"seconds", "peak", "count", "per second"}} and the
+# size of the source
+def run_workload(stages: Stages, workload: Workload, repeat: int) -> dict:
+    source = workload.source()
+    results = {"statements": workload.statements, "bytes": len(source)}
+    ast = stages.parse(source)
+    for stage, function, argument in (("tokenize", stages.tokenize, source), ("parse", stages.parse, source),
+                                      ("emit", stages.emit, ast)):
+        peak, result = peak_memory(function, argument)
+        count = node_count(result) if stage == "parse" else result
+        seconds = best_time(function, argument, repeat)
+        results[stage] = {"seconds": seconds, "peak": peak, "count": count,
+                          "per second": count / seconds if seconds else 0.0}
+    return results
+
+
+def report(results: dict) -> list:
+    lines = ["{:>16} {:>9} {:>10} {:>13} {:>13} {:>10} {:>9}".format(
+        "workload", "stage", "ms", "items", "items/s", "us/stmt", "peak KiB")]
+    for name, workload_results in results.items():
+        for stage in STAGES:
+            stage_results = workload_results[stage]
+            lines.append("{:>16} {:>9} {:>10.3f} {:>13} {:>13.0f} {:>10.2f} {:>9.1f}".format(
+                name, stage, stage_results["seconds"] * 1000,
+                "{} {}".format(stage_results["count"], STAGE_UNITS[stage][:3]), stage_results["per second"],
+                stage_results["seconds"] / workload_results["statements"] * 1e6, stage_results["peak"] / 1024))
+    return lines
+
+
+def baseline(results: dict, options: dict) -> dict:
+    return {
+        "compiler": compiler_version(),
+        "modules": module_versions(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "options": options,
+        "results": results,
+    }
+
+
+# the lines comparing results with a baseline, and the number of regressions among them; times and memory are
+# the ratio to the baseline, items the difference. A slower stage is only a regression with times
+def compare(results: dict, saved: dict, tolerance: float, times: bool = False) -> tuple:
+    lines = ["{:>16} {:>9} {:>12} {:>12} {:>12}  {}".format("workload", "stage", "time", "memory", "items", "")]
+    regressions = 0
+    for name, workload_results in results.items():
+        saved_workload = saved["results"].get(name)
+        if saved_workload is None:
+            lines.append("{:>16} not in the baseline".format(name))
+            continue
+        for stage in STAGES:
+            current, before = workload_results[stage], saved_workload[stage]
+            time_ratio = current["seconds"] / before["seconds"] if before["seconds"] else 1.0
+            memory_ratio = current["peak"] / before["peak"] if before["peak"] else 1.0
+            problems = []
+            notes = []
+            if time_ratio > 1 + tolerance:
+                (problems if times else notes).append("slower")
+            if memory_ratio > 1 + tolerance:
+                problems.append("more memory")
+            if stage == "emit" and current["count"] > before["count"]:
+                problems.append("more instructions")
+            elif stage != "emit" and current["count"] != before["count"]:
+                problems.append("different program")
+            regressions += bool(problems)
+            lines.append("{:>16} {:>9} {:>11.2f}x {:>11.2f}x {:>12}  {}".format(
+                name, stage, time_ratio, memory_ratio, "{:+d}".format(current["count"] - before["count"]),
+                "REGRESSION: " + ", ".join(problems + notes) if problems else
+                ", ".join(notes) + " (not compared)" if notes else "ok"))
+    return lines, regressions
+
+
+def main(arguments=None) -> int:
+    argument_parser = argparse.ArgumentParser(description="Time the lexer, parser and emitter on generated programs.")
+    argument_parser.add_argument("--workload", action="append", choices=tuple(WORKLOADS),
+                                 help="a workload to run, all of them by default; may be repeated")
+    argument_parser.add_argument("--statements", type=int, default=None, help="run one workload of this size")
+    argument_parser.add_argument("--depth", type=int, default=3, help="expression depth of --statements")
+    argument_parser.add_argument("--nesting", type=int, default=2, help="if/for nesting depth of --statements")
+    argument_parser.add_argument("--variables", type=int, default=10, help="variables of --statements")
+    argument_parser.add_argument("--scale", action="store_true", help="run each workload at 1 to 16 times its size")
+    argument_parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage, the best one counts")
+    argument_parser.add_argument("--mode", choices=MIPS32Emitter.modes, default="stack")
+    argument_parser.add_argument("--ast", choices=tuple(AST_BACKENDS), default="anytree", help="AST node class")
+    argument_parser.add_argument("--lexer", choices=tuple(LEXER_BACKENDS), default="fast", help="lexer backend")
+    argument_parser.add_argument("--save", default=None, metavar="FILE", help="save the results as a baseline")
+    argument_parser.add_argument("--compare", nargs="?", const=BASELINE_FILE_NAME, default=None, metavar="FILE",
+                                 help="compare with a saved baseline, benchmark_baseline.json without a FILE")
+    argument_parser.add_argument("--tolerance", type=float, default=0.25,
+                                 help="slowdown or memory growth allowed by --compare, 0.25 is 25%%")
+    argument_parser.add_argument("--times", action="store_true",
+                                 help="let --compare also fail on slower stages, for a baseline saved on this machine")
+    argument_parser.add_argument("--write-sources", default=None, metavar="DIR",
+                                 help="also write the generated programs as .go files")
+    options = argument_parser.parse_args(arguments)
+
+    if options.statements is not None:
+        workloads = [Workload("custom", options.statements, options.depth, options.nesting, options.variables)]
+    else:
+        workloads = [WORKLOADS[name] for name in (options.workload or WORKLOADS)]
+    if options.scale:
+        workloads = [workload.scaled(factor) for workload in workloads for factor in SCALE_FACTORS]
+    if options.write_sources is not None:
+        os.makedirs(options.write_sources, exist_ok=True)
+        for workload in workloads:
+            with open(os.path.join(options.write_sources, workload.name + ".go"), "w") as source_file:
+                source_file.write(workload.source())
+
+    stages = Stages(options.mode, AST_BACKENDS[options.ast], options.lexer)
+    results = {}
+    for workload in workloads:
+        results[workload.name] = run_workload(stages, workload, options.repeat)
+    print("\n".join(report(results)))
+
+    run_options = {"mode": options.mode, "ast": options.ast, "lexer": options.lexer, "repeat": options.repeat}
+    if options.save is not None:
+        with open(options.save, "w") as json_file:
+            json.dump(baseline(results, run_options), json_file, indent=2)
+            json_file.write("\n")
+    if options.compare is None:
+        return 0
+    with open(options.compare) as json_file:
+        saved = json.load(json_file)
+    if saved["options"] != run_options:
+        print("the baseline was run with {}, this run with {}".format(saved["options"], run_options))
+    if saved["compiler"] != compiler_version():
+        changed = [name for name, version in module_versions().items() if saved["modules"].get(name) != version]
+        print("changed since the baseline: {}".format(", ".join(changed)))
+    if options.times and (saved["python"], saved["machine"]) != (platform.python_version(), platform.machine()):
+        print("the baseline was saved with python {} on {}, times may not compare".format(saved["python"],
+                                                                                          saved["machine"]))
+    lines, regressions = compare(results, saved, options.tolerance, options.times)
+    print("\n".join(lines))
+    print("{} regressions against {}".format(regressions, options.compare))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
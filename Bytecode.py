@@ -0,0 +1,549 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Bytecode compiler and virtual machine for quick evaluation of Go programs, in place of walking the
+         AST node by node.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - An instruction is four ints in an array('i'): opcode, a, b, c. a, b and c index the frame or hold a
+    jump target (always c) or a count. The frame is laid out once at compile time: the variables, one slot
+    per DataLayout word so shadowing resolves like in the emitted code, then the constant pool, then the
+    temporaries of expressions. Operands never move on and off a value stack; "ans = ans * x" is one
+    MUL instruction.
+  - A condition that is a comparison compiles to one compare-and-jump instruction (JUMP_IF_NOT_LT ...).
+  - run() decodes the array into a list of tuples once, since unpacking a tuple is the cheapest way to read
+    four operands in CPython, and dispatches on the opcode with the most frequent instructions first.
+  - Values are Python ints, floats and strs. Integer arithmetic wraps to 32 bits, comparisons give 1 or 0
+    and division truncates toward zero, the same as the MIPS32 code and ConstantFolder.
+  - Every print statement prints its operands separated by spaces and a newline, floats formatted like Go's
+    %v.
+
+"""
+import math
+import sys
+from array import array
+from decimal import Decimal
+from ASTNODE import ASTNODE, ASSIGNMENT_OPERATORS
+from ConstantFolder import INTRINSICS
+from DataLayout import DataLayout
+
+OPCODES = ("move", "add", "sub", "mul", "jump_if_not_lt", "jump_if_not_le", "jump_if_not_gt",
+           "jump_if_not_ge", "jump_if_not_eq", "jump_if_not_ne", "jump", "jump_if_false",
+           "lt", "le", "gt", "ge", "eq", "ne", "div", "mod", "abs", "sin", "cos", "tan", "min", "max",
+           "print", "halt")
+
+(MOVE, ADD, SUB, MUL, JUMP_IF_NOT_LT, JUMP_IF_NOT_LE, JUMP_IF_NOT_GT,
+ JUMP_IF_NOT_GE, JUMP_IF_NOT_EQ, JUMP_IF_NOT_NE, JUMP, JUMP_IF_FALSE,
+ LT, LE, GT, GE, EQ, NE, DIV, MOD, ABS, SIN, COS, TAN, MIN, MAX,
+ PRINT, HALT) = range(len(OPCODES))
+
+# operators of the AST mapped to the instruction computing them, and to the jump taken when they are false
+BINARY_OPCODES = {"+": ADD, "-": SUB, "*": MUL, "/": DIV, "%": MOD,
+                  "<": LT, "<=": LE, ">": GT, ">=": GE, "==": EQ, "!=": NE}
+JUMP_UNLESS = {"<": JUMP_IF_NOT_LT, "<=": JUMP_IF_NOT_LE, ">": JUMP_IF_NOT_GT, ">=": JUMP_IF_NOT_GE,
+               "==": JUMP_IF_NOT_EQ, "!=": JUMP_IF_NOT_NE}
+INTRINSIC_OPCODES = {"abs": ABS, "sin": SIN, "cos": COS, "tan": TAN, "min": MIN, "max": MAX}
+# strconv formats the shortest digits of a float with %e from this exponent up
+SHORTEST_EXPONENT_PRECISION = 6
+
+
+class VMError(Exception):
+    pass
+
+
+# the compiled program
+class CodeObject:
+    __slots__ = ("code", "constants", "variables", "frame_size")
+
+    def __init__(self, code: array, constants: list, variables: list, frame_size: int) -> None:
+        self.code = code                # opcode, a, b, c for every instruction
+        self.constants = constants      # the frame slots after the variables start out with these values
+        self.variables = variables      # the label of every variable slot
+        self.frame_size = frame_size
+
+    def __len__(self) -> int:
+        return len(self.code) // 4
+
+    # one line per instruction, frame slots shown as variable labels, constants and t0, t1...
+    def disassemble(self) -> list:
+        constants_start = len(self.variables)
+        temps_start = constants_start + len(self.constants)
+
+        def slot(index: int) -> str:
+            if index < constants_start:
+                return self.variables[index]
+            if index < temps_start:
+                return repr(self.constants[index - constants_start])
+            return "t{}".format(index - temps_start)
+
+        lines = []
+        for index in range(len(self)):
+            opcode, a, b, c = self.code[4 * index:4 * index + 4]
+            mnemonic = OPCODES[opcode]
+            if opcode == JUMP:
+                operands = [str(c)]
+            elif opcode == JUMP_IF_FALSE:
+                operands = [slot(a), str(c)]
+            elif JUMP_IF_NOT_LT <= opcode <= JUMP_IF_NOT_NE:
+                operands = [slot(a), slot(b), str(c)]
+            elif opcode in (MOVE, ABS, SIN, COS, TAN):
+                operands = [slot(a), slot(b)]
+            elif opcode == PRINT:
+                operands = [slot(a), str(b)]
+            elif opcode == HALT:
+                operands = []
+            else:
+                operands = [slot(a), slot(b), slot(c)]
+            lines.append("{:5} {} {}".format(index, mnemonic, ", ".join(operands)))
+        return lines
+
+
+class BytecodeCompiler:
+    def __init__(self) -> None:
+        self.code = array("i")
+        self.layout = None
+        self.variable_slots = {}    # DataLayout slot -> frame slot
+        self.constants = []
+        self.constant_slots = {}    # (type, value) -> frame slot
+        self.temps_start = 0
+        self.temps = 0              # temporaries in use
+        self.max_temps = 0
+        self.pending = []           # the work stack of compile()
+
+    def compile(self, ast: ASTNODE) -> CodeObject:
+        self.code = array("i")
+        self.layout = DataLayout(ast)
+        self.variable_slots = {slot: index for index, slot in enumerate(self.layout.slots)}
+        self.collect_constants(ast)
+        self.temps_start = len(self.variable_slots) + len(self.constants)
+        self.temps = self.max_temps = 0
+        # walk the statements with an explicit stack; an entry is a node or a (method, arguments...) tuple to
+        # call once the nodes pushed above it are compiled
+        self.pending = [ast]
+        while self.pending:
+            _node = self.pending.pop()
+            if type(_node) is tuple:
+                _node[0](*_node[1:])
+            elif _node.name in ["program", "block_statement", "statement_list", "statement"]:
+                self.pending.extend(reversed(_node.children))
+            elif _node.name == "assign" and _node.value in ASSIGNMENT_OPERATORS:
+                self.expression(_node.children[1], self.variable(_node.children[0]))
+            elif _node.name == "print":
+                self.print_statement(_node)
+            elif _node.name == "if_statement":
+                self.if_statement(_node)
+            elif _node.name == "for":
+                self.for_loop(_node)
+            else:
+                self.expression(_node)  # the value is unused, but dividing by zero still fails
+                self.temps = 0
+        self.emit(HALT)
+        return CodeObject(self.code, self.constants, [slot.label for slot in self.layout.slots],
+                          self.temps_start + self.max_temps)
+
+    # the constant pool holds every number and string of the program, after the variables in the frame
+    def collect_constants(self, ast: ASTNODE) -> None:
+        self.constants = []
+        self.constant_slots = {}
+        pending = [ast]
+        while pending:
+            _node = pending.pop()
+            if _node.name == "number" or is_string(_node):
+                value = literal(_node)
+                key = (type(value), value)
+                if key not in self.constant_slots:
+                    self.constant_slots[key] = len(self.variable_slots) + len(self.constants)
+                    self.constants.append(value)
+            pending.extend(_node.children)
+
+    def emit(self, opcode: int, a: int = 0, b: int = 0, c: int = 0) -> None:
+        self.code.extend((opcode, a, b, c))
+
+    # the index of the next instruction
+    def here(self) -> int:
+        return len(self.code) // 4
+
+    # point the jump target of the instruction at an index to the next instruction
+    def patch(self, index: int) -> None:
+        self.code[4 * index + 3] = self.here()
+
+    def variable(self, _node: ASTNODE) -> int:
+        return self.variable_slots[self.layout.slot(_node)]
+
+    def new_temp(self) -> int:
+        self.temps += 1
+        self.max_temps = max(self.max_temps, self.temps)
+        return self.temps_start + self.temps - 1
+
+    # compile an expression bottom up with an explicit stack; returns the frame slot holding its value, which
+    # is target when one is given
+    def expression(self, _node: ASTNODE, target: int = None) -> int:
+        root = unwrap(_node)
+        values = []    # the slots of the operands compiled so far
+        pending = [(root, False)]
+        while pending:
+            _node, ready = pending.pop()
+            _node = unwrap(_node)
+            if _node.name == "number" or is_string(_node):
+                values.append(self.constant_slots[(type(literal(_node)), literal(_node))])
+                continue
+            if _node.name == "name":
+                values.append(self.variable(_node))
+                continue
+            opcode = operation(_node)
+            if not ready:
+                pending.append((_node, True))
+                pending.extend((child, False) for child in reversed(_node.children))
+                continue
+            operands = values[len(values) - len(_node.children):]
+            del values[len(values) - len(_node.children):]
+            # the temporaries of the operands are the last ones taken, they are free once read
+            self.temps -= sum(1 for operand in operands if operand >= self.temps_start)
+            result = target if _node is root and target is not None else self.new_temp()
+            self.emit(opcode, result, *operands)
+            values.append(result)
+        if target is not None and values[0] != target:
+            self.emit(MOVE, target, values[0])
+            return target
+        return values[0]
+
+    def print_statement(self, _node: ASTNODE) -> None:
+        arguments = []
+        pending = [_node.children[0]] if _node.children else []
+        while pending:
+            argument = unwrap(pending.pop())
+            if argument.name == "expression" and argument.value == ",":
+                pending.extend(reversed(argument.children))
+            else:
+                arguments.append(argument)
+        first = self.new_temp()
+        for _ in arguments[1:]:
+            self.new_temp()
+        for index, argument in enumerate(arguments):
+            self.expression(argument, first + index)
+        self.emit(PRINT, first, len(arguments))
+        self.temps = 0
+
+    # jump over what follows when a condition is false; returns the index of the jump to patch
+    def jump_unless(self, condition: ASTNODE) -> int:
+        condition = unwrap(condition)
+        if condition.name in ("assign", "expression") and condition.value in JUMP_UNLESS:
+            left = self.expression(condition.children[0])
+            right = self.expression(condition.children[1])
+            self.emit(JUMP_UNLESS[condition.value], left, right)
+        else:
+            self.emit(JUMP_IF_FALSE, self.expression(condition))
+        self.temps = 0
+        return self.here() - 1
+
+    def if_statement(self, _node: ASTNODE) -> None:
+        branch = self.jump_unless(_node.children[0])
+        if len(_node.children) == 3:
+            self.pending.append((self.else_block, branch, _node.children[2]))
+        else:
+            self.pending.append((self.patch, branch))
+        self.pending.append(_node.children[1])
+
+    # the then block is compiled: jump over the else block, which the condition jumps to
+    def else_block(self, branch: int, block: ASTNODE) -> None:
+        self.emit(JUMP)
+        self.patch(branch)
+        self.pending.append((self.patch, self.here() - 1))
+        self.pending.append(block)
+
+    def for_loop(self, _node: ASTNODE) -> None:
+        if len(_node.children) == 4:
+            init, condition, step, body = _node.children
+            self.pending.append((self.loop, condition, step, body))
+            self.pending.append(init)
+        else:
+            condition, body = _node.children
+            self.loop(condition, None, body)
+
+    def loop(self, condition: ASTNODE, step, body: ASTNODE) -> None:
+        top = self.here()
+        branch = self.jump_unless(condition)
+        self.pending.append((self.loop_end, top, branch))
+        if step is not None:
+            self.pending.append(step)
+        self.pending.append(body)
+
+    def loop_end(self, top: int, branch: int) -> None:
+        self.emit(JUMP, 0, 0, top)
+        self.patch(branch)
+
+
+# skip the single-child expression nodes wrapping a name, number or operator node
+def unwrap(_node: ASTNODE) -> ASTNODE:
+    while _node.name == "expression" and len(_node.children) == 1 and _node.value is None:
+        _node = _node.children[0]
+    return _node
+
+
+# string literals are expression nodes with the quoted text as their value
+def is_string(_node: ASTNODE) -> bool:
+    return _node.name == "expression" and not _node.children and isinstance(_node.value, str)
+
+
+def literal(_node: ASTNODE):
+    if _node.name == "number":
+        return _node.value[0]
+    return _node.value[1:-1].encode("latin-1", "backslashreplace").decode("unicode_escape")
+
+
+# the opcode of an operator or intrinsic node
+def operation(_node: ASTNODE) -> int:
+    if _node.name == "expression" and _node.value in INTRINSIC_OPCODES:
+        return INTRINSIC_OPCODES[_node.value]
+    if _node.name in ("expression", "assign") and _node.value in BINARY_OPCODES and len(_node.children) == 2:
+        return BINARY_OPCODES[_node.value]
+    raise Exception("Unsupported expression {}".format(_node.value if _node.value else _node.name))
+
+
+# a value as Go's fmt.Println prints it; floats use the shortest digits and strconv's 'g' rule, which for
+# the shortest precision takes the exponent form when the exponent is below -4 or at least 6
+def go_string(value) -> str:
+    if type(value) is not float:
+        return str(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    number = Decimal(repr(value))
+    exponent = number.adjusted()
+    if -4 <= exponent < SHORTEST_EXPONENT_PRECISION:
+        text = format(number, "f")
+        return text.rstrip("0").rstrip(".") if "." in text else text
+    digits = "".join(str(digit) for digit in number.as_tuple().digits).rstrip("0") or "0"
+    mantissa = digits[0] + ("." + digits[1:] if len(digits) > 1 else "")
+    return "{}{}e{}{:02d}".format("-" if value < 0 else "", mantissa, "-" if exponent < 0 else "+", abs(exponent))
+
+
+def divide(left, right):
+    if type(left) is int and type(right) is int:
+        if right == 0:
+            raise VMError("integer divide by zero")
+        quotient = abs(left) // abs(right)
+        return wrap32(quotient if (left < 0) == (right < 0) else -quotient)
+    return left / right
+
+
+def modulo(left, right):
+    if type(left) is not int or type(right) is not int:
+        raise VMError("invalid operation: operator % not defined on {!r}".format(left))
+    if right == 0:
+        raise VMError("integer divide by zero")
+    return wrap32(left - divide(left, right) * right)
+
+
+def wrap32(value):
+    if type(value) is int and not -2147483648 <= value <= 2147483647:
+        return ((value + 2147483648) & 4294967295) - 2147483648
+    return value
+
+
+class VirtualMachine:
+    def __init__(self, stream=None) -> None:
+        self.stream = stream if stream is not None else sys.stdout
+        self.frame = []
+        self.executed = 0
+
+    # run a program; afterwards frame holds the final values of its variables
+    def run(self, code_object: CodeObject) -> None:
+        code = code_object.code
+        instructions = [tuple(code[index:index + 4]) for index in range(0, len(code), 4)]
+        frame = [0] * len(code_object.variables) + list(code_object.constants)
+        frame.extend([0] * (code_object.frame_size - len(frame)))
+        self.frame = frame
+        write = self.stream.write
+        pc = 0
+        try:
+            while True:
+                opcode, a, b, c = instructions[pc]
+                pc += 1
+                if opcode == MOVE:
+                    frame[a] = frame[b]
+                elif opcode == ADD:
+                    value = frame[b] + frame[c]
+                    if type(value) is int and not -2147483648 <= value <= 2147483647:
+                        value = ((value + 2147483648) & 4294967295) - 2147483648
+                    frame[a] = value
+                elif opcode == SUB:
+                    value = frame[b] - frame[c]
+                    if type(value) is int and not -2147483648 <= value <= 2147483647:
+                        value = ((value + 2147483648) & 4294967295) - 2147483648
+                    frame[a] = value
+                elif opcode == MUL:
+                    value = frame[b] * frame[c]
+                    if type(value) is int and not -2147483648 <= value <= 2147483647:
+                        value = ((value + 2147483648) & 4294967295) - 2147483648
+                    frame[a] = value
+                elif opcode <= JUMP_IF_NOT_NE:
+                    left = frame[a]
+                    right = frame[b]
+                    if opcode == JUMP_IF_NOT_LT:
+                        if not left < right:
+                            pc = c
+                    elif opcode == JUMP_IF_NOT_LE:
+                        if not left <= right:
+                            pc = c
+                    elif opcode == JUMP_IF_NOT_GT:
+                        if not left > right:
+                            pc = c
+                    elif opcode == JUMP_IF_NOT_GE:
+                        if not left >= right:
+                            pc = c
+                    elif opcode == JUMP_IF_NOT_EQ:
+                        if left != right:
+                            pc = c
+                    elif left == right:
+                        pc = c
+                elif opcode == JUMP:
+                    pc = c
+                elif opcode == JUMP_IF_FALSE:
+                    if not frame[a]:
+                        pc = c
+                elif opcode <= NE:
+                    left = frame[b]
+                    right = frame[c]
+                    if opcode == LT:
+                        frame[a] = 1 if left < right else 0
+                    elif opcode == LE:
+                        frame[a] = 1 if left <= right else 0
+                    elif opcode == GT:
+                        frame[a] = 1 if left > right else 0
+                    elif opcode == GE:
+                        frame[a] = 1 if left >= right else 0
+                    elif opcode == EQ:
+                        frame[a] = 1 if left == right else 0
+                    else:
+                        frame[a] = 1 if left != right else 0
+                elif opcode == DIV:
+                    frame[a] = divide(frame[b], frame[c])
+                elif opcode == MOD:
+                    frame[a] = modulo(frame[b], frame[c])
+                elif opcode == PRINT:
+                    write(" ".join(go_string(value) for value in frame[a:a + b]) + "\n")
+                elif opcode == HALT:
+                    break
+                elif opcode == ABS:
+                    frame[a] = wrap32(abs(frame[b]))
+                elif opcode == MIN:
+                    frame[a] = min(frame[b], frame[c])
+                elif opcode == MAX:
+                    frame[a] = max(frame[b], frame[c])
+                else:
+                    frame[a] = INTRINSICS[OPCODES[opcode]](frame[b])
+        except TypeError as error:
+            raise VMError("instruction {}: {}".format(pc - 1, error)) from None
+        except VMError as error:
+            raise VMError("instruction {}: {}".format(pc - 1, error)) from None
+
+
+# the old interpreter extended to variables, if and for statements: a walk over the nodes with string
+# comparisons, a Stack for the values and a dict of variables - against the bytecode VM
+if __name__ == "__main__":
+    import io
+    import time
+    import go_grammar
+    from SamplePrograms import FACTORIAL, FIBONACCI
+    from Stack import Stack
+
+    def tree_walk(_node: ASTNODE, stream) -> None:
+        ast_stack = Stack()
+        variables = {}
+        operators = {"+": lambda x, y: wrap32(x + y), "-": lambda x, y: wrap32(x - y),
+                     "*": lambda x, y: wrap32(x * y), "/": divide, "%": modulo,
+                     "<": lambda x, y: int(x < y), "<=": lambda x, y: int(x <= y), ">": lambda x, y: int(x > y),
+                     ">=": lambda x, y: int(x >= y), "==": lambda x, y: int(x == y),
+                     "!=": lambda x, y: int(x != y)}
+        pending = [_node]
+        while pending:
+            _node = pending.pop()
+            if type(_node) is tuple:
+                action = _node[0]
+                if action == "print":
+                    stream.write(go_string(ast_stack.pop()) + "\n")
+                elif action == "store":
+                    variables[_node[1]] = ast_stack.pop()
+                elif action == "apply":
+                    right = ast_stack.pop()
+                    ast_stack.push(operators[_node[1]](ast_stack.pop(), right))
+                elif action == "if":
+                    taken = _node[1] if ast_stack.pop() else _node[2]
+                    if taken is not None:
+                        pending.append(taken)
+                elif action == "loop":
+                    if ast_stack.pop():
+                        # the body, then the step, then the condition again
+                        pending.append(("test",) + _node[1:])
+                        pending.extend(_node[3:])
+                        pending.append(_node[2])
+                elif action == "test":
+                    pending.append(("loop",) + _node[1:])
+                    pending.append(_node[1])
+            elif _node.name in ["program", "statement_list", "statement", "block_statement"]:
+                pending.extend(reversed(_node.children))
+            elif _node.name == "print":
+                pending.append(("print",))
+                pending.extend(reversed(_node.children))
+            elif _node.name == "assign" and _node.value in ASSIGNMENT_OPERATORS:
+                pending.append(("store", _node.children[0].value))
+                pending.append(_node.children[1])
+            elif _node.name in ["assign", "expression"] and len(_node.children) == 2:
+                pending.append(("apply", _node.value))
+                pending.extend(reversed(_node.children))
+            elif _node.name == "expression":
+                pending.extend(reversed(_node.children))
+            elif _node.name == "if_statement":
+                else_block = _node.children[2] if len(_node.children) == 3 else None
+                pending.append(("if", _node.children[1], else_block))
+                pending.append(_node.children[0])
+            elif _node.name == "for":
+                if len(_node.children) == 4:
+                    init, condition, step, body = _node.children
+                    pending.append(("test", condition, body, step))
+                    pending.append(init)
+                else:
+                    pending.append(("test", _node.children[0], _node.children[1]))
+            elif _node.name == "name":
+                ast_stack.push(variables.get(_node.value, 0))
+            elif _node.name == "number":
+                ast_stack.push(_node.value[0])
+            else:
+                raise Exception("Unknown node name {}".format(_node.name))
+
+    # what go run prints for fmt.Println of these float64 values
+    for value, expected in ((1e20, "1e+20"), (1234567.0, "1.234567e+06"), (1e8, "1e+08"), (3.5, "3.5"),
+                            (123456.0, "123456"), (0.0001, "0.0001"), (0.00001, "1e-05")):
+        printed = go_string(value)
+        print("go_string({!r}) = {}{}".format(value, printed, "" if printed == expected else
+                                              " DIFFERENT from Go's " + expected))
+
+    programs = [("factorial", FACTORIAL.replace("var x = 5", "var x = N")),
+                ("fibonacci", FIBONACCI.replace("var n = 10", "var n = N"))]
+    code = BytecodeCompiler().compile(go_grammar.parser.parse(FACTORIAL))
+    print("\n".join(code.disassemble()))
+    for sample_name, template in programs:
+        for n in (10, 100000, 1000000):
+            ast = go_grammar.parser.parse(template.replace("N", str(n)))
+            timings = []
+            outputs = []
+            for run in (lambda stream: tree_walk(ast, stream),
+                        lambda stream: VirtualMachine(stream).run(BytecodeCompiler().compile(ast))):
+                if n > 100000 and not timings:
+                    timings.append(None)  # the tree walker takes too long
+                    outputs.append(None)
+                    continue
+                stream = io.StringIO()
+                start = time.perf_counter()
+                run(stream)
+                timings.append(time.perf_counter() - start)
+                outputs.append(stream.getvalue())
+            walk_time, vm_time = timings
+            print("{:>10} n={:<8} tree walker {:>9} VM {:7.3f}s {:>8}  output {}{}".format(
+                sample_name, n, "{:8.3f}s".format(walk_time) if walk_time else "-", vm_time,
+                "{:.1f}x".format(walk_time / vm_time) if walk_time else "", outputs[1].strip(),
+                "" if outputs[0] in (None, outputs[1]) else " DIFFERENT from " + outputs[0].strip()))
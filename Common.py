@@ -7,40 +7,141 @@
 #           Copyright (2021) Deanna M. Wilborne
 #
 # History:
+#           2026-10-18, TP, object_type() caches the name of each type; is_int() and is_float() match a regular
+#                           expression instead of catching ValueError; added number_literal() for Go literals
 #           2024-02-27, DMW, updated for 24SP-CSC486DW
 #           2023-03-28, DMW, updated for 23SU-CSC420
 #           2021-09-17, DMW, created
 
+import re
+
+# the strings int() and float() accept, without calling them
+INT_TEXT = re.compile(r"\s*[+-]?\d(?:_?\d)*\s*")
+FLOAT_TEXT = re.compile(r"""\s*[+-]?(?:
+    (?:\d(?:_?\d)*(?:\.(?:\d(?:_?\d)*)?)?|\.\d(?:_?\d)*)(?:[eE][+-]?\d(?:_?\d)*)?
+    |inf(?:inity)?|nan)\s*""", re.VERBOSE | re.IGNORECASE)
+
+# Go number literals, https://go.dev/ref/spec#Integer_literals and #Floating-point_literals; the name of the
+# group that matches is the base to pass to int(), which takes the prefixes and underscores as Go does (017 is
+# octal), or the kind of float
+NUMBER_LITERAL = re.compile(r"""
+    (?P<decimal>0|[1-9](?:_?[0-9])*)
+    |(?P<hexadecimal>0[xX](?:_?[0-9a-fA-F])+)
+    |(?P<octal>0[oO](?:_?[0-7])+|0(?:_?[0-7])+)
+    |(?P<binary>0[bB](?:_?[01])+)
+    |(?P<float>(?:[0-9](?:_?[0-9])*\.(?:[0-9](?:_?[0-9])*)?|\.[0-9](?:_?[0-9])*)(?:[eE][+-]?[0-9](?:_?[0-9])*)?
+        |[0-9](?:_?[0-9])*[eE][+-]?[0-9](?:_?[0-9])*)
+    |(?P<hexadecimal_float>0[xX](?:_?[0-9a-fA-F])*(?:\.(?:[0-9a-fA-F](?:_?[0-9a-fA-F])*)?)?[pP][+-]?[0-9](?:_?[0-9])*)
+    """, re.VERBOSE)
+INTEGER_BASES = {"decimal": 10, "hexadecimal": 16, "octal": 8, "binary": 2}
+
+
 class Common:
     version = "2024-02-27"
+    type_names = {}  # type -> the name object_type() gives it
 
     # provide a short string description of the object's type or class
     # for example, 'int', 'float', 'str', etc.
     @staticmethod
     def object_type(obj: any) -> str:
-        s = str(type(obj)).split("'")[1]
-        if '.' in s:
-            return s.split('.')[1]
-        return s
+        obj_type = type(obj)
+        name = Common.type_names.get(obj_type)
+        if name is None:
+            s = str(obj_type).split("'")[1]
+            name = Common.type_names[obj_type] = s.split('.')[1] if '.' in s else s
+        return name
 
     @staticmethod
     def is_int(source: str = "") -> bool:
-        try:
-            int_number = int(source)
-        except ValueError:
-            return False
-        return True
+        return INT_TEXT.fullmatch(source) is not None
 
     @staticmethod
     def is_float(source: str = "") -> bool:
+        return FLOAT_TEXT.fullmatch(source) is not None
+
+    # the (value, kind) of a Go integer or floating-point literal, kind is "integer" or "float"; None if the
+    # text isn't one, the hexadecimal, octal, binary and underscore forms included
+    @staticmethod
+    def number_literal(source) -> tuple:
+        if type(source) is bytes:
+            source = source.decode("ascii", "replace")
+        if source.isdigit() and source.isascii() and (source[0] != "0" or len(source) == 1):
+            return int(source), "integer"
+        match = NUMBER_LITERAL.fullmatch(source)
+        if match is None:
+            return None
+        kind = match.lastgroup
+        if kind == "float":
+            return float(source), "float"
+        if kind == "hexadecimal_float":
+            mantissa, _, exponent = source.replace("_", "").lower().partition("p")
+            if mantissa == "0x." or mantissa == "0x":
+                return None  # a hexadecimal mantissa needs a digit
+            return float.fromhex(mantissa + "p" + exponent), "float"
+        return int(source, INTEGER_BASES[kind]), "integer"
+
+
+# limited testing, and the literal classifier against int() with a fall back on float() on numeric-heavy
+# sources
+if __name__ == '__main__':
+    import random
+    import time
+
+    print(Common.object_type(5.1))
+    # print(Common.objectType(Token()))
+    for literal in ("42", "4_2", "017", "0o17", "0x_1F", "0b1010", "3.25", "1e3", ".5", "1_0.5e-1", "0x1.8p3",
+                    "09", "1__0", "0x", "0b102", "0x.p1"):
+        print("{:>10} {}".format(literal, Common.number_literal(literal)))
+
+    # helper function create a Python int or float as needed, as the lexer did
+    def string_to_number(s):
         try:
-            float_number = float(source)
+            ans = (int(s), "integer")
+        except ValueError:
+            ans = (float(s), "float")
+
+        return ans
+
+    def is_int(source: str = "") -> bool:
+        try:
+            int(source)
         except ValueError:
             return False
         return True
 
+    random.seed(19)
+    sources = {
+        "integers": [str(random.randint(0, 10 ** 6)) for _ in range(200000)],
+        "floats": ["{:.4f}".format(random.random() * 1000) for _ in range(200000)],
+        "mixed": [str(random.randint(0, 999)) if random.random() < 0.5 else "{:.3e}".format(random.random())
+                  for _ in range(200000)],
+    }
+    print("{:>9} {:>17} {:>17}".format("literals", "int() then float()", "number_literal()"))
+    for label, literals in sources.items():
+        timings = []
+        for classify in (string_to_number, Common.number_literal):
+            start = time.perf_counter()
+            for literal in literals:
+                classify(literal)
+            timings.append(time.perf_counter() - start)
+        print("{:>9} {:>16.3f}s {:>16.3f}s".format(label, *timings))
 
-# limited testing
-if __name__ == '__main__':
-    print(Common.object_type(5.1))
-    # print(Common.objectType(Token()))
+    words = [random.choice(["12", "x", "1.5", "1e9", "-3", " 7 ", "1_000", "abc", ""]) for _ in range(200000)]
+    for label, check in (("is_int() catching ValueError", is_int), ("is_int()", Common.is_int)):
+        start = time.perf_counter()
+        for word in words:
+            check(word)
+        print("{:>28} {:8.3f}s".format(label, time.perf_counter() - start))
+
+    def object_type(obj: any) -> str:
+        s = str(type(obj)).split("'")[1]
+        if '.' in s:
+            return s.split('.')[1]
+        return s
+
+    values = [1, 2.5, "s", [], None, True] * 50000
+    for label, check in (("object_type() splitting", object_type), ("object_type()", Common.object_type)):
+        start = time.perf_counter()
+        for value in values:
+            check(value)
+        print("{:>28} {:8.3f}s".format(label, time.perf_counter() - start))
@@ -0,0 +1,170 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: On-disk cache of compiled programs (AST and MIPS32 assembly), so unchanged sources are not parsed
+         or emitted again.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - An entry is keyed by a hash of the source, the grammar version (the GrammarCache table hashes), the
+    source of the compiler modules that shape the output, and the emitter options. Any change to one of
+    them gives a different key, so entries never have to be invalidated, only evicted.
+  - One file per entry, holding the pickled ASTNODE.to_records() list and the assembly lines. Files are
+    written to a temporary name and renamed, so several processes can share a directory.
+  - Least recently used entries are removed once the directory grows past max_bytes; a hit refreshes the
+    modification time of its file, which is what the LRU order is read from when a cache is opened.
+
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+from ASTNODE import to_records
+from go_grammar import grammar_cache
+
+# the modules whose code decides what an AST and its assembly look like; go_grammar.py for the p_ rule
+# bodies, which the grammar version doesn't cover, Common.py for the values of number tokens, FastLexer.py
+# for the tokens and positions of the default lexer and CompilerSession.py for the order the passes run in
+COMPILER_MODULES = ("ASTNODE.py", "Common.py", "CompilerSession.py", "ConstantFolder.py", "ControlFlow.py",
+                    "DataLayout.py", "FastLexer.py", "go_grammar.py", "LoopOptimizer.py", "MIPS32_Emitter.py", "MIPS32_IR.py",
+                    "MIPS32_Peephole.py", "RegisterAllocator.py", "SSA.py", "SymbolTable.py", "TypeChecker.py")
+
+ENTRY_SUFFIX = ".entry"
+
+_compiler_version = None
+
+
+# a hash of the compiler modules' source, computed once per process
+def compiler_version() -> str:
+    global _compiler_version
+    if _compiler_version is None:
+        digest = hashlib.sha256()
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for module_file_name in COMPILER_MODULES:
+            with open(os.path.join(directory, module_file_name), "rb") as module_file:
+                digest.update(module_file.read())
+        _compiler_version = digest.hexdigest()[:16]
+    return _compiler_version
+
+
+class CompileCache:
+    def __init__(self, directory: str, max_bytes: int = 64 << 20) -> None:
+        self.directory = directory
+        self.grammar_version = grammar_cache.version()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        # key -> size, in least to most recently used order
+        self.entries = {}
+        self.total_bytes = 0
+        found = []
+        for file_name in os.listdir(directory):
+            if file_name.endswith(ENTRY_SUFFIX):
+                status = os.stat(os.path.join(directory, file_name))
+                found.append((status.st_mtime, file_name[:-len(ENTRY_SUFFIX)], status.st_size))
+        for _, key, size in sorted(found):
+            self.entries[key] = size
+            self.total_bytes += size
+        self.evict()
+
+    # a str source and its UTF-8 bytes have the same key
+    def key(self, source, options: tuple) -> str:
+        digest = hashlib.sha256(source.encode("utf-8") if isinstance(source, str) else source)
+        digest.update(repr((self.grammar_version, compiler_version(), options)).encode("utf-8"))
+        return digest.hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    # the (ASTNODE.to_records() list, assembly lines) compiled earlier from this source with these options,
+    # or None
+    def get(self, source, options: tuple):
+        key = self.key(source, options)
+        try:
+            with open(self.path(key), "rb") as entry_file:
+                records, lines = pickle.load(entry_file)
+                size = os.fstat(entry_file.fileno()).st_size
+            os.utime(self.path(key))
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            self.forget(key)
+            return None
+        self.hits += 1
+        if key in self.entries:
+            self.entries[key] = self.entries.pop(key)  # now the most recently used
+        else:
+            # written by another process since this cache was opened
+            self.entries[key] = size
+            self.total_bytes += size
+            self.evict()
+        return records, lines
+
+    def put(self, source, options: tuple, ast, lines: list) -> None:
+        key = self.key(source, options)
+        data = pickle.dumps((to_records(ast), lines), pickle.HIGHEST_PROTOCOL)
+        handle, temporary_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as entry_file:
+            entry_file.write(data)
+        os.replace(temporary_name, self.path(key))
+        self.forget(key)
+        self.entries[key] = len(data)
+        self.total_bytes += len(data)
+        self.stores += 1
+        self.evict()
+
+    def forget(self, key: str) -> None:
+        self.total_bytes -= self.entries.pop(key, 0)
+
+    # remove least recently used entries until the cache fits in max_bytes
+    def evict(self) -> None:
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            key = next(iter(self.entries))
+            self.forget(key)
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass  # already removed by another process
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit rate": self.hits / lookups if lookups else 0.0,
+                "stores": self.stores, "evictions": self.evictions, "entries": len(self.entries),
+                "bytes": self.total_bytes}
+
+
+# recompile a set of programs after changing one of them
+if __name__ == "__main__":
+    import shutil
+    import time
+    from CompilerSession import CompilerSession
+
+    sources = ["\n".join("var v{0} = v{1} * {2} + {0}\nfmt.Println(v{0})".format(j, max(j - 1, 0), i)
+                         for j in range(30)) + "\n" for i in range(300)]
+    cache_directory = tempfile.mkdtemp(prefix="go_compile_cache_")
+    try:
+        def compile_all(label: str, cache_size: int = 64 << 20) -> None:
+            session = CompilerSession(cache=CompileCache(cache_directory, cache_size))
+            start = time.perf_counter()
+            for source in sources:
+                session.compile(source)
+            seconds = time.perf_counter() - start
+            print("{:>22}: {:7.3f}s  {}".format(label, seconds, session.cache.stats()))
+
+        compile_all("cold cache")
+        compile_all("warm cache")
+        sources[150] = sources[150].replace("fmt.Println(v29)", "fmt.Println(v29 + 1)")
+        compile_all("one source changed")
+        compile_all("shrunk to 100 KB", 100 << 10)
+        print("without a cache: ", end="")
+        start = time.perf_counter()
+        uncached = CompilerSession()
+        for source in sources:
+            uncached.compile(source)
+        print("{:.3f}s".format(time.perf_counter() - start))
+    finally:
+        shutil.rmtree(cache_directory)
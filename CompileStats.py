@@ -0,0 +1,207 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Per-phase compile statistics: wall time, memory traced by tracemalloc, and the tokens, AST nodes and
+         instructions each phase produced; printed as the --stats report or saved as JSON.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - The phases, in the order a program goes through them: cache (the CompileCache lookup), lex, parse, fold,
+    loops, typecheck, ssa (building and optimizing the SSA program in ssa mode), emit and peephole.
+  - The parser builds the AST nodes as it reduces, so AST construction is part of parse; its cost shows when
+    comparing --ast anytree and --ast slots.
+  - Phases nest: typecheck, ssa and peephole run inside emit. The seconds and allocated bytes of a phase are
+    its own, without the phases inside it; its peak is the high-water mark of traced memory above where it
+    started, the phases inside included. allocated is what the phase left allocated at its end (net bytes).
+  - memory=True reads the memory from tracemalloc, which has to be tracing; CompilerSession starts it. Tracing
+    slows allocation down a lot, so only compare the times of runs with the same setting.
+  - The JSON carries the hash of the compiler modules (see CompileCache) and of each module, so runs can be
+    matched to the versions of go_grammar.py and MIPS32_Emitter.py they measured.
+
+"""
+import hashlib
+import json
+import os
+import platform
+import time
+import tracemalloc
+from CompileCache import COMPILER_MODULES, compiler_version
+
+PHASES = ("cache", "lex", "parse", "fold", "loops", "typecheck", "ssa", "emit", "peephole")
+
+
+class PhaseStats:
+    __slots__ = ("name", "calls", "seconds", "allocated", "peak", "tokens", "nodes", "instructions")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.allocated = 0   # bytes
+        self.peak = 0        # bytes
+        self.tokens = 0
+        self.nodes = 0
+        self.instructions = 0
+
+    def __repr__(self) -> str:
+        return "PhaseStats({}, {} calls, {:.6f}s)".format(self.name, self.calls, self.seconds)
+
+    def merge(self, other: "PhaseStats") -> None:
+        self.calls += other.calls
+        self.seconds += other.seconds
+        self.allocated += other.allocated
+        self.peak = max(self.peak, other.peak)
+        self.tokens += other.tokens
+        self.nodes += other.nodes
+        self.instructions += other.instructions
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class CompileStats:
+    def __init__(self, memory: bool = True) -> None:
+        self.memory = memory
+        self.files = 0
+        self.phases = {}  # name -> PhaseStats
+        self.open = []    # [phase, start time, traced at start, high-water mark, seconds nested, bytes nested]
+
+    def begin(self, name: str) -> None:
+        traced = 0
+        if self.memory:
+            traced, peak = tracemalloc.get_traced_memory()
+            if self.open:
+                self.open[-1][3] = max(self.open[-1][3], peak)
+            tracemalloc.reset_peak()
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = PhaseStats(name)
+        self.open.append([phase, time.perf_counter(), traced, traced, 0.0, 0])
+
+    # end the phase begun last; counts are added to its counters, e.g. end(tokens=120)
+    def end(self, **counts) -> PhaseStats:
+        seconds = time.perf_counter()
+        phase, start, start_traced, high, nested_seconds, nested_bytes = self.open.pop()
+        seconds -= start
+        traced = start_traced
+        if self.memory:
+            traced, peak = tracemalloc.get_traced_memory()
+            high = max(high, peak)
+        phase.calls += 1
+        phase.seconds += seconds - nested_seconds
+        phase.allocated += traced - start_traced - nested_bytes
+        phase.peak = max(phase.peak, high - start_traced)
+        for name, count in counts.items():
+            setattr(phase, name, getattr(phase, name) + count)
+        if self.open:
+            outer = self.open[-1]
+            outer[3] = max(outer[3], high)
+            outer[4] += seconds
+            outer[5] += traced - start_traced
+        return phase
+
+    # end the phases an exception left open
+    def end_all(self) -> None:
+        while self.open:
+            self.end()
+
+    # add the statistics of another run, e.g. of another file or another worker
+    def merge(self, other: "CompileStats") -> None:
+        self.files += other.files
+        for name, phase in other.phases.items():
+            if name not in self.phases:
+                self.phases[name] = PhaseStats(name)
+            self.phases[name].merge(phase)
+
+    # the phases in pipeline order, then any others in the order they were first run
+    def ordered(self) -> list:
+        names = [name for name in PHASES if name in self.phases]
+        names += [name for name in self.phases if name not in PHASES]
+        return [self.phases[name] for name in names]
+
+    def total(self) -> PhaseStats:
+        total = PhaseStats("total")
+        for phase in self.phases.values():
+            total.merge(phase)
+        total.calls = self.files
+        return total
+
+    def report(self) -> list:
+        lines = ["{:>10} {:>7} {:>10} {:>6} {:>13} {:>11} {:>9} {:>9} {:>13}".format(
+            "phase", "calls", "ms", "%", "allocated KiB", "peak KiB", "tokens", "nodes", "instructions")]
+        total = self.total()
+        for phase in self.ordered() + [total]:
+            share = 100 * phase.seconds / total.seconds if total.seconds else 0.0
+            memory = ("{:>13.1f} {:>11.1f}".format(phase.allocated / 1024, phase.peak / 1024) if self.memory
+                      else "{:>13} {:>11}".format("-", "-"))
+            lines.append("{:>10} {:>7} {:>10.3f} {:>6.1f} {} {:>9} {:>9} {:>13}".format(
+                phase.name, phase.calls, phase.seconds * 1000, share, memory, phase.tokens, phase.nodes,
+                phase.instructions))
+        if total.seconds:
+            lines.append("{} files, {:.0f} tokens/s, {:.0f} nodes/s, {:.0f} instructions/s end to end".format(
+                self.files, total.tokens / total.seconds, total.nodes / total.seconds,
+                total.instructions / total.seconds))
+        return lines
+
+    def to_dict(self, **options) -> dict:
+        return {
+            "compiler": compiler_version(),
+            "modules": module_versions(),
+            "python": platform.python_version(),
+            "options": options,
+            "files": self.files,
+            "memory": self.memory,
+            "phases": [phase.to_dict() for phase in self.ordered()],
+            "total": self.total().to_dict(),
+        }
+
+    def save(self, file_name: str, **options) -> None:
+        with open(file_name, "w") as json_file:
+            json.dump(self.to_dict(**options), json_file, indent=2)
+            json_file.write("\n")
+
+
+# a hash of each compiler module's source, so a change shows which module it came from
+def module_versions() -> dict:
+    directory = os.path.dirname(os.path.abspath(__file__))
+    versions = {}
+    for module_file_name in COMPILER_MODULES:
+        with open(os.path.join(directory, module_file_name), "rb") as module_file:
+            versions[module_file_name] = hashlib.sha256(module_file.read()).hexdigest()[:16]
+    return versions
+
+
+# the lines of an assembly listing that are instructions, not directives, labels, data or comments
+def instruction_count(lines: list) -> int:
+    count = 0
+    for line in lines:
+        line = line.strip()
+        if line and line[0] != "." and line[0] != "#" and ":" not in line:
+            count += 1
+    return count
+
+
+# the statistics of the sample programs and of a generated program, in each emitter mode
+if __name__ == "__main__":
+    import sys
+    from ASTNODE import AST_BACKENDS
+    from CompilerSession import CompilerSession
+    from SamplePrograms import SAMPLE_PROGRAMS
+    from StressTest import generate
+
+    sources = list(SAMPLE_PROGRAMS.values()) + [generate(2000)]
+    for node_class_name in AST_BACKENDS:
+        for mode in ("stack", "register", "ssa"):
+            session = CompilerSession(mode=mode, stats=True, trace_memory=False,
+                                      node_class=AST_BACKENDS[node_class_name])
+            stats = CompileStats(memory=False)
+            for source in sources:
+                stats.merge(session.compile(source).stats)
+            print("mode {}, {} nodes".format(mode, node_class_name))
+            print("\n".join(stats.report()))
+            print()
+    session = CompilerSession(stats=True)
+    result = session.compile(sources[-1])
+    json.dump(result.stats.to_dict(mode="stack"), sys.stdout, indent=2)
+    print()
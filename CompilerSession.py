@@ -0,0 +1,265 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Compile Go sources to MIPS32 assembly without module-global state, so one process (or one session
+         per thread) can compile many programs in a row.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - A session owns a clone of the go_grammar lexer and a copy of its LR parser; both share the tables built
+    when go_grammar was imported. Lexer and syntax errors are collected as diagnostics instead of printed.
+  - node_class picks the AST backend: ASTNODE (anytree) or SlotNode, see ASTNODE.AST_BACKENDS.
+  - lexer_backend picks the lexer: "fast" (FastLexer, the default) or "ply", see FastLexer.LEXER_BACKENDS.
+    Both give the same tokens.
+  - compile() takes a str or UTF-8 bytes/mmap (ReadFile(mapped=True).buffer); FastLexer scans a buffer
+    without decoding it, the PLY lexer gets it decoded. Columns of a buffer source count bytes.
+  - loops=None, the default, runs the LoopOptimizer in register and ssa mode only. In stack mode the
+    variables it adds are loaded and stored around every use, which can cost more than the code it saves (see
+    the LoopOptimizer demo).
+  - Sessions are not thread safe, use one per thread; compile() keeps one per thread for you.
+  - With a CompileCache, a source compiled before with the same options is returned from the cache
+    without being lexed, parsed or emitted; only programs without errors are stored, and the AST stored is
+    the one the assembly was emitted from (after folding and the loop optimizations).
+  - stats=True collects a CompileStats per compile(), in CompileResult.stats. The source is then lexed into a
+    list before parsing so lex and parse are timed apart, and lexer errors are listed before syntax errors.
+    trace_memory=False leaves tracemalloc off, for times closer to a run without stats.
+  - Type errors and programs the emitter can't compile (TypeCheckError, EmitterError) are diagnostics of the
+    emitter stage; any other exception is a bug in the compiler and propagates.
+  - PLY hands errok()/restart() to the error function through ply.yacc module globals; the session's error
+    function doesn't call them, so concurrent sessions don't depend on that state.
+
+"""
+import copy
+import functools
+import threading
+import tracemalloc
+import go_grammar
+from ASTNODE import ASTNODE, from_records, node_count
+from CompileStats import CompileStats, instruction_count
+from ConstantFolder import ConstantFolder
+from FastLexer import FastLexer, LEXER_BACKENDS
+from LineIndex import source_column
+from LoopOptimizer import LoopOptimizer
+from MIPS32_Emitter import MIPS32Emitter, EmitterError
+from TypeChecker import TypeCheckError
+
+# the modes the LoopOptimizer runs in unless loops is given
+LOOP_MODES = ("register", "ssa")
+
+
+class Diagnostic:
+    __slots__ = ("stage", "message", "line", "column")
+
+    def __init__(self, stage: str, message: str, line=None, column=None) -> None:
+        self.stage = stage      # "lexer", "parser" or "emitter"
+        self.message = message
+        self.line = line
+        self.column = column
+
+    def __str__(self) -> str:
+        if self.line is None:
+            return "{} error: {}".format(self.stage, self.message)
+        return "{} error at line {}, column {}: {}".format(self.stage, self.line, self.column, self.message)
+
+    def __repr__(self) -> str:
+        return "Diagnostic({!r}, {!r}, {}, {})".format(self.stage, self.message, self.line, self.column)
+
+
+class CompileResult:
+    __slots__ = ("source", "_ast", "records", "node_class", "lines", "diagnostics", "cached", "stats")
+
+    def __init__(self, source: str, ast, lines: list, diagnostics: list, records=None, node_class=ASTNODE,
+                 stats=None) -> None:
+        self.source = source
+        self._ast = ast
+        self.records = records          # ASTNODE.to_records() of a cached program, rebuilt into .ast when needed
+        self.node_class = node_class
+        self.lines = lines              # the assembly, one line per item; empty when there were errors
+        self.diagnostics = diagnostics
+        self.cached = records is not None
+        self.stats = stats              # a CompileStats when the session collects them
+
+    # the program node, None when the source didn't parse
+    @property
+    def ast(self):
+        if self._ast is None and self.records is not None:
+            self._ast = from_records(self.records, self.node_class)
+        return self._ast
+
+    @property
+    def success(self) -> bool:
+        return not self.diagnostics
+
+    def assembly(self) -> str:
+        return "\n".join(self.lines) + "\n" if self.lines else ""
+
+
+class CompilerSession:
+    def __init__(self, fold: bool = True, mode: str = "stack", peephole: bool = True, cache=None,
+                 node_class=ASTNODE, lexer_backend: str = "fast", loops: bool = None, stats: bool = False,
+                 trace_memory: bool = True) -> None:
+        self.fold = fold
+        self.loops = mode in LOOP_MODES if loops is None else loops  # run LoopOptimizer after folding
+        self.mode = mode
+        self.peephole = peephole
+        self.cache = cache              # a CompileCache, or None
+        self.node_class = node_class
+        self.stats = stats              # collect a CompileStats per compile()
+        self.trace_memory = trace_memory
+        if stats and trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.lexer_backend = lexer_backend
+        self.lexer = LEXER_BACKENDS[lexer_backend].clone()
+        self.lexer.lexerrorf = self.illegal_character
+        self.parser = copy.copy(go_grammar.parser)  # shares the LR tables, parse() keeps its stacks on the copy
+        self.parser.errorfunc = self.syntax_error
+        self.parser.node_class = node_class
+        self.source = ""
+        self.line_index = [None, None]  # [source, its LineIndex] when the source has a long line
+        self.diagnostics = []
+        self.compiled = 0
+
+    # the lexer's error function: an illegal character, or a malformed number literal (a NUMBER token holding
+    # its text) the lexer has scanned past already
+    def illegal_character(self, token) -> None:
+        if token.type == "NUMBER":
+            self.diagnostics.append(Diagnostic("lexer", "Illegal number literal '{}'".format(token.value),
+                                               token.lineno, self.column(token)))
+            return
+        self.diagnostics.append(Diagnostic("lexer", "Illegal character '{}'".format(token.value[0]),
+                                           token.lineno, self.column(token)))
+        token.lexer.skip(1)
+
+    def syntax_error(self, token) -> None:
+        if token is None:
+            self.diagnostics.append(Diagnostic("parser", "Syntax error at EOF"))
+        else:
+            value = token.value[0] if token.type == "NUMBER" else token.value  # numbers are (value, kind)
+            self.diagnostics.append(Diagnostic("parser", "Syntax error at '{}'".format(value),
+                                               token.lineno, self.column(token)))
+
+    # the 1 based column of a token, from the newlines FastLexer indexed while scanning, or by rfind in the
+    # source (see LineIndex.source_column)
+    def column(self, token) -> int:
+        line_index = getattr(self.lexer, "line_index", None)
+        if line_index is None:
+            return source_column(self.source, token.lexpos, self.line_index)
+        return line_index.column(token.lexpos)
+
+    # parse a source into its program node, None when nothing could be parsed
+    def parse(self, source, stats=None):
+        if not isinstance(source, str) and not isinstance(self.lexer, FastLexer):
+            source = str(source, "utf-8")
+        self.source = source
+        self.line_index = [None, None]
+        self.diagnostics = []
+        self.lexer.lineno = 1
+        if stats is None:
+            return self.parser.parse(source, lexer=self.lexer)
+        stats.begin("lex")
+        self.lexer.input(source)
+        tokens = list(iter(self.lexer.token, None))
+        stats.end(tokens=len(tokens))
+        stats.begin("parse")
+        ast = self.parser.parse(lexer=self.lexer, tokenfunc=functools.partial(next, iter(tokens), None))
+        stats.end(nodes=node_count(ast) if ast is not None else 0)
+        return ast
+
+    # the options that change the output, part of the compile cache key
+    def options(self) -> tuple:
+        return self.fold, self.mode, self.peephole, self.loops, self.lexer_backend
+
+    def compile(self, source) -> CompileResult:
+        stats = None
+        if self.stats:
+            stats = CompileStats(self.trace_memory)
+            stats.files = 1
+        if self.cache is not None:
+            if stats is not None:
+                stats.begin("cache")
+            entry = self.cache.get(source, self.options())
+            if stats is not None:
+                stats.end()
+            if entry is not None:
+                self.compiled += 1
+                return CompileResult(source, None, entry[1], [], records=entry[0], node_class=self.node_class,
+                                     stats=stats)
+        ast = self.parse(source, stats)
+        lines = []
+        if ast is None and not self.diagnostics:
+            self.diagnostics.append(Diagnostic("parser", "No program"))
+        if not self.diagnostics:
+            try:
+                if self.fold:
+                    if stats is not None:
+                        stats.begin("fold")
+                    ConstantFolder().fold(ast)
+                    if stats is not None:
+                        stats.end()
+                if self.loops:
+                    if stats is not None:
+                        stats.begin("loops")
+                    LoopOptimizer().optimize(ast)
+                    if stats is not None:
+                        stats.end()
+                if stats is not None:
+                    stats.begin("emit")
+                lines = list(MIPS32Emitter(peephole=self.peephole, mode=self.mode, stats=stats).iter_lines(ast))
+                if stats is not None:
+                    stats.end(instructions=instruction_count(lines))
+            except (EmitterError, TypeCheckError) as error:
+                self.diagnostics.append(Diagnostic("emitter", str(error)))
+                lines = []
+                if stats is not None:
+                    stats.end_all()
+        if self.cache is not None and not self.diagnostics:
+            self.cache.put(source, self.options(), ast, lines)
+        self.compiled += 1
+        return CompileResult(source, ast, lines, self.diagnostics, stats=stats)
+
+
+# one default session per thread
+sessions = threading.local()
+
+
+def compile(source: str) -> CompileResult:
+    session = getattr(sessions, "session", None)
+    if session is None:
+        session = sessions.session = CompilerSession()
+    return session.compile(source)
+
+
+# compile many small programs in one process, and the same programs from several threads
+if __name__ == "__main__":
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from SamplePrograms import SAMPLE_PROGRAMS
+
+    sources = list(SAMPLE_PROGRAMS.values())
+    sources += ["var a = {0}\nvar b = a * {1} + {0}\nfmt.Println(b - {1})\n".format(i, i % 7) for i in range(200)]
+    sources += ["var x = 5\nfmt.Println(x $ 2)\n", "var = 5\n", "fmt.Println(\n"]
+
+    for result in compile(sources[-3]), compile(sources[-2]), compile(sources[-1]):
+        print(repr(result.source), "->", "; ".join(str(diagnostic) for diagnostic in result.diagnostics))
+
+    # sin of a variable is rejected whether or not the ConstantFolder knows its value
+    for mode in ("stack", "register", "ssa"):
+        for fold in (True, False):
+            result = CompilerSession(mode=mode, fold=fold).compile("var x = 1.0\nvar y = sin(x)\nfmt.Println(y)\n")
+            print("sin(x), {} mode, fold={}: {}".format(mode, fold, "; ".join(
+                str(diagnostic) for diagnostic in result.diagnostics) or "{} lines".format(len(result.lines))))
+
+    session = CompilerSession()
+    count = 5000
+    start = time.perf_counter()
+    for index in range(count):
+        session.compile(sources[index % len(sources)])
+    seconds = time.perf_counter() - start
+    print("{} programs in {:.2f}s, {:.0f} programs/s in one session".format(count, seconds, count / seconds))
+
+    expected = [compile(source).assembly() for source in sources]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda source: compile(source).assembly(), sources * 10))
+    print("4 threads, {} programs: {}".format(len(results), "same assembly as one session"
+                                               if results == expected * 10 else "DIFFERENT assembly"))
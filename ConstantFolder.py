@@ -0,0 +1,322 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Constant folding and propagation over the AST, run between parser.parse and the emitter.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - Constant expressions, including the intrinsics abs/min/max/sin/cos/tan, are replaced by number nodes.
+    Integer arithmetic wraps to 32 bits like the MIPS32 code it replaces; division by zero is left alone
+    so it still happens at run time.
+  - Known values flow through assign nodes in program order. A for loop forgets the variables assigned
+    anywhere inside it before its condition is evaluated, since they change across the back edge, and the
+    two arms of an if statement are merged by keeping the values they agree on.
+  - An if statement whose condition folds to a constant is replaced by the block that runs, and a for loop
+    whose condition is constant false by its init clause, unless the init clause declares a variable.
+  - Known values are not propagated into the argument of sin, cos or tan. Only a constant argument is valid
+    there (see TypeChecker), and whether a program is valid must not depend on folding.
+  - A variable declared in a block or for statement shadows the one of the same name outside; the outer value
+    is known again once the block is left.
+
+"""
+import math
+from ASTNODE import ASTNODE, ASSIGNMENT_OPERATORS, statements
+from TypeChecker import FLOAT_FUNCTIONS
+
+# the intrinsic functions parsed by p_ABS ... p_MAX, the node value is the function name
+INTRINSICS = {
+    "abs": abs,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "min": min,
+    "max": max,
+}
+
+COMPARISONS = {
+    "<": lambda left, right: left < right,
+    "<=": lambda left, right: left <= right,
+    ">": lambda left, right: left > right,
+    ">=": lambda left, right: left >= right,
+    "==": lambda left, right: left == right,
+    "!=": lambda left, right: left != right,
+}
+
+
+# wrap an integer to 32 bits, two's complement
+def wrap32(value: int) -> int:
+    return ((value + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+
+
+# evaluate a binary operator on two (value, kind) constants, None when it can't be done at compile time
+def evaluate_binary(operator: str, left: tuple, right: tuple):
+    left_value, left_kind = left
+    right_value, right_kind = right
+    if left_kind not in ("integer", "float") or right_kind not in ("integer", "float"):
+        return None
+    if operator in COMPARISONS:
+        return int(COMPARISONS[operator](left_value, right_value)), "integer"
+    integer = left_kind == "integer" and right_kind == "integer"
+    if operator == "+":
+        result = left_value + right_value
+    elif operator == "-":
+        result = left_value - right_value
+    elif operator == "*":
+        result = left_value * right_value
+    elif operator == "/":
+        if right_value == 0:
+            return None
+        if integer:
+            # Go truncates toward zero
+            result = abs(left_value) // abs(right_value)
+            result = result if (left_value < 0) == (right_value < 0) else -result
+        else:
+            result = left_value / right_value
+    elif operator == "%":
+        if right_value == 0 or not integer:
+            return None
+        result = math.fmod(left_value, right_value)
+        result = int(result)
+    else:
+        return None
+    if integer:
+        return wrap32(result), "integer"
+    return float(result), "float"
+
+
+# evaluate an intrinsic function on (value, kind) constants
+def evaluate_intrinsic(function: str, arguments: list):
+    if any(kind not in ("integer", "float") for _, kind in arguments):
+        return None
+    values = [value for value, _ in arguments]
+    if function in ("sin", "cos", "tan"):
+        return INTRINSICS[function](values[0]), "float"
+    result = INTRINSICS[function](*values)
+    if all(kind == "integer" for _, kind in arguments):
+        return wrap32(result), "integer"
+    return float(result), "float"
+
+
+# turn a node into a number node in place; re-attaching a new node makes anytree walk up to the root to
+# check for loops, and the statement_list chain makes that path as long as the program
+def make_number(_node: ASTNODE, constant: tuple) -> None:
+    if _node.children:
+        _node.children = []
+    _node.name = "number"
+    _node.value = constant
+
+
+# put new_node where old_node is in the tree
+def replace_node(old_node: ASTNODE, new_node: ASTNODE) -> None:
+    parent = old_node.parent
+    if parent is None:
+        return
+    children = list(parent.children)
+    for index, child in enumerate(children):
+        if child is old_node:
+            children[index] = new_node
+            break
+    parent.children = children
+
+
+class ConstantFolder:
+    def __init__(self) -> None:
+        self.constants = {}      # variable name -> (value, kind) known at this point of the program
+        self.folded = 0          # expression nodes replaced by a number
+        self.propagated = 0      # variable references replaced by a number
+        self.branches = 0        # if statements and for loops removed because of a constant condition
+        self.pending = []        # the work stack of statement()
+        self.shadowed = []       # per open block: name -> the value it had outside when the block declared it
+
+    def fold(self, ast: ASTNODE) -> ASTNODE:
+        self.constants = {}
+        self.shadowed = []
+        self.statement(ast)
+        return ast
+
+    # the names assigned anywhere below a node
+    @staticmethod
+    def assigned_names(_node: ASTNODE) -> set:
+        names = set()
+        pending = [_node]
+        while pending:
+            _node = pending.pop()
+            if _node.name == "assign" and _node.value in ASSIGNMENT_OPERATORS:
+                names.add(_node.children[0].value)
+            pending.extend(_node.children)
+        return names
+
+    def forget(self, names: set) -> None:
+        for name in names:
+            self.constants.pop(name, None)
+
+    # fold an expression bottom up with an explicit stack; returns its (value, kind) when it is constant
+    def expression(self, _node: ASTNODE):
+        values = []               # the (value, kind) or None of each operand folded so far
+        pending = [(_node, False, True)]
+        while pending:
+            _node, folded_children, propagate = pending.pop()
+            if _node.name == "number":
+                values.append(_node.value)
+                continue
+            if _node.name == "name":
+                constant = self.constants.get(_node.value) if propagate else None
+                if constant is not None:
+                    make_number(_node, constant)
+                    self.propagated += 1
+                values.append(constant)
+                continue
+            children = _node.children
+            if _node.name == "expression" and _node.value is None and len(children) != 1:
+                values.append(None)  # a string
+                continue
+            if not folded_children:
+                pending.append((_node, True, propagate))
+                propagate = propagate and _node.value not in FLOAT_FUNCTIONS
+                pending.extend((child, False, propagate) for child in reversed(children))
+                continue
+            arguments = values[len(values) - len(children):]
+            del values[len(values) - len(children):]
+            if _node.name == "expression" and _node.value is None:
+                values.append(arguments[0])
+                continue
+            result = None
+            if all(argument is not None for argument in arguments):
+                if _node.value in INTRINSICS:
+                    result = evaluate_intrinsic(_node.value, arguments)
+                elif len(arguments) == 2:
+                    result = evaluate_binary(_node.value, arguments[0], arguments[1])
+            if result is not None:
+                make_number(_node, result)
+                self.folded += 1
+            values.append(result)
+        return values[0]
+
+    # walk the statements with an explicit stack; an entry is a node or a (method, arguments...) tuple to call
+    # once the nodes pushed above it are done
+    def statement(self, _node: ASTNODE) -> None:
+        self.pending = [_node]
+        while self.pending:
+            _node = self.pending.pop()
+            if type(_node) is tuple:
+                _node[0](*_node[1:])
+            elif _node.name in ["program", "block_statement", "statement_list"]:
+                if _node.name == "block_statement":
+                    self.open_block()
+                self.pending.extend(reversed(statements(_node)))
+            elif _node.name == "statement":
+                self.pending.extend(reversed(_node.children))
+            elif _node.name == "assign" and _node.value in ASSIGNMENT_OPERATORS:
+                constant = self.expression(_node.children[1])
+                if _node.value == ":=" and self.shadowed:
+                    self.shadowed[-1].setdefault(_node.children[0].value, self.constants.get(_node.children[0].value))
+                if constant is None:
+                    self.constants.pop(_node.children[0].value, None)
+                else:
+                    self.constants[_node.children[0].value] = constant
+            elif _node.name == "if_statement":
+                self.if_statement(_node)
+            elif _node.name == "for":
+                self.for_loop(_node)
+            elif _node.name == "print":
+                for child in list(_node.children):
+                    self.expression(child)
+            else:
+                self.expression(_node)
+
+    # a block or for statement starts; its declarations are forgotten when it ends
+    def open_block(self) -> None:
+        self.shadowed.append({})
+        self.pending.append((self.close_block,))
+
+    def close_block(self) -> None:
+        for name, constant in self.shadowed.pop().items():
+            if constant is None:
+                self.constants.pop(name, None)
+            else:
+                self.constants[name] = constant
+
+    def if_statement(self, _node: ASTNODE) -> None:
+        condition = self.expression(_node.children[0])
+        then_block = _node.children[1]
+        else_block = _node.children[2] if len(_node.children) == 3 else None
+        if condition is not None:
+            taken = then_block if condition[0] else else_block
+            replace_node(_node, taken if taken is not None else type(_node)("block_statement"))
+            self.branches += 1
+            if taken is not None:
+                self.pending.append(taken)
+            return
+        self.pending.append((self.after_then, else_block, dict(self.constants)))
+        self.pending.append(then_block)
+
+    # the then block is done, run the else block from the values known before the if statement
+    def after_then(self, else_block, before: dict) -> None:
+        self.pending.append((self.merge_branches, self.constants))
+        self.constants = before
+        if else_block is not None:
+            self.pending.append(else_block)
+
+    # keep the values both arms of an if statement agree on
+    def merge_branches(self, after_then: dict) -> None:
+        self.constants = {name: constant for name, constant in after_then.items()
+                          if self.constants.get(name) == constant}
+
+    def for_loop(self, _node: ASTNODE) -> None:
+        self.open_block()
+        if len(_node.children) == 4:
+            self.pending.append((self.loop, _node))
+            self.pending.append(_node.children[0])  # the init clause runs once, before the loop
+        else:
+            self.loop(_node)
+
+    def loop(self, _node: ASTNODE) -> None:
+        if len(_node.children) == 4:
+            init, condition, step, body = _node.children
+            assigned = self.assigned_names(condition) | self.assigned_names(step) | self.assigned_names(body)
+        else:
+            init, step = None, None
+            condition, body = _node.children
+            assigned = self.assigned_names(condition) | self.assigned_names(body)
+        # variables assigned in the loop change across the back edge
+        self.forget(assigned)
+        constant = self.expression(condition)
+        if constant is not None and not constant[0]:
+            if init is None or init.value == ":=":
+                init = type(_node)("block_statement")  # a variable declared by the init clause is not used
+            replace_node(_node, init)
+            self.branches += 1
+            return
+        self.pending.append((self.forget, assigned))
+        if step is not None:
+            self.pending.append(step)
+        self.pending.append(body)
+
+
+# emitted instructions and compile time with and without the pass
+if __name__ == "__main__":
+    import time
+    from CompileStats import instruction_count
+    from MIPS32_Emitter import MIPS32Emitter
+    from SamplePrograms import SAMPLE_PROGRAMS
+    import go_grammar
+
+    def compile_source(source: str, fold: bool) -> tuple:
+        start = time.perf_counter()
+        ast = go_grammar.parser.parse(source)
+        if fold:
+            ConstantFolder().fold(ast)
+        lines = list(MIPS32Emitter().iter_lines(ast))
+        return instruction_count(lines), time.perf_counter() - start
+
+    generated = "\n".join("var c{0} = {0} * 4 + max({0}, 7) - abs(3 - {0})\nvar d{0} = c{0} * 2 + c{0} % 5\n"
+                          "fmt.Println(d{0} + min(c{0}, 100))".format(i) for i in range(2000))
+    for sample_name, source in list(SAMPLE_PROGRAMS.items()) + [("generated", generated)]:
+        results = []
+        for fold in (False, True):
+            runs = [compile_source(source, fold) for _ in range(3)]
+            results.append((runs[0][0], min(seconds for _, seconds in runs)))
+        (before, before_time), (after, after_time) = results
+        print("{:>10}: {:6} -> {:6} instructions, compile time {:7.4f}s -> {:7.4f}s".format(
+            sample_name, before, after, before_time, after_time))
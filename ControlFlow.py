@@ -0,0 +1,139 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Control-flow graph of basic blocks for the MIPS32 emitter, and its layout as straight-line code with
+         the fewest jumps.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - A block holds straight-line MIPS32_IR instructions and ends in at most one conditional branch: when the
+    branch holds control goes to the taken block, otherwise to the next block. Without a branch control
+    always goes to the next block. The first block started is the entry, the last block started is the exit:
+    it has no next block, control leaves the graph at its end.
+  - Blocks are laid out in the order the emitter starts them, which is source order. Where the next block is
+    the one laid out right after, no jump is needed; where the taken block is, the branch is inverted. An
+    empty block without a branch is skipped over by the branches and jumps that reach it.
+  - The emitter lowers for loops rotated, with the test at the bottom: a guard branching around the loop,
+    then the body and step, then the test branching back to the top of the body. Each iteration runs one
+    branch instead of a branch at the top and a jump at the bottom.
+
+"""
+from MIPS32_IR import *
+
+# a branch and the branch taken when it doesn't hold
+INVERTED_BRANCHES = {
+    BEQ: BNE, BNE: BEQ, BLT: BGE, BGE: BLT, BLE: BGT, BGT: BLE,
+    BEQZ: BNEZ, BNEZ: BEQZ, BLTZ: BGEZ, BGEZ: BLTZ, BLEZ: BGTZ, BGTZ: BLEZ,
+    BC1T: BC1F, BC1F: BC1T,
+}
+
+# comparison operator -> the branch taken when it holds, comparing two operands or one operand and zero
+BRANCH_OPCODES = {"<": BLT, "<=": BLE, ">": BGT, ">=": BGE, "==": BEQ, "!=": BNE}
+ZERO_BRANCH_OPCODES = {"<": BLTZ, "<=": BLEZ, ">": BGTZ, ">=": BGEZ, "==": BEQZ, "!=": BNEZ}
+
+
+class BasicBlock:
+    __slots__ = ("label", "code", "branch", "taken", "next")
+
+    def __init__(self, label: str) -> None:
+        self.label = label
+        self.code = InstructionList()
+        self.branch = None  # (opcode, operands before the label), or None
+        self.taken = None   # the block the branch goes to
+        self.next = None    # the block control goes to otherwise, None to leave the graph
+
+    def __repr__(self) -> str:
+        return "BasicBlock({}, {} instructions)".format(self.label, len(self.code))
+
+    def is_empty(self) -> bool:
+        return not len(self.code) and self.branch is None
+
+
+class ControlFlowGraph:
+    def __init__(self, new_label) -> None:
+        self.new_label = new_label  # called with a prefix, returns a label of its own
+        self.blocks = []            # in layout order, the first one is the entry
+
+    # a block that is not laid out until it is started
+    def new_block(self) -> BasicBlock:
+        return BasicBlock(self.new_label("block"))
+
+    # lay a block out after the ones started so far
+    def start(self, block: BasicBlock) -> None:
+        self.blocks.append(block)
+
+    # the block control really reaches through a block, skipping empty blocks that only go on to another one
+    @staticmethod
+    def destination(block: BasicBlock) -> BasicBlock:
+        seen = set()
+        while block is not None and block.is_empty() and block.next is not None and block not in seen:
+            seen.add(block)
+            block = block.next
+        return block
+
+    # append the blocks to code as straight-line instructions, with a label on every block that is branched or
+    # jumped to and only the jumps the layout doesn't make unnecessary
+    def linearize(self, code: InstructionList) -> None:
+        destination = self.destination
+        blocks = [block for index, block in enumerate(self.blocks)
+                  if index == 0 or not block.is_empty() or block.next is None]  # control enters at the first
+        endings = []
+        targets = set()
+        for index, block in enumerate(blocks):
+            following = blocks[index + 1] if index + 1 < len(blocks) else None
+            taken = destination(block.taken)
+            next_block = destination(block.next)
+            ending = []
+            if block.branch is not None and taken is not next_block:
+                opcode, operands = block.branch
+                if taken is following:
+                    opcode, taken, next_block = INVERTED_BRANCHES[opcode], next_block, taken
+                ending.append((opcode, operands, taken))
+                targets.add(taken)
+            if next_block is not following:
+                ending.append((J, (), next_block))
+                targets.add(next_block)
+            endings.append(ending)
+        for block, ending in zip(blocks, endings):
+            if block in targets:
+                code.append(LABEL, block.label)
+            code.extend(block.code)
+            for opcode, operands, target in ending:
+                code.append(opcode, *operands, target.label)
+
+
+# dynamic branch counts of the sample programs and of the hand-written programs in "Assembly code/"
+if __name__ == "__main__":
+    import os
+    import go_grammar
+    from MIPS32_Emitter import MIPS32Emitter
+    from MIPS32_Simulator import MIPS32Simulator
+    from SamplePrograms import SAMPLE_PROGRAMS
+
+    loops = """var total = 0
+for var i = 0; i < 1000; i = i + 1 {
+    if i > 500 {
+        total = total + i
+    } else {
+        total = total - 1
+    }
+}
+fmt.Println(total)
+"""
+    print("{:>12} {:>9} {:>13} {:>9} {:>7}  {}".format("program", "mode", "instructions", "branches", "taken",
+                                                       "output"))
+    for sample_name, source in list(SAMPLE_PROGRAMS.items()) + [("loops", loops)]:
+        for mode in MIPS32Emitter.modes:
+            go_grammar.lexer.lineno = 1
+            result = MIPS32Simulator().run(list(MIPS32Emitter(mode=mode).iter_lines(go_grammar.parser.parse(source))))
+            print("{:>12} {:>9} {:>13} {:>9} {:>7}  {}".format(sample_name, mode, result.instructions,
+                                                               result.branches, result.taken,
+                                                               result.output.split()))
+    folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Assembly code")
+    for file_name in ("factorialimplementation.asm", "fibonacci.asm"):
+        with open(os.path.join(folder, file_name)) as file:
+            result = MIPS32Simulator().run(file.read())
+        print("{:>12} {:>9} {:>13} {:>9} {:>7}  {}".format(file_name.split(".")[0][:12], "by hand",
+                                                           result.instructions, result.branches, result.taken,
+                                                           result.output.split()))
@@ -0,0 +1,220 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Static data segment layout: the AST is walked with a SymbolTable and every declared variable gets a
+         word of its own in the .data section, or a double word for a float64 variable.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - A VAR declaration (an assign node with the value ":=") declares a variable in the innermost block, and a
+    for statement is a block of its own around the variable its init clause declares, as in Go. Every name
+    node is resolved to the symbol visible where it appears, so a variable shadowed in an inner block keeps
+    its own word.
+  - A name that is used without being declared gets a word in the outermost scope, as it did before.
+  - Declaring a name again in the same block reuses its word. A block that is left gives its words back to
+    later declarations of the same names, so a program with many for loops over i doesn't get a word per loop.
+  - Labels are the variable name and the number of the word among the words of that name: x_00000, x_00001.
+  - Words are laid out by spill weight (references weighted by 10 ** loop depth, as in RegisterAllocator), and
+    the first gp_window bytes are addressed relative to $gp, which the emitter points at the first word:
+    "lw $t0, 8($gp)" is one machine instruction where "lw $t0, x_00000" assembles to lui and lw. Words past
+    the window are addressed by their label.
+  - There are no functions in the language yet, so every variable is static and nothing lives in a frame.
+  - Given the TypeChecker's types, float64 variables get a .double each. They are laid out before the words,
+    so every double is 8 byte aligned relative to $gp, which points at the start of the data segment.
+
+"""
+from ASTNODE import ASTNODE
+from SymbolTable import SymbolTable
+from TypeChecker import FLOAT
+
+WORD_SIZE = 4
+DOUBLE_SIZE = 8
+# bytes above $gp that lw/sw reach with their 16 bit signed offset
+GP_WINDOW = 32768
+DATA_POINTER = "$gp"
+
+
+# one word of the data segment
+class Slot:
+    __slots__ = ("name", "label", "offset", "weight", "size")
+
+    def __init__(self, name: str, label: str) -> None:
+        self.name = name
+        self.label = label
+        self.offset = None  # bytes from $gp, None when the word is addressed by its label
+        self.weight = 0
+        self.size = WORD_SIZE
+
+    def __repr__(self) -> str:
+        return "Slot({}, offset={}, weight={}, size={})".format(self.label, self.offset, self.weight, self.size)
+
+
+class DataLayout:
+    def __init__(self, ast: ASTNODE = None, gp_window: int = GP_WINDOW, types: dict = None) -> None:
+        self.gp_window = gp_window
+        self.types = types if types is not None else {}  # name node -> TypeChecker tag
+        self.slots = []            # in address order once the program is laid out
+        self.slot_of = {}          # name node -> its slot
+        self.symbol_table = SymbolTable()
+        self.declared = [[]]       # the slots declared in each open scope
+        self.free = {}             # (name, size) -> slots of that name given back by the blocks left
+        self.undeclared = {}       # name -> slot of a name used without a declaration
+        self.label_counts = {}     # name -> slots of that name so far
+        self.loop_weight = 1
+        if ast is not None:
+            self.layout(ast)
+
+    # walk the program with an explicit stack; an entry is a node or a (method, arguments...) tuple to call once
+    # the nodes pushed above it are done
+    def layout(self, ast: ASTNODE) -> "DataLayout":
+        pending = [ast]
+        while pending:
+            _node = pending.pop()
+            if type(_node) is tuple:
+                _node[0](*_node[1:])
+            elif _node.name == "name":
+                self.use(_node)
+            elif _node.name == "assign" and _node.value == ":=":
+                # the initial value is evaluated before the declared variable is visible
+                pending.append((self.declare, _node.children[0]))
+                pending.append(_node.children[1])
+            elif _node.name == "block_statement":
+                self.enter_scope()
+                pending.append((self.exit_scope,))
+                pending.extend(reversed(_node.children))
+            elif _node.name == "for":
+                self.enter_scope()
+                pending.append((self.exit_scope,))
+                pending.append((self.close_loop,))
+                if len(_node.children) == 4:
+                    init, condition, step, body = _node.children
+                    pending.extend([body, step, condition, (self.open_loop,), init])
+                else:
+                    pending.extend(reversed(_node.children))
+                    pending.append((self.open_loop,))
+            else:
+                pending.extend(reversed(_node.children))
+        self.assign_addresses()
+        return self
+
+    def enter_scope(self) -> None:
+        self.symbol_table.enter_scope()
+        self.declared.append([])
+
+    def exit_scope(self) -> None:
+        self.symbol_table.exit_scope()
+        for slot in self.declared.pop():
+            self.free.setdefault((slot.name, slot.size), []).append(slot)
+
+    def open_loop(self) -> None:
+        self.loop_weight *= 10
+
+    def close_loop(self) -> None:
+        self.loop_weight //= 10
+
+    def new_slot(self, name: str) -> Slot:
+        count = self.label_counts.get(name, 0)
+        self.label_counts[name] = count + 1
+        slot = Slot(name, "{}_{:05d}".format(name, count))
+        self.slots.append(slot)
+        return slot
+
+    def declare(self, _node: ASTNODE) -> None:
+        symbol = self.symbol_table.lookup_current(_node.value)
+        if symbol is None:
+            free = self.free.get((_node.value, self.size(_node)))
+            slot = free.pop() if free else self.new_slot(_node.value)
+            symbol = self.symbol_table.add(_node.value, None, {"slot": slot})
+            self.declared[-1].append(slot)
+        self.reference(_node, symbol.attributes["slot"])
+
+    def use(self, _node: ASTNODE) -> None:
+        symbol = self.symbol_table.lookup(_node.value)
+        if symbol is not None:
+            slot = symbol.attributes["slot"]
+        else:
+            slot = self.undeclared.get(_node.value)
+            if slot is None:
+                slot = self.undeclared[_node.value] = self.new_slot(_node.value)
+        self.reference(_node, slot)
+
+    def reference(self, _node: ASTNODE, slot: Slot) -> None:
+        self.slot_of[_node] = slot
+        slot.weight += self.loop_weight
+        slot.size = self.size(_node)
+
+    # the bytes a variable takes, from the type of its name node
+    def size(self, _node: ASTNODE) -> int:
+        return DOUBLE_SIZE if self.types.get(_node) == FLOAT else WORD_SIZE
+
+    # the doubles first to keep them aligned, then the heaviest first, so they are the ones within reach of $gp
+    def assign_addresses(self) -> None:
+        self.slots.sort(key=lambda slot: (slot.size != DOUBLE_SIZE, -slot.weight))
+        offset = 0
+        for slot in self.slots:
+            slot.offset = offset if offset + slot.size <= self.gp_window else None
+            offset += slot.size
+
+    # the slot a name node refers to
+    def slot(self, _node: ASTNODE) -> Slot:
+        return self.slot_of[_node]
+
+    # the (offset, base) memory operand of a name node
+    def address(self, _node: ASTNODE) -> tuple:
+        slot = self.slot_of[_node]
+        if slot.offset is None:
+            return 0, slot.label
+        return slot.offset, DATA_POINTER
+
+    # the label $gp is pointed at
+    def base_label(self) -> str:
+        return self.slots[0].label
+
+    def data_lines(self) -> list:
+        return [f"{slot.label}:    .double 0.0" if slot.size == DOUBLE_SIZE else f"{slot.label}:    .word 0"
+                for slot in self.slots]
+
+
+# instruction counts of the sample programs with every variable addressed by label and with the layout
+if __name__ == "__main__":
+    import time
+    import go_grammar
+    from CompileStats import instruction_count
+    from ConstantFolder import ConstantFolder
+    from MIPS32_Emitter import MIPS32Emitter
+    from SamplePrograms import SAMPLE_PROGRAMS
+    from StressTest import generate
+
+    # instructions as listed, and machine instructions: lw/sw of a label and la assemble to two (lui first);
+    # the other pseudo-instructions expand the same way whatever the layout, they are counted as one
+    def instruction_counts(lines) -> tuple:
+        lines = list(lines)
+        listed = instruction_count(lines)
+        machine = listed
+        for line in lines:
+            mnemonic, _, operands = line.strip().partition(" ")
+            if mnemonic == "la" or (mnemonic in ("lw", "sw") and "(" not in operands):
+                machine += 1
+        return listed, machine
+
+    programs = list(SAMPLE_PROGRAMS.items()) + [("generated", generate(2000, nested=False))]
+    print("{:>10} {:>9} {:>21} {:>21} {:>6}".format("program", "mode", "by label", "layout", "words"))
+    for sample_name, source in programs:
+        for mode in MIPS32Emitter.modes:
+            counts = []
+            for gp_window in (0, GP_WINDOW):
+                ast = go_grammar.parser.parse(source)
+                ConstantFolder().fold(ast)
+                emitter = MIPS32Emitter(mode=mode)
+                emitter.gp_window = gp_window
+                counts.append(instruction_counts(emitter.iter_lines(ast)))
+            words = len(DataLayout(go_grammar.parser.parse(source)).slots)
+            print("{:>10} {:>9} {:>9} ({:>4} machine) {:>9} ({:>4} machine) {:>6}".format(
+                sample_name, mode, counts[0][0], counts[0][1], counts[1][0], counts[1][1], words))
+
+    ast = go_grammar.parser.parse(generate(100000, nested=False))
+    start = time.perf_counter()
+    layout = DataLayout(ast)
+    print("laid out {} name references in {} words in {:.3f}s".format(
+        len(layout.slot_of), len(layout.slots), time.perf_counter() - start))
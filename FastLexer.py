@@ -0,0 +1,361 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: A single pass lexer for the go_grammar tokens, a faster drop-in for the PLY lexer.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - PLY joins the t_ rules into one master regex, tries the alternatives in order at every token and calls
+    the rule's Python function for each match. FastLexer picks the only rule that can match from the first
+    character instead: identifiers are scanned with one regex and checked for keywords with one dict probe
+    on their first two characters, operators and literals come from tables, and no function is called per
+    token.
+  - The tokens are the same as PLY's, types, values, lineno and lexpos included, and so are its first match
+    (not longest match) results: t_FOR comes before t_NAME, so "format" is FOR followed by NAME "mat" with
+    either lexer.
+  - The tables are built from the t_ rules of go_grammar. Rules matching one fixed text become keyword or
+    operator entries; the string, number, name, comment and newline rules are compiled from their
+    docstrings. Any other rule raises ValueError, so a new lexer rule can't be skipped silently.
+  - It has the parts of the PLY lexer interface the parser and CompilerSession use: input(), token(),
+    clone(), skip(), lineno, lexpos, lexdata and lexerrorf, and it can be iterated.
+  - input() also takes UTF-8 bytes or an mmap (ReadFile(mapped=True).buffer) and scans it in place; only
+    the text of each token is decoded, and lexpos counts bytes.
+  - NAME values are interned, so the dicts keyed by variable names mostly compare them by identity.
+  - line_index holds the offsets of the newlines scanned so far, see LineIndex.
+  - LEXER_BACKENDS maps "ply" and "fast" to a lexer to clone, see CompilerSession and BatchCompiler --lexer.
+  - python FastLexer.py runs the differential test against the PLY lexer, then the tokens/sec benchmark.
+
+"""
+import re
+import string
+from array import array
+from sys import intern
+from ply.lex import LexError
+import go_grammar
+from GrammarCache import rules
+from LineIndex import LineIndex
+
+# the rules scanned by their own code, by token type; every other rule has to match a fixed text
+SCANNED_RULES = {
+    "SQ_STRING": "'",
+    "DQ_STRING": '"',
+    "NUMBER": string.digits + ".",
+    "NAME": string.ascii_letters + "_",
+    "COMMENT": "#",
+    "newline": "\n",
+}
+
+REGEX_SPECIAL = set(".^$*+?{}[]|()\\")
+
+
+class Token:
+    __slots__ = ("type", "value", "lineno", "lexpos", "lexer")
+
+    def __init__(self, type_: str, value, lineno: int, lexpos: int, lexer=None) -> None:
+        self.type = type_
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+        self.lexer = lexer          # only set on the tokens handed to lexerrorf
+
+    def __str__(self) -> str:
+        return "LexToken(%s,%r,%d,%d)" % (self.type, self.value, self.lineno, self.lexpos)
+
+    __repr__ = __str__
+
+
+# the text a rule's regex matches when it only matches one text, otherwise None
+def fixed_text(pattern: str):
+    text = re.sub(r"\\(.)", r"\1", pattern)
+    if pattern == re.escape(text) or (pattern == text and not REGEX_SPECIAL & set(text)):
+        return text
+    return None
+
+
+# the tables scan() works from, for str input or for bytes-like input (bytes, mmap); the values of the tokens
+# are str either way
+class ScanTables:
+    def __init__(self, first: dict, keywords: dict, symbols: dict, literals: dict, patterns: dict) -> None:
+        self.first = first          # character -> kind of token starting with it, see FastLexer
+        self.keywords = keywords    # first two characters -> [(text, type, value), ...] in rule order
+        self.symbols = symbols      # first character -> [(text, type, value), ...] in rule order
+        self.literals = literals    # character -> value
+        self.patterns = patterns    # scanned rule type -> compiled regex
+
+    # the same tables for bytes-like input: characters are byte values, texts are bytes
+    def encoded(self):
+        return ScanTables({ord(character): kind for character, kind in self.first.items()},
+                          {key.encode(): [(text.encode(), token_type, value) for text, token_type, value in entries]
+                           for key, entries in self.keywords.items()},
+                          {ord(key): [(text.encode(), token_type, value) for text, token_type, value in entries]
+                           for key, entries in self.symbols.items()},
+                          {ord(character): value for character, value in self.literals.items()},
+                          {token_type: re.compile(pattern.pattern.encode(), re.VERBOSE)
+                           for token_type, pattern in self.patterns.items()})
+
+
+class FastLexer:
+    def __init__(self, module_dict: dict = None) -> None:
+        module_dict = vars(go_grammar) if module_dict is None else module_dict
+        self.reserved = module_dict["reserved"]
+        self.to_number = module_dict["string_to_number"]
+        self.lexerrorf = module_dict.get("t_error")
+        ignore = ""
+        keywords = {}
+        symbols = {}
+        patterns = {}
+        for name, rule in rules(module_dict, "t_"):
+            token_type = name[2:]
+            if name == "t_ignore":
+                ignore = rule
+            elif callable(module_dict[name]) and token_type in SCANNED_RULES:
+                patterns[token_type] = re.compile(rule, re.VERBOSE)
+            elif callable(module_dict[name]) and fixed_text(rule):
+                text = fixed_text(rule)
+                if text[0] in SCANNED_RULES["NAME"]:
+                    if len(text) < 2:
+                        raise ValueError("FastLexer can't scan the one letter keyword {}".format(name))
+                    keywords.setdefault(text[:2], []).append((text, token_type, text))
+                else:
+                    symbols.setdefault(text[0], []).append((text, token_type, text))
+            else:
+                raise ValueError("FastLexer can't scan the rule {}".format(name))
+        if set(patterns) != set(SCANNED_RULES):
+            raise ValueError("FastLexer needs the rules t_{}".format(", t_".join(SCANNED_RULES)))
+        literals = {character: character for character in module_dict.get("literals", ())}
+        # the kind of token starting with each character: a scanned rule type, "symbol", "ignore" or
+        # "literal"; characters that aren't in the table are errors
+        first = {}
+        for character in literals:
+            first[character] = "literal"
+        for character in symbols:
+            first[character] = "symbol"
+        for token_type, characters in SCANNED_RULES.items():
+            for character in characters:
+                first[character] = token_type
+        for character in ignore:
+            first[character] = "ignore"
+        self.text_tables = ScanTables(first, keywords, symbols, literals, patterns)
+        self.byte_tables = self.text_tables.encoded()
+        self.lineno = 1
+        self.lexpos = 0
+        self.lexdata = ""
+        self.line_index = LineIndex()   # the newlines scanned so far
+        self.scanner = iter(())
+
+    # the source to scan: a str, or a bytes-like object holding UTF-8 (bytes, an mmap from
+    # ReadFile(mapped=True)), which is scanned where it is; lexpos is then a byte offset
+    def input(self, data) -> None:
+        if not isinstance(data, str):
+            memoryview(data)  # raises TypeError if it isn't bytes-like
+        self.lexdata = data
+        self.lexpos = 0
+        self.line_index = LineIndex()
+        self.scanner = self.scan()
+
+    def token(self):
+        return next(self.scanner, None)
+
+    def skip(self, n: int) -> None:
+        self.lexpos += n
+
+    def clone(self):
+        lexer = FastLexer.__new__(FastLexer)
+        lexer.__dict__.update(self.__dict__)  # the tables are shared
+        lexer.line_index = LineIndex(array("q", self.line_index.newlines))
+        lexer.scanner = lexer.scan() if lexer.lexdata else iter(())
+        return lexer
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        token = self.token()
+        if token is None:
+            raise StopIteration
+        return token
+
+    # the tokens of lexdata from lexpos on
+    def scan(self):
+        text = self.lexdata
+        binary = not isinstance(text, str)
+        tables = self.byte_tables if binary else self.text_tables
+        if binary:
+            def starts_with(prefix, start):  # an mmap has no startswith()
+                return text[start:start + len(prefix)] == prefix
+        else:
+            starts_with = text.startswith
+        end = len(text)
+        pos = self.lexpos
+        lineno = self.lineno
+        first = tables.first
+        keywords = tables.keywords
+        symbols = tables.symbols
+        literals = tables.literals
+        reserved = self.reserved
+        to_number = self.to_number
+        name_match = tables.patterns["NAME"].match
+        number_match = tables.patterns["NUMBER"].match
+        newline_match = tables.patterns["newline"].match
+        comment_match = tables.patterns["COMMENT"].match
+        newlines = self.line_index.newlines
+        while pos < end:
+            character = text[pos]
+            kind = first.get(character)
+            token = None
+            if kind == "ignore":
+                pos += 1
+                continue
+            if kind == "NAME":
+                for keyword, token_type, value in keywords.get(text[pos:pos + 2], ()):
+                    if starts_with(keyword, pos):
+                        token = Token(token_type, value, lineno, pos)
+                        pos += len(keyword)
+                        break
+                else:
+                    match = name_match(text, pos)
+                    value = intern(match.group().decode() if binary else match.group())
+                    token = Token(reserved.get(value, "NAME"), value, lineno, pos)
+                    pos = match.end()
+            elif kind == "newline":
+                match = newline_match(text, pos)
+                lineno += match.end() - pos
+                self.lineno = lineno
+                newlines.extend(range(pos, match.end()))
+                pos = match.end()
+                continue
+            elif kind == "symbol":
+                for symbol, token_type, value in symbols[character]:
+                    if starts_with(symbol, pos):
+                        token = Token(token_type, value, lineno, pos)
+                        pos += len(symbol)
+                        break
+            elif kind == "NUMBER":
+                match = number_match(text, pos)
+                if match is not None:
+                    value = to_number(match.group())
+                    if value is None:
+                        # a malformed literal: lexerrorf gets its text, the token goes on with the value 0
+                        literal = match.group().decode() if binary else match.group()
+                        if self.lexerrorf is None:
+                            raise LexError("Illegal number literal '%s' at index %d" % (literal, pos), literal)
+                        self.lexerrorf(Token("NUMBER", literal, lineno, pos, self))
+                        value = (0, "integer")
+                    token = Token("NUMBER", value, lineno, pos)
+                    pos = match.end()
+            elif kind == "COMMENT":
+                pos = comment_match(text, pos).end()
+                continue
+            elif kind == "SQ_STRING" or kind == "DQ_STRING":
+                match = tables.patterns[kind].match(text, pos)
+                if match is not None:
+                    token = Token(kind, match.group().decode() if binary else match.group(), lineno, pos)
+                    pos = match.end()
+            if token is None:
+                if character in literals:
+                    token = Token(literals[character], literals[character], lineno, pos)
+                    pos += 1
+                else:
+                    # the same error handling as PLY: lexerrorf has to skip() past the character; from a
+                    # buffer the error token holds the rest of the line rather than the rest of the input
+                    self.lexpos = pos
+                    self.lineno = lineno
+                    if binary:
+                        line_end = text.find(b"\n", pos)
+                        rest = text[pos:line_end if line_end >= 0 else end].decode(errors="replace")
+                    else:
+                        rest = text[pos:]
+                    if self.lexerrorf is None:
+                        raise LexError("Illegal character '%s' at index %d" % (rest[0], pos), rest)
+                    token = self.lexerrorf(Token("error", rest, lineno, pos, self))
+                    if self.lexpos == pos:
+                        raise LexError("Scanning error. Illegal character '%s'" % rest[0], rest)
+                    pos = self.lexpos
+                    lineno = self.lineno
+                    if not token:
+                        continue
+            self.lexpos = pos
+            yield token
+            pos = self.lexpos  # in case skip() was called
+        self.lexpos = pos
+
+
+lexer = FastLexer()
+
+# lexers to clone, by name
+LEXER_BACKENDS = {
+    "ply": go_grammar.lexer,
+    "fast": lexer,
+}
+
+
+# differential test against the PLY lexer, then tokens/sec of both on a few megabytes of source
+if __name__ == "__main__":
+    import random
+    import time
+    from SamplePrograms import SAMPLE_PROGRAMS
+    from StressTest import generate
+
+    # the tokens of a source as (type, value, lineno, lexpos), and the (lexpos, lineno) of the errors
+    def tokenize(prototype, source: str) -> tuple:
+        errors = []
+
+        def record_error(token) -> None:
+            errors.append((token.lexpos, token.lineno))
+            if token.type != "NUMBER":  # a malformed number literal has been scanned past already
+                token.lexer.skip(1)
+
+        lexer_copy = prototype.clone()
+        lexer_copy.lexerrorf = record_error
+        lexer_copy.lineno = 1
+        lexer_copy.input(source)
+        tokens = [(token.type, token.value, token.lineno, token.lexpos) for token in iter(lexer_copy.token, None)]
+        return tokens, errors, lexer_copy.lineno
+
+    edge_cases = [
+        "format iffy elsewhere variable maximum minimal absent sinus costly tangent truest falsehood",
+        "fmt.Println fmt.Printf fmt.Print fmt.Printx fmt.Prin fmt Println Printf Print Printlnx Prin _x x_1 X9",
+        "1 007 1.5 .5 5. 1.2.3 1e5 1E+5 1e-5 1e 1e+ 12abc 0.0e0 99999999999999999999",
+        "'a' 'a\\'b' \"q\" \"a\\\"b\" \"unterminated 'unterminated \"a\\\nb\" '' \"\"",
+        "a<=b>=c==d!=e!f=g<h>i+j-k*l/m%n(o)p{q}r;s,t",
+        "# comment\nx # trailing\n\n\n#\n y",
+        "$ @ ? \r\n ` ~ ^ & | [ ] : . \\ é",
+        " \t\v\f x \t",
+        "",
+    ]
+    fragments = ["x", "if", "for", "var", "fmt.Println", "Print", "min", "max(", "1", "2.5", ".", "e", "3e", "+",
+                 "-", "*", "/", "%", "<", "<=", ">", ">=", "=", "==", "!", "!=", "(", ")", "{", "}", ";", ",",
+                 " ", "\t", "\n", "# c", "'s'", "\"s\"", "\\", "'", "\"", "$", "_", "abc", "if1", "ff"]
+    random.seed(11)
+    fuzz = ["".join(random.choice(fragments) for _ in range(random.randint(1, 60))) for _ in range(5000)]
+    cases = list(SAMPLE_PROGRAMS.values()) + [generate(1000)] + edge_cases + fuzz
+
+    failures = 0
+    for source in cases:
+        expected = tokenize(go_grammar.lexer, source)
+        actual = tokenize(lexer, source)
+        # ASCII sources have the same offsets as str and as bytes
+        from_bytes = tokenize(lexer, source.encode()) if source.isascii() else expected
+        if expected != actual or expected != from_bytes:
+            failures += 1
+            if failures <= 5:
+                print("DIFFERENT for {!r}:\n  ply:   {}\n  fast:  {}\n  bytes: {}".format(
+                    source[:80], expected, actual, from_bytes))
+    print("differential test: {} sources, {} differ from the PLY lexer".format(len(cases), failures))
+
+    source = generate(100000, nested=False)
+    print("benchmark: {:.1f} MB of source".format(len(source) / 1e6))
+    for backend_name, prototype, data in [("ply", go_grammar.lexer, source), ("fast", lexer, source),
+                                          ("fast, bytes", lexer, source.encode())]:
+        lexer_copy = prototype.clone()
+        best = None
+        token_count = 0
+        for _ in range(3):
+            lexer_copy.input(data)
+            start = time.perf_counter()
+            token_count = sum(1 for _ in iter(lexer_copy.token, None))
+            seconds = time.perf_counter() - start
+            best = seconds if best is None else min(best, seconds)
+        print("{:>11}: {} tokens in {:.3f}s, {:,.0f} tokens/sec".format(backend_name, token_count, best,
+                                                                       token_count / best))
@@ -0,0 +1,138 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Versioned cache of the PLY lexer and parser tables used by go_grammar.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - PLY tables: https://www.dabeaz.com/ply/ply.html#ply_nn36 (section 6.9, "Caching of the parsing tables")
+  - The tables are modules in the parse_tables package, named after a hash of what they are built from:
+      lextab_<hash>:   the PLY version, tokens, literals and the t_ rules in the order lex.lex() uses them
+      parsetab_<hash>: the PLY version, tokens, precedence, start symbol and the docstrings of the p_ rules
+    A table with the right name is always current, so lex.lex()/yacc.yacc() run with optimize=1 and load it
+    without validating the grammar or comparing signatures. The .pyc is written as soon as a table is
+    generated, so the next import only unmarshals it.
+  - Production mode (the default) never writes parser.out. Set GO_GRAMMAR_DEBUG=1 to validate the lexer
+    rules, regenerate the tables and write parser.out next to go_grammar.py.
+
+"""
+import hashlib
+import os
+import py_compile
+import ply
+
+TABLE_PACKAGE = "parse_tables"
+TABLE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), TABLE_PACKAGE)
+DEBUG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "parser.out")
+
+DEBUG = os.environ.get("GO_GRAMMAR_DEBUG", "0") not in ("", "0")
+
+
+# the rules with a given prefix in the order PLY reads them: functions by line number, then strings by name
+def rules(module_dict: dict, prefix: str) -> list:
+    functions = []
+    strings = []
+    for name, value in module_dict.items():
+        if not name.startswith(prefix) or name == prefix + "error":
+            continue
+        if callable(value):
+            functions.append((value.__code__.co_firstlineno, name, value.__doc__))
+        elif isinstance(value, str):
+            strings.append((name, value))
+    functions.sort()
+    return [(name, doc) for _, name, doc in functions] + sorted(strings)
+
+
+# a short hash of anything that repr() describes exactly
+def digest(*parts) -> str:
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:16]
+
+
+class GrammarCache:
+    def __init__(self, module_dict: dict, debug: bool = DEBUG) -> None:
+        self.module_dict = module_dict  # the grammar module's globals(), the p_ rules are added after the lexer
+        self.debug = debug
+        self.written = []               # tables generated by this process
+
+    def lexer_signature(self) -> str:
+        return digest(ply.__version__, self.module_dict["tokens"], self.module_dict.get("literals"),
+                      rules(self.module_dict, "t_"))
+
+    def parser_signature(self) -> str:
+        return digest(ply.__version__, self.module_dict["tokens"], self.module_dict.get("precedence"),
+                      self.module_dict.get("start"), rules(self.module_dict, "p_"))
+
+    # identifies the lexer and parser the tables were built from
+    def version(self) -> str:
+        return "{}-{}".format(self.lexer_signature(), self.parser_signature())
+
+    # the file of a table module, and whether it has to be generated
+    def table(self, prefix: str, signature: str) -> str:
+        module_name = "{}_{}".format(prefix, signature)
+        path = os.path.join(TABLE_DIRECTORY, module_name + ".py")
+        if self.debug and os.path.exists(path):
+            os.remove(path)
+        if not os.path.exists(path):
+            self.remove_stale(prefix)
+            self.written.append(path)
+        return "{}.{}".format(TABLE_PACKAGE, module_name)
+
+    # remove the tables of older versions of the grammar
+    @staticmethod
+    def remove_stale(prefix: str) -> None:
+        for file_name in os.listdir(TABLE_DIRECTORY):
+            if file_name.startswith(prefix + "_") and file_name.endswith(".py"):
+                os.remove(os.path.join(TABLE_DIRECTORY, file_name))
+
+    # keyword arguments for lex.lex()
+    def lex_options(self) -> dict:
+        lextab = self.table("lextab", self.lexer_signature())
+        if self.debug:
+            return {"optimize": 0}
+        return {"optimize": 1, "lextab": lextab}
+
+    # keyword arguments for yacc.yacc()
+    def yacc_options(self) -> dict:
+        return {"optimize": 0 if self.debug else 1, "debug": self.debug, "debugfile": DEBUG_FILE,
+                "tabmodule": self.table("parsetab", self.parser_signature()), "write_tables": True}
+
+    # compile the tables written by this process, so later imports skip compiling them
+    def compile_tables(self) -> None:
+        for path in self.written:
+            if os.path.exists(path):
+                py_compile.compile(path, doraise=False)
+        self.written = []
+
+
+# cold start (no tables) against warm start (tables and .pyc present) import time of go_grammar
+if __name__ == "__main__":
+    import shutil
+    import subprocess
+    import sys
+    import time
+
+    def import_time(statement: str = "import go_grammar") -> float:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+        return time.perf_counter() - start
+
+    def clear_tables() -> None:
+        for file_name in os.listdir(TABLE_DIRECTORY):
+            if file_name.startswith(("lextab_", "parsetab_")):
+                os.remove(os.path.join(TABLE_DIRECTORY, file_name))
+        shutil.rmtree(os.path.join(TABLE_DIRECTORY, "__pycache__"), ignore_errors=True)
+
+    interpreter = min(import_time("pass") for _ in range(5))
+    cold = []
+    for _ in range(3):
+        clear_tables()
+        cold.append(import_time())
+    warm = sorted(import_time() for _ in range(10))
+    print("interpreter start-up: {:7.1f} ms".format(interpreter * 1000))
+    print("cold import:          {:7.1f} ms (best of {})".format(min(cold) * 1000, len(cold)))
+    print("warm import:          {:7.1f} ms (best of {}, median {:.1f} ms)".format(
+        warm[0] * 1000, len(warm), warm[len(warm) // 2] * 1000))
+    print("warm start-up is {:.1f}x faster, not counting the interpreter".format(
+        (min(cold) - interpreter) / (warm[0] - interpreter)))
@@ -0,0 +1,126 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Line and column of a source offset (a token's lexpos) by binary search over the offsets of the
+         source's newlines.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - find_column() used to rfind() back to the previous newline for every token it was asked about, which
+    costs the length of the line each time, the whole input for a program written on one line. The
+    newlines are found once per input instead, and every lookup is O(log n).
+  - On ordinary sources, with short lines, rfind() is still the faster one: a lookup here measured about
+    1.4x the time of an rfind(), plus building the index. source_column() rfinds at most LONG_LINE
+    characters back and only builds the LineIndex of a source when it finds a longer line.
+  - FastLexer adds the newlines to its line_index as it scans them. For the PLY lexer LineIndex.of() finds
+    them in one pass over the source (numpy for buffers, see ReadFile.newline_offsets).
+  - Lines and columns are 1 based; columns count characters in a str and bytes in a buffer.
+
+"""
+import bisect
+import re
+from array import array
+from ReadFile import newline_offsets
+
+
+# characters rfind() searches back for the start of a line before a LineIndex is built instead
+LONG_LINE = 1024
+
+
+class LineIndex:
+    def __init__(self, newlines=None) -> None:
+        self.newlines = array("q") if newlines is None else newlines  # offsets of the "\n"s, in order
+        # the line found by the last lookup, most lookups are for the tokens of one line in a row
+        self.line_number = 0
+        self.line_start = 0
+        self.line_end = -1
+
+    # the index of a whole str or bytes-like source
+    @classmethod
+    def of(cls, source):
+        if isinstance(source, str):
+            return cls(array("q", [match.start() for match in re.finditer("\n", source)]))
+        return cls(newline_offsets(source))
+
+    def line(self, offset: int) -> int:
+        return self.position(offset)[0]
+
+    def column(self, offset: int) -> int:
+        return self.position(offset)[1]
+
+    # (line, column) of an offset
+    def position(self, offset: int) -> tuple:
+        if self.line_start <= offset <= self.line_end:
+            return self.line_number, offset - self.line_start + 1
+        newlines = self.newlines
+        newlines_before = bisect.bisect_left(newlines, offset)
+        line_start = newlines[newlines_before - 1] + 1 if newlines_before else 0
+        if newlines_before < len(newlines):
+            # the end of the last line isn't known while a lexer is still adding newlines
+            self.line_number = newlines_before + 1
+            self.line_start = line_start
+            self.line_end = newlines[newlines_before]
+        return newlines_before + 1, offset - line_start + 1
+
+
+# the 1 based column of an offset in source; indexes is a [source, its LineIndex] pair that keeps the index
+# built for a source with a long line, so it's built once per source
+def source_column(source, offset: int, indexes: list) -> int:
+    newline = "\n" if isinstance(source, str) else b"\n"
+    line_start = source.rfind(newline, offset - LONG_LINE if offset > LONG_LINE else 0, offset) + 1
+    if line_start or offset <= LONG_LINE:
+        return offset - line_start + 1
+    if indexes[0] is not source:
+        indexes[:] = [source, LineIndex.of(source)]
+    return indexes[1].column(offset)
+
+
+# columns of every token with rfind(), LineIndex and source_column(), on many short lines and on one long line
+if __name__ == "__main__":
+    import time
+    import go_grammar
+    from FastLexer import lexer
+
+    def rfind_column(input_text: str, token) -> int:
+        line_start = input_text.rfind('\n', 0, token.lexpos) + 1
+        return (token.lexpos - line_start) + 1
+
+    for lines, separator in [(10 ** 5, "\n"), (10 ** 6, "\n"), (2 * 10 ** 4, " "), (10 ** 5, " ")]:
+        source = separator.join("var v{0} = v{0} * 3 + {0}".format(index % 1000) for index in range(lines)) + "\n"
+        lexer_copy = lexer.clone()
+        lexer_copy.lineno = 1
+        lexer_copy.input(source)
+        tokens = list(iter(lexer_copy.token, None))
+        label = "{} statements on {} line{}".format(lines, source.count("\n"), "s" if separator == "\n" else "")
+
+        start = time.perf_counter()
+        expected = [rfind_column(source, token) for token in tokens]
+        rfind_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        line_index = LineIndex.of(source)
+        build_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        positions = [line_index.position(token.lexpos) for token in tokens]
+        lookup_seconds = time.perf_counter() - start
+
+        same = [column for _, column in positions] == expected and \
+            [line for line, _ in positions] == [token.lineno for token in tokens] and \
+            lexer_copy.line_index.newlines == line_index.newlines
+        start = time.perf_counter()
+        indexes = [None, None]
+        same = same and [source_column(source, token.lexpos, indexes) for token in tokens] == expected
+        column_seconds = time.perf_counter() - start
+        print("{}: {} tokens, rfind {:.3f}s, LineIndex {:.3f}s build + {:.3f}s lookups, source_column() {:.3f}s, "
+              "{}".format(label, len(tokens), rfind_seconds, build_seconds, lookup_seconds, column_seconds,
+                          "same" if same else "DIFFERENT"))
+
+    program = go_grammar.parser.parse("var x = 5\nvar ans = 1\nfor x > 1 {\n    ans = ans * x\n    x = x - 1\n}\n")
+    pending = [program]
+    unplaced = 0
+    while pending:
+        _node = pending.pop()
+        unplaced += _node.line is None
+        pending.extend(_node.children)
+    print("nodes without a line/index: {}".format(unplaced))
@@ -0,0 +1,432 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Loop optimizations over the AST, run after ConstantFolder: loop-invariant code motion and strength
+         reduction of multiplications by induction variables.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - Loops are optimized outermost first, so an expression invariant in several nested loops is hoisted out
+    of all of them at once.
+  - A variable is variant in a loop when it is assigned or declared anywhere in its condition, step, body or
+    init clause; the init clause runs after the hoisted declarations, so a name it assigns with = is as
+    variant as one it declares. Names are compared by identifier, so a shadowing declaration inside the
+    loop makes the outer variable variant too. That is conservative, never wrong.
+  - Invariant code motion: the largest invariant arithmetic expressions that use a variable are computed
+    once into a new variable declared right before the loop; identical expressions share it. Division and
+    remainder are only hoisted when the divisor is a constant other than 0, since the loop may not run and
+    a hoisted division by zero would trap where the program didn't.
+  - Strength reduction: i is a basic induction variable when every assignment to it in the loop is
+    i = i + k or i = i - k with k an integer constant. Each int product i * c, with c an integer constant or
+    an invariant int variable, becomes a variable t set to i * c before the loop and advanced by k * c right
+    after every assignment to i. An assignment that is the step of a for statement is followed by the end of
+    that loop's body, which is where its update goes. Integer arithmetic wraps, so t stays i * c exactly.
+  - The new variables are named licm_N and sr_N, numbered past any such name the program uses. The
+    TypeChecker, DataLayout and RegisterAllocator see them like any other variable: in register mode the
+    induction variables and the reduced products are the most heavily weighted intervals, so they live in
+    registers.
+  - Multiplication, division and remainder by a power of two are replaced by shifts in MIPS32_Emitter, which
+    knows the types of the operands.
+
+"""
+from ASTNODE import ASTNODE, ASSIGNMENT_OPERATORS
+from RegisterAllocator import unwrap, binary_parts
+from TypeChecker import TypeChecker, INTEGER
+
+# operators whose value only depends on their operands
+PURE_OPERATORS = ("+", "-", "*", "/", "%", "min", "max")
+PURE_FUNCTIONS = ("abs", "sin", "cos", "tan")
+
+
+class LoopOptimizer:
+    def __init__(self) -> None:
+        self.hoisted = 0     # expressions moved out of a loop, counting every occurrence
+        self.reduced = 0     # multiplications replaced by a variable advanced by additions
+        self.types = {}
+        self.names = set()   # every identifier of the program, new variables must not clash with them
+        self.counts = {"licm": 0, "sr": 0}
+
+    def optimize(self, ast: ASTNODE) -> ASTNODE:
+        self.types = TypeChecker(ast).types
+        loops = []
+        pending = [ast]
+        while pending:
+            _node = pending.pop()
+            if _node.name == "name":
+                self.names.add(_node.value)
+            elif _node.name == "for":
+                loops.append(_node)
+            pending.extend(reversed(_node.children))
+        for loop in loops:
+            statement = loop.parent
+            if statement is None or statement.name != "statement" or statement.parent is None or \
+                    statement.parent.name != "statement_list":
+                continue  # there is no statement list to put the new declarations in
+            self.hoist_invariants(loop)
+            self.reduce_strength(loop)
+        return ast
+
+    # a variable name of its own
+    def new_name(self, prefix: str) -> str:
+        while True:
+            name = "{}_{}".format(prefix, self.counts[prefix])
+            self.counts[prefix] += 1
+            if name not in self.names:
+                self.names.add(name)
+                return name
+
+    # ----------------------------------------------------------------------------------------------------
+    # analysis
+
+    # the parts of a loop that run on every iteration, and the name its init clause declares
+    @staticmethod
+    def loop_parts(loop: ASTNODE) -> tuple:
+        if len(loop.children) == 4:
+            init, condition, step, body = loop.children
+            declared = init.children[0].value if init.name == "assign" and init.value == ":=" else None
+            return [condition, step, body], init, declared
+        return list(loop.children), None, None
+
+    @staticmethod
+    def assignments(parts: list) -> list:
+        found = []
+        pending = list(parts)
+        while pending:
+            _node = pending.pop()
+            if _node.name == "assign" and _node.value in ASSIGNMENT_OPERATORS:
+                found.append(_node)
+            pending.extend(_node.children)
+        return found
+
+    def variant_names(self, loop: ASTNODE) -> set:
+        parts, init, _ = self.loop_parts(loop)
+        if init is not None:
+            parts = parts + [init]
+        return {assignment.children[0].value for assignment in self.assignments(parts)}
+
+    # is an expression invariant, safe to evaluate before the loop and worth computing once
+    def invariant(self, _node: ASTNODE, variant: set) -> bool:
+        uses_variable = False
+        pending = [_node]
+        while pending:
+            _node = pending.pop()
+            if _node.name == "name":
+                if _node.value in variant:
+                    return False
+                uses_variable = True
+            elif _node.name == "number":
+                pass
+            elif _node.name != "expression" or (not _node.children):
+                return False  # a comparison, assignment or string
+            elif _node.value in ("/", "%") and not nonzero_constant(_node.children[1]):
+                return False
+            elif _node.value is not None and _node.value not in PURE_OPERATORS and \
+                    _node.value not in PURE_FUNCTIONS:
+                return False
+            else:
+                pending.extend(_node.children)
+        return uses_variable
+
+    # ----------------------------------------------------------------------------------------------------
+    # invariant code motion
+
+    def hoist_invariants(self, loop: ASTNODE) -> None:
+        variant = self.variant_names(loop)
+        parts, _, _ = self.loop_parts(loop)
+        temporaries = {}  # expression key -> name of the variable holding it
+        declarations = []
+        pending = list(reversed(parts))
+        while pending:
+            _node = pending.pop()
+            if _node.name == "expression" and _node.value is not None and self.invariant(_node, variant):
+                key = expression_key(_node)
+                name = temporaries.get(key)
+                if name is None:
+                    name = temporaries[key] = self.new_name("licm")
+                    declarations.append(declaration(_node, name, copy_tree(_node)))
+                variable = type(_node)("name", value=name, line=_node.line)
+                self.types[variable] = self.types.get(_node)  # for the strength reduction of inner loops
+                replace_child(_node, variable)
+                self.hoisted += 1
+            else:
+                pending.extend(reversed(_node.children))
+        if declarations:
+            insert_statements(loop.parent, declarations)
+
+    # ----------------------------------------------------------------------------------------------------
+    # strength reduction
+
+    def reduce_strength(self, loop: ASTNODE) -> None:
+        parts, init, declared = self.loop_parts(loop)
+        variant = self.variant_names(loop)
+        steps = {}       # induction variable -> the assignments advancing it, as (assign node, step)
+        others = set()   # variables assigned some other way
+        for assignment in self.assignments(parts):
+            name = assignment.children[0].value
+            step = induction_step(assignment)
+            if step is None or self.types.get(assignment.children[0]) != INTEGER:
+                others.add(name)
+            else:
+                steps.setdefault(name, []).append((assignment, step))
+        inductions = {name: advances for name, advances in steps.items() if name not in others}
+        if not inductions:
+            return
+        # the products of an induction variable and a constant or invariant variable, grouped by operands
+        products = {}
+        pending = list(reversed(parts))
+        while pending:
+            _node = pending.pop()
+            operands = self.product(_node, inductions, variant)
+            if operands is None:
+                pending.extend(reversed(_node.children))
+            else:
+                products.setdefault(operands, []).append(_node)
+        declarations = []
+        for (variable, factor), occurrences in products.items():
+            advances = inductions[variable]
+            if factor[0] == "name" and any(abs(step) != 1 for _, step in advances):
+                continue  # the update would need a multiplication of its own
+            anchors = [self.update_anchor(assignment, loop) for assignment, _ in advances]
+            if any(anchor is None for anchor in anchors):
+                continue
+            name = self.new_name("sr")
+            first = occurrences[0]
+            start = initial_value(variable, init, declared, first)
+            declarations.append(declaration(first, name, binary(first, "*", start, factor_node(first, factor))))
+            for (assignment, step), anchor in zip(advances, anchors):
+                insert_after(anchor, update(assignment, name, step, factor))
+            for occurrence in occurrences:
+                replace_child(occurrence, type(occurrence)("name", value=name, line=occurrence.line))
+                self.reduced += 1
+        if declarations:
+            insert_statements(loop.parent, declarations)
+
+    # (induction variable, factor) of an int product of an induction variable and a constant or invariant
+    # variable, the factor as ("number", value) or ("name", identifier); None for anything else
+    def product(self, _node: ASTNODE, inductions: dict, variant: set):
+        if _node.name != "expression" or _node.value != "*" or len(_node.children) != 2 or \
+                self.types.get(_node) != INTEGER:
+            return None
+        left, right = unwrap(_node.children[0]), unwrap(_node.children[1])
+        for variable, factor in ((left, right), (right, left)):
+            if variable.name != "name" or variable.value not in inductions:
+                continue
+            if factor.name == "number" and factor.value[1] == "integer":
+                return variable.value, ("number", factor.value[0])
+            if factor.name == "name" and factor.value not in variant and self.types.get(factor) == INTEGER:
+                return variable.value, ("name", factor.value)
+        return None
+
+    # the statement an induction variable's update goes after: the assignment's own statement in a statement
+    # list, or the last statement of the body of the for loop the assignment is the step of
+    @staticmethod
+    def update_anchor(assignment: ASTNODE, loop: ASTNODE):
+        statement = assignment.parent
+        if statement is None or statement.name != "statement":
+            return None
+        parent = statement.parent
+        if parent is not None and parent.name == "statement_list":
+            return statement
+        if parent is not None and parent.name == "for" and len(parent.children) == 4 and \
+                parent.children[2] is statement:
+            body = parent.children[3]
+            if body.children and body.children[0].name == "statement_list" and body.children[0].children:
+                return body.children[0].children[-1]
+        return None
+
+
+# ----------------------------------------------------------------------------------------------------------
+# tree helpers; new nodes are made with the class of the tree they go into, ASTNODE or SlotNode
+
+# i = i + k, i = k + i or i = i - k: the step k, or None
+def induction_step(assignment: ASTNODE):
+    if assignment.value != "=":
+        return None
+    name = assignment.children[0].value
+    parts = binary_parts(unwrap(assignment.children[1]))
+    if parts is None or parts[0] not in ("+", "-"):
+        return None
+    operator, left, right = parts[0], unwrap(parts[1]), unwrap(parts[2])
+    if operator == "+" and right.name == "name" and right.value == name:
+        left, right = right, left
+    if left.name != "name" or left.value != name or right.name != "number" or right.value[1] != "integer":
+        return None
+    return right.value[0] if operator == "+" else -right.value[0]
+
+
+def nonzero_constant(_node: ASTNODE) -> bool:
+    _node = unwrap(_node)
+    return _node.name == "number" and _node.value[0] != 0
+
+
+# a hashable value telling structurally equal expressions apart from the others
+def expression_key(_node: ASTNODE) -> tuple:
+    key = []
+    pending = [_node]
+    while pending:
+        _node = pending.pop()
+        key.append((_node.name, _node.value, len(_node.children)))
+        pending.extend(reversed(_node.children))
+    return tuple(key)
+
+
+def copy_tree(_node: ASTNODE) -> ASTNODE:
+    node_class = type(_node)
+    built = []
+    pending = [(_node, False)]
+    while pending:
+        _node, ready = pending.pop()
+        if not ready:
+            pending.append((_node, True))
+            pending.extend((child, False) for child in reversed(_node.children))
+            continue
+        copied = node_class(_node.name, value=_node.value, line=_node.line, index=_node.index)
+        if _node.children:
+            copied.children = built[len(built) - len(_node.children):]
+            del built[len(built) - len(_node.children):]
+        built.append(copied)
+    return built[0]
+
+
+# put new_node where old_node is among its parent's children
+def replace_child(old_node: ASTNODE, new_node: ASTNODE) -> None:
+    parent = old_node.parent
+    children = list(parent.children)
+    children[next(index for index, child in enumerate(children) if child is old_node)] = new_node
+    parent.children = children
+
+
+def binary(like: ASTNODE, operator: str, left: ASTNODE, right: ASTNODE) -> ASTNODE:
+    return type(like)("expression", value=operator, line=like.line, children=[left, right])
+
+
+def factor_node(like: ASTNODE, factor: tuple) -> ASTNODE:
+    if factor[0] == "number":
+        return type(like)("number", value=(factor[1], "integer"), line=like.line)
+    return type(like)("name", value=factor[1], line=like.line)
+
+
+# a statement declaring a variable: var name = value
+def declaration(like: ASTNODE, name: str, value: ASTNODE) -> ASTNODE:
+    node_class = type(like)
+    assign = node_class("assign", value=":=", line=like.line,
+                        children=[node_class("name", value=name, line=like.line), value])
+    return node_class("statement", line=like.line, children=[assign])
+
+
+# the value of an induction variable when the loop is entered, as an expression evaluated before the loop
+def initial_value(variable: str, init, declared, like: ASTNODE) -> ASTNODE:
+    if init is not None and init.name == "assign" and init.value in ASSIGNMENT_OPERATORS and \
+            init.children[0].value == variable:
+        return copy_tree(init.children[1])
+    return type(like)("name", value=variable, line=like.line)
+
+
+# t = t + k * c, after the induction variable advanced by k
+def update(assignment: ASTNODE, name: str, step: int, factor: tuple) -> ASTNODE:
+    node_class = type(assignment)
+    line = assignment.line
+    if factor[0] == "number":
+        increment = node_class("number", value=(wrap_product(step, factor[1]), "integer"), line=line)
+        operator = "+"
+    else:
+        increment = node_class("name", value=factor[1], line=line)
+        operator = "+" if step > 0 else "-"
+    value = node_class("expression", value=operator, line=line,
+                       children=[node_class("name", value=name, line=line), increment])
+    assign = node_class("assign", value="=", line=line, children=[node_class("name", value=name, line=line), value])
+    return node_class("statement", line=line, children=[assign])
+
+
+def wrap_product(left: int, right: int) -> int:
+    return ((left * right + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+
+
+# put statements before a statement in its statement list
+def insert_statements(statement: ASTNODE, new_statements: list) -> None:
+    statement_list = statement.parent
+    children = list(statement_list.children)
+    index = next(index for index, child in enumerate(children) if child is statement)
+    statement_list.children = children[:index] + new_statements + children[index:]
+
+
+def insert_after(statement: ASTNODE, new_statement: ASTNODE) -> None:
+    statement_list = statement.parent
+    children = list(statement_list.children)
+    index = next(index for index, child in enumerate(children) if child is statement)
+    statement_list.children = children[:index + 1] + [new_statement] + children[index + 1:]
+
+
+# simulated instructions, multiplications and divisions of loop-heavy programs with and without the pass
+if __name__ == "__main__":
+    import go_grammar
+    from ConstantFolder import ConstantFolder
+    from MIPS32_Emitter import MIPS32Emitter
+    from MIPS32_Simulator import MIPS32Simulator
+    from SamplePrograms import SAMPLE_PROGRAMS
+
+    programs = dict(SAMPLE_PROGRAMS)
+    programs["invariant"] = """var n = 40
+var total = 0
+for var i = 0; i < 1000; i = i + 1 {
+    total = total + (n * n - n) / 2 + i * 12
+}
+fmt.Println(total)
+"""
+    programs["nested"] = """var n = 30
+var sum = 0
+for var row = 0; row < n; row = row + 1 {
+    for var column = 0; column < n; column = column + 1 {
+        sum = sum + row * n + column * 4 + max(n, 7) * 3
+    }
+}
+fmt.Println(sum)
+"""
+    # the init clause assigns k after the hoisted declarations run, so k * 2 must stay in the loop; prints 30
+    programs["init"] = """var n = 0
+for var j = 0; j < 1; j = j + 1 {
+    n = n + 0
+}
+var k = n + 1
+var x = 0
+var i = 0
+for k = n + 5; i < 3; i = i + 1 {
+    x = x + k * 2
+}
+fmt.Println(x)
+"""
+    programs["shifts"] = """var x = 12345
+var y = 0
+for var i = 0; i < 500; i = i + 1 {
+    y = y + x * 8 - x / 16 + i / 4
+    x = x - 3
+}
+fmt.Println(y)
+"""
+
+    # dynamic count of the instructions in mnemonics, from the executions of each simulated block
+    def executed(simulator: MIPS32Simulator, result, mnemonics: tuple) -> int:
+        total = 0
+        for start, block in simulator.block_of.items():
+            stats = result.blocks[block]
+            body = simulator.instructions[start:start + stats.instructions]
+            total += stats.executions * sum(instruction.mnemonic in mnemonics for instruction in body)
+        return total
+
+    print("{:>10} {:>9} {:>8} {:>13} {:>7} {:>7} {:>7}  {}".format(
+        "program", "mode", "loops", "instructions", "mul", "div", "shifts", "output"))
+    for program_name, source in programs.items():
+        for mode in MIPS32Emitter.modes:
+            for optimized in (False, True):
+                go_grammar.lexer.lineno = 1
+                ast = go_grammar.parser.parse(source)
+                ConstantFolder().fold(ast)
+                if optimized:
+                    LoopOptimizer().optimize(ast)
+                simulator = MIPS32Simulator()
+                result = simulator.run(list(MIPS32Emitter(mode=mode).iter_lines(ast)))
+                print("{:>10} {:>9} {:>8} {:>13} {:>7} {:>7} {:>7}  {}".format(
+                    program_name, mode, "on" if optimized else "off", result.instructions,
+                    executed(simulator, result, ("mul",)), executed(simulator, result, ("div", "rem")),
+                    executed(simulator, result, ("sll", "sra", "srl")), result.output.split()))
@@ -6,71 +6,1298 @@ Course: CSC 486 - Compilers Design and Implementation
 
 Notes:
   - BASE compiler: Prof. Deanna Wilborne
-  - The Go Programming Language Specification: https://go.dev/ref/spec 
+  - The Go Programming Language Specification: https://go.dev/ref/spec
+  - Instructions are written to a sink instead of print(): PrintSink keeps the original console output,
+    BufferSink collects the program in memory, FileSink writes through a large write buffer, and
+    MIPS32Emitter.iter_lines() streams the program to the caller one line at a time.
+  - Instructions are built as MIPS32_IR instructions and run through MIPS32_Peephole before they are
+    rendered as text; pass peephole=False to see the unoptimized stack machine code.
+  - mode="stack" keeps every intermediate value on the stack; mode="register" gives variables registers
+    with RegisterAllocator's linear scan and evaluates expressions in Sethi-Ullman order.
+  - Variables live in the words DataLayout gives them, one per declaration. main points $gp at the first
+    word and variables are loaded and stored relative to it; words past gp_window bytes are addressed by
+    label.
+  - if and for statements are lowered into a ControlFlow graph of basic blocks that is laid out for fall
+    through; loops are rotated to test at the bottom and conditions compile to compare-and-branch
+    instructions (bgt, blez, ...) instead of a boolean on the stack.
+  - int multiplication, division and remainder by a power of two are shifts (and a mask for the remainder).
+  - mode="ssa" lowers the program through the SSA IR of SSA.py after its passes: every value that isn't a
+    constant gets a register by linear scan over its live interval in the block layout, or a spill word of
+    its own, and the phis of a block's successors are parallel copies at the end of the block. Variables
+    have no words of their own in this mode, the data section only holds the spill words. ssa_timings lists
+    the time of every pass and of the lowering.
+  - With stats, a CompileStats, the type check, the SSA passes and the peephole pass are timed as phases of
+    their own.
+  - The program is type checked first and the TypeChecker's tags pick the code: int expressions use the
+    integer instructions as before, float64 expressions are evaluated in the FPU's even registers with add.d
+    and friends, in Sethi-Ullman order in both modes. float64 variables are .double words that are always
+    loaded and stored, and float64 constants come from a pool of .double words after the variables.
+    Println of a float64 is system call 3, which prints the value as the simulator formats a double.
+    sin, cos and tan take constant arguments only and are evaluated at compile time.
 
 """
 # import the libraries we'll need
-from ASTNODE import ASTNODE
-import datetime as dt 
+from ASTNODE import ASTNODE, ASSIGNMENT_OPERATORS, statements
+from ConstantFolder import ConstantFolder
+from ControlFlow import BasicBlock, ControlFlowGraph, BRANCH_OPCODES, INVERTED_BRANCHES, ZERO_BRANCH_OPCODES
+from DataLayout import DataLayout, DATA_POINTER, GP_WINDOW, WORD_SIZE
+from LoopOptimizer import nonzero_constant
+from MIPS32_IR import (InstructionList, BINARY_OPCODES, FLOAT_OPCODES, ABS, ABS_D, ADDI, ADDIU, ADDU, AND, BC1F,
+                       BC1T, BNEZ, C_EQ_D, C_LE_D, C_LT_D, LA, LABEL, LI, LW, LWC1, L_D, MOVE, MOV_D, SLL, SLT, SRA,
+                       SRL, SUBU, SW, SWC1, SYSCALL, S_D)
+from MIPS32_Peephole import optimize
+from RegisterAllocator import (Interval, LinearScanAllocator, SethiUllman, IMMEDIATE_OPERATORS, SCRATCH_REGISTERS,
+                               VARIABLE_REGISTERS, binary_parts, immediate, unwrap)
+from SSA import (SSABlock, SSAError, SSAProgram, build_ssa, COMPARISONS, OPERATORS, OP_ABS, OP_CONST, OP_PRINT)
+from TypeChecker import TypeChecker, TypeCheckError, FLOAT, FLOAT_FUNCTIONS, INTEGER
+import datetime as dt
+import time
+
+
+# even FPU registers holding the doubles of a float64 expression, and the one min/max builds its result in
+FLOAT_SCRATCH_REGISTERS = ("$f0", "$f2", "$f4", "$f6")
+FLOAT_RESULT = "$f8"
+
+# comparison operator -> (compare instruction, swap the operands, branch when the flag is set)
+FLOAT_COMPARISONS = {
+    "<": (C_LT_D, False, True), "<=": (C_LE_D, False, True), ">": (C_LT_D, True, True),
+    ">=": (C_LE_D, True, True), "==": (C_EQ_D, False, True), "!=": (C_EQ_D, False, False),
+}
+
+
+# ssa mode: FPU registers handed out to float64 values, and the temporaries parallel copies go through (a cycle
+# is broken through the first, a copy from memory to memory goes through the second)
+SSA_FLOAT_REGISTERS = ("$f14", "$f16", "$f18", "$f20", "$f22", "$f24", "$f26", "$f28", "$f30")
+COPY_TEMPORARIES = {INTEGER: ("$v1", "$a1"), FLOAT: ("$f10", "$f8")}
+
+# int operators computed with shifts when the right operand is a power of two
+SHIFT_OPERATORS = ("*", "/", "%")
+
+
+# a program or construct the emitter can't generate code for
+class EmitterError(Exception):
+    pass
+
+
+# floats have no immediate operands
+def no_immediate(_node: ASTNODE) -> None:
+    return None
+
+
+# the exponent of an integer constant that is a power of two greater than 1, else None
+def power_of_two(_node: ASTNODE):
+    _node = unwrap(_node)
+    if _node.name == "number" and _node.value[1] == "integer":
+        value = _node.value[0]
+        if value > 1 and value & (value - 1) == 0:
+            return value.bit_length() - 1
+    return None
+
+
+# the original output path: one print() call per line of assembly
+class PrintSink:
+    def write(self, lines) -> None:
+        for line in lines:
+            print(line)
+
+    def close(self) -> None:
+        pass
+
+
+# collect the emitted program in memory
+class BufferSink:
+    def __init__(self) -> None:
+        self.lines = []
+
+    def write(self, lines) -> None:
+        self.lines.extend(lines)
+
+    def getvalue(self) -> str:
+        return "\n".join(self.lines) + "\n" if self.lines else ""
+
+    def close(self) -> None:
+        pass
+
+
+# write the emitted program to a file, one write() call per chunk of lines
+class FileSink:
+    def __init__(self, file_name: str, buffer_size: int = 1 << 20) -> None:
+        self.file_name = file_name
+        self.file = open(file_name, "w", buffering=buffer_size)
+
+    def write(self, lines) -> None:
+        if lines:
+            self.file.write("\n".join(lines))
+            self.file.write("\n")
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
 
 class MIPS32Emitter:
-    def emit_ast(self, _node):
-        if _node.name in ["program", "block_statement", "statements"]:
-            for child in _node.children:
-                self.emit_ast(child)
-        elif _node.name == "statement_list":
-            for child in _node.children:
-                self.emit_ast(child)
-        elif _node.name == "statement":
-            for child in _node.children:
-                self.emit_ast(child)
-        elif _node.name == "print":
-            for child in _node.children:
-                self.emit_ast(child)
-            # print(ast_stack.pop())
-            print("lw $a0, 4($sp)")  # 2024-02-14, DMW, my emitter was missing this line of assembly!
-            print("addi $sp, $sp, 4")
-            print("li $v0, 1")
-            print("syscall")
-            print("li $a0, 10")
-            print("li $v0, 11")
-            print("syscall")
-        elif _node.name == "assign":
-            self.emit_ast(_node.children[1])  # evaluate the expression and place result on stack
-            var_address = f"{_node.children[0].value}_000000"  # assuming variable naming follows a convention
-            print("lw $t0, 4($sp)")  # load the result of the expression
-            print("sw $t0, " + var_address)  # store it in the variable's address
-            print("addi $sp, $sp, 4")  # adjust stack pointer
-        elif _node.name == "expression":
-            if len(_node.children) == 1:
-                self.emit_ast(_node.children[0])
+    # number of buffered instructions rendered and handed to the sink (or the caller of iter_lines) at a time
+    flush_threshold = 8192
+
+    # bytes of the data segment addressed relative to $gp, the rest is addressed by label
+    gp_window = GP_WINDOW
+
+    modes = ("stack", "register", "ssa")
+
+    def __init__(self, sink=None, flush_threshold: int = None, peephole: bool = True, mode: str = "stack",
+                 stats=None) -> None:
+        if mode not in self.modes:
+            raise ValueError("Unknown emitter mode {}".format(mode))
+        self.sink = sink if sink is not None else PrintSink()
+        if flush_threshold is not None:
+            self.flush_threshold = flush_threshold
+        self.peephole = peephole
+        self.mode = mode
+        self.stats = stats         # a CompileStats timing typecheck, ssa and peephole, or None
+        self.code = InstructionList()
+        self.layout = None
+        self.homes = None          # register mode: variable slot -> register, None when spilled to memory
+        self.sethi_ullman = None
+        self.types = None          # node -> TypeChecker tag
+        self.float_sethi_ullman = None
+        self.float_constants = {}  # float value -> label of its .double
+        self.label_count = 0
+        self.graph = None          # the ControlFlowGraph an if or for statement is being lowered into
+        self.block = None          # the block being emitted into
+        self.outer_code = None     # the code the graph is laid out into
+        self.ssa = None            # ssa mode: the SSAProgram being lowered
+        self.locations = None      # ssa mode: value -> register, or the label of its spill word
+        self.spill_lines = []      # ssa mode: the .data lines of the spill words
+        self.ssa_timings = []      # ssa mode: (pass, seconds, values changed, values left) of SSA.build_ssa
+
+    # every instruction goes through here instead of print()
+    def emit(self, opcode: int, *operands) -> None:
+        self.code.append(opcode, *operands)
+
+    # allocate then push - $sp points at the next free word
+    def push(self, register: str) -> None:
+        self.emit(ADDI, "$sp", "$sp", -4)  # Decrease stack pointer to allocate 4 bytes
+        self.emit(SW, register, 4, "$sp")  # Store the value in the newly allocated word
+
+    def pop(self, register: str) -> None:
+        self.emit(LW, register, 4, "$sp")
+        self.emit(ADDI, "$sp", "$sp", 4)
+
+    # optimize and render the buffered instructions
+    def take_lines(self) -> list:
+        code, self.code = self.code, InstructionList()
+        if self.peephole:
+            if self.stats is not None:
+                self.stats.begin("peephole")
+            code = optimize(code)
+            if self.stats is not None:
+                self.stats.end()
+        return code.lines()
+
+    # hand the buffered instructions to the sink
+    def flush(self) -> None:
+        if len(self.code):
+            self.sink.write(self.take_lines())
+
+    # a label of its own for every branch target
+    def new_label(self, prefix: str) -> str:
+        self.label_count += 1
+        return "{}_{:05d}".format(prefix, self.label_count)
+
+    # tag every expression with its type, raises TypeCheckError listing the errors
+    def type_check(self, ast: ASTNODE) -> None:
+        if self.stats is not None:
+            self.stats.begin("typecheck")
+        checker = TypeChecker(ast)
+        if self.stats is not None:
+            self.stats.end()
+        if checker.errors:
+            raise TypeCheckError("\n".join(checker.errors))
+        self.types = checker.types
+        # the checker only lets sin, cos and tan through with constant arguments; evaluate the calls the
+        # ConstantFolder didn't, there is no instruction for them
+        for _node in list(self.types):
+            if _node.name == "expression" and _node.value in FLOAT_FUNCTIONS:
+                ConstantFolder().expression(_node)
+        self.float_sethi_ullman = SethiUllman({}, immediate=no_immediate)
+        for _node, tag in self.types.items():
+            if tag == FLOAT and _node.name == "number":
+                value = float(_node.value[0])
+                if value not in self.float_constants:
+                    self.float_constants[value] = "double_{:05d}".format(len(self.float_constants))
+
+    # give every variable of a program a word of the data segment
+    def lay_out(self, ast: ASTNODE, gp_window: int = None) -> None:
+        self.layout = DataLayout(ast, self.gp_window if gp_window is None else gp_window, self.types)
+
+    def data_section(self) -> list:
+        words = self.spill_lines if self.mode == "ssa" else self.layout.data_lines()
+        return [".data"] + words + \
+            ["{}:    .double {!r}".format(label, value) for value, label in self.float_constants.items()]
+
+    def is_float(self, _node: ASTNODE) -> bool:
+        return self.types.get(_node) == FLOAT
+
+    # the (offset, base) memory operand of a variable
+    def address(self, _node: ASTNODE) -> tuple:
+        return self.layout.address(_node)
+
+    # point $gp at the data segment, unless every variable it would reach lives in a register
+    def emit_data_pointer(self) -> None:
+        for slot in self.layout.slots:
+            if slot.offset is None:
+                break
+            if self.homes is None or self.homes.get(slot) is None:
+                self.emit(LA, DATA_POINTER, self.layout.base_label())
+                break
+
+    # yield the complete program (.data and .text sections) in chunks of about flush_threshold lines
+    def iter_chunks(self, ast: ASTNODE):
+        self.code = InstructionList()
+        self.float_constants = {}
+        self.type_check(ast)
+        self.lay_out(ast)
+        if self.mode == "ssa":
+            # the spill words are only known once the program is lowered, the data section comes after that
+            self.emit(LABEL, "main")
+            self.emit_ssa(ast)
+            self.emit(LI, "$v0", 10)
+            self.emit(SYSCALL)
+            yield self.data_section() + [".text", ".globl main"] + self.take_lines()
+            return
+        lines = self.data_section()
+        lines.append(".text")
+        lines.append(".globl main")
+        self.emit(LABEL, "main")
+        self.prepare(ast)
+        self.emit_data_pointer()
+        for statement in statements(ast):
+            self.emit_node(statement)
+            if len(self.code) >= self.flush_threshold:
+                lines.extend(self.take_lines())
+                yield lines
+                lines = []
+        self.emit(LI, "$v0", 10)  # exit program system call
+        self.emit(SYSCALL)
+        lines.extend(self.take_lines())
+        yield lines
+
+    # stream the complete program to the caller one line at a time
+    def iter_lines(self, ast: ASTNODE):
+        for chunk in self.iter_chunks(ast):
+            yield from chunk
+
+    # write the complete program to the sink
+    def emit_program(self, ast: ASTNODE) -> None:
+        for chunk in self.iter_chunks(ast):
+            self.sink.write(chunk)
+
+    # write the code for a single node (no .data/.text sections) to the sink
+    def emit_ast(self, _node: ASTNODE) -> None:
+        if self.types is None:
+            self.type_check(_node)
+        if self.layout is None:
+            self.lay_out(_node, gp_window=0)  # there is no main to set $gp in, address variables by label
+        if self.mode == "ssa":
+            self.emit_ssa(_node)
+            self.flush()
+            return
+        if self.mode == "register" and self.homes is None:
+            self.prepare(_node)
+        self.emit_node(_node)
+        self.flush()
+
+    # register mode: allocate registers to the variables and clear the ones read before they are written
+    def prepare(self, ast: ASTNODE) -> None:
+        if self.mode != "register":
+            return
+        allocator = LinearScanAllocator(key=self.word_slot)
+        self.homes = allocator.allocate(ast)
+        self.sethi_ullman = SethiUllman(self.homes, key=self.word_slot)
+        for interval in allocator.read_first():
+            self.emit(LI, interval.register, 0)
+
+    # register mode: the slot of an int variable, the key it is allocated a register under; None for a float64
+    def word_slot(self, _node: ASTNODE):
+        slot = self.layout.slot(_node)
+        return slot if slot.size == WORD_SIZE else None
+
+    # register mode: evaluate an expression in Sethi-Ullman order, returns the register holding the value
+    def emit_value(self, _node: ASTNODE, scratch: tuple = SCRATCH_REGISTERS) -> str:
+        return self.emit_values([(_node, scratch)])[0]
+
+    # register mode: evaluate both operands of an operator, returns the registers holding the left and the right
+    # value; the operand needing more registers goes first, so the other one fits in what is left
+    def emit_operands(self, left: ASTNODE, right: ASTNODE, scratch: tuple = SCRATCH_REGISTERS) -> tuple:
+        return tuple(self.emit_values(self.operand_entries(left, right, scratch)))
+
+    # the work entries evaluating two operands, first the one needing more registers, leaving the registers of
+    # the left and the right value on top of the results
+    def operand_entries(self, left: ASTNODE, right: ASTNODE, scratch: tuple) -> list:
+        label = self.sethi_ullman.label
+        first, second = (left, right) if label(left) >= label(right) else (right, left)
+        return [("order", first is not left), ("second", second, scratch), (first, scratch)]
+
+    # register mode: walk expressions in post-order with an explicit stack instead of recursing, so long
+    # expressions don't reach the recursion limit. An entry is a (node, scratch registers) pair to evaluate or
+    # an (action, arguments...) tuple to run once the entries above it are done; the registers holding the
+    # values computed so far are kept in results, which is returned
+    def emit_values(self, pending: list) -> list:
+        results = []
+        while pending:
+            entry = pending.pop()
+            action = entry[0]
+            if type(action) is str:
+                if action == "second":
+                    # the second operand, in the scratch registers the first one doesn't hold
+                    _, second, scratch = entry
+                    remaining = tuple(register for register in scratch if register != results[-1])
+                    if self.sethi_ullman.label(second) > len(remaining):
+                        # not enough scratch registers left, keep the first value on the stack meanwhile
+                        self.push(results.pop())
+                        pending.append(("restore", scratch))
+                        pending.append((second, scratch))
+                    else:
+                        pending.append((second, remaining))
+                elif action == "restore":
+                    second_register = results.pop()
+                    first_register = next(register for register in entry[1] if register != second_register)
+                    self.pop(first_register)
+                    results.extend((first_register, second_register))
+                elif action == "order":
+                    if entry[1]:
+                        results[-2], results[-1] = results[-1], results[-2]
+                elif action == "abs":
+                    self.emit(ABS, entry[1][0], results.pop())
+                    results.append(entry[1][0])
+                elif action == "immediate":
+                    self.emit(ADDIU, entry[1][0], results.pop(), entry[2])
+                    results.append(entry[1][0])
+                elif action == "shift":
+                    # $v1 is not used for anything else in register mode
+                    _, operator, scratch, shift = entry
+                    self.emit_shift(operator, scratch[0], results.pop(), shift, "$v1")
+                    results.append(scratch[0])
+                else:
+                    _, operator, scratch = entry
+                    right_register = results.pop()
+                    left_register = results.pop()
+                    if operator in BINARY_OPCODES:
+                        self.emit(BINARY_OPCODES[operator], scratch[0], left_register, right_register)
+                    else:
+                        # $v1 and $a1 are not used for anything else in register mode
+                        self.emit_min_max(operator, scratch[0], left_register, right_register, "$v1", "$a1")
+                    results.append(scratch[0])
+                continue
+            scratch = entry[1]
+            _node = unwrap(action)
+            parts = binary_parts(_node)
+            if parts is None:
+                if _node.name == "name":
+                    home = self.homes.get(self.word_slot(_node))
+                    if home is None:
+                        self.emit(LW, scratch[0], *self.address(_node))
+                        home = scratch[0]
+                    results.append(home)
+                elif _node.name == "number":
+                    self.emit(LI, scratch[0], int(_node.value[0]))  # 2.0 is an int constant where an int is needed
+                    results.append(scratch[0])
+                elif _node.name == "expression" and _node.value == "abs":
+                    pending.append(("abs", scratch))
+                    pending.append((_node.children[0], scratch))
+                else:
+                    raise EmitterError("Unsupported expression {}".format(_node.value if _node.value else _node.name))
+                continue
+            operator, left, right = parts
+            if operator in FLOAT_COMPARISONS and self.is_float(left):
+                self.emit_float_comparison(operator, left, right, scratch[0])
+                results.append(scratch[0])
+                continue
+            if operator not in BINARY_OPCODES and operator not in ("min", "max"):
+                raise EmitterError("Unknown operator {}".format(operator))
+            constant = immediate(right) if operator in IMMEDIATE_OPERATORS else None
+            if constant is not None:
+                pending.append(("immediate", scratch, constant if operator == "+" else -constant))
+                pending.append((left, scratch))
+                continue
+            if operator in SHIFT_OPERATORS:
+                if operator == "*" and power_of_two(right) is None and power_of_two(left) is not None:
+                    left, right = right, left
+                shift = power_of_two(right)
+                if shift is not None:
+                    pending.append(("shift", operator, scratch, shift))
+                    pending.append((left, scratch))
+                    continue
+            pending.append(("binary", operator, scratch))
+            pending.extend(self.operand_entries(left, right, scratch))
+        return results
+
+    # evaluate a float64 expression into an even FPU register in Sethi-Ullman order, returns the register
+    def emit_float_value(self, _node: ASTNODE, scratch: tuple = FLOAT_SCRATCH_REGISTERS) -> str:
+        return self.emit_float_values([(_node, scratch)])[0]
+
+    # evaluate both operands of a float64 operator, the one needing more registers first; returns the registers
+    # holding the left and the right value
+    def emit_float_operands(self, left: ASTNODE, right: ASTNODE, scratch: tuple) -> tuple:
+        return tuple(self.emit_float_values(self.float_operand_entries(left, right, scratch)))
+
+    def float_operand_entries(self, left: ASTNODE, right: ASTNODE, scratch: tuple) -> list:
+        label = self.float_sethi_ullman.label
+        first, second = (left, right) if label(left) >= label(right) else (right, left)
+        return [("order", first is not left), ("second", second, scratch), (first, scratch)]
+
+    # the float64 counterpart of emit_values, with the same entries. A value that doesn't fit the scratch
+    # registers is kept on the stack meanwhile, a word at a time
+    def emit_float_values(self, pending: list) -> list:
+        results = []
+        while pending:
+            entry = pending.pop()
+            action = entry[0]
+            if type(action) is str:
+                if action == "second":
+                    _, second, scratch = entry
+                    remaining = tuple(register for register in scratch if register != results[-1])
+                    if self.float_sethi_ullman.label(second) > len(remaining):
+                        first_register = results.pop()
+                        self.emit(ADDI, "$sp", "$sp", -8)
+                        self.emit(SWC1, first_register, 4, "$sp")
+                        self.emit(SWC1, odd_half(first_register), 8, "$sp")
+                        pending.append(("restore", scratch))
+                        pending.append((second, scratch))
+                    else:
+                        pending.append((second, remaining))
+                elif action == "restore":
+                    second_register = results.pop()
+                    first_register = next(register for register in entry[1] if register != second_register)
+                    self.emit(LWC1, first_register, 4, "$sp")
+                    self.emit(LWC1, odd_half(first_register), 8, "$sp")
+                    self.emit(ADDI, "$sp", "$sp", 8)
+                    results.extend((first_register, second_register))
+                elif action == "order":
+                    if entry[1]:
+                        results[-2], results[-1] = results[-1], results[-2]
+                elif action == "abs":
+                    self.emit(ABS_D, entry[1][0], results.pop())
+                    results.append(entry[1][0])
+                else:
+                    _, operator, scratch = entry
+                    right_register = results.pop()
+                    left_register = results.pop()
+                    if operator in FLOAT_OPCODES:
+                        self.emit(FLOAT_OPCODES[operator], scratch[0], left_register, right_register)
+                    else:
+                        self.emit_float_min_max(operator, scratch[0], left_register, right_register)
+                    results.append(scratch[0])
+                continue
+            scratch = entry[1]
+            _node = unwrap(action)
+            parts = binary_parts(_node)
+            if parts is None:
+                if _node.name == "name":
+                    self.emit(L_D, scratch[0], *self.address(_node))
+                    results.append(scratch[0])
+                elif _node.name == "number":
+                    self.emit(L_D, scratch[0], 0, self.float_constants[float(_node.value[0])])
+                    results.append(scratch[0])
+                elif _node.name == "expression" and _node.value == "abs":
+                    pending.append(("abs", scratch))
+                    pending.append((_node.children[0], scratch))
+                else:
+                    raise EmitterError("Unsupported float64 expression {}".format(
+                        _node.value if _node.value else _node.name))
+                continue
+            operator, left, right = parts
+            if operator not in FLOAT_OPCODES and operator not in ("min", "max"):
+                raise EmitterError("Unknown float64 operator {}".format(operator))
+            pending.append(("binary", operator, scratch))
+            pending.extend(self.float_operand_entries(left, right, scratch))
+        return results
+
+    # min/max of two doubles: there is no mask trick for floats, branch on the comparison
+    def emit_float_min_max(self, function: str, destination: str, left: str, right: str) -> None:
+        done = self.new_label("minmax")
+        self.emit(C_LT_D, left, right)
+        self.emit(MOV_D, FLOAT_RESULT, left if function == "min" else right)
+        self.emit(BC1T, done)
+        self.emit(MOV_D, FLOAT_RESULT, right if function == "min" else left)
+        self.emit(LABEL, done)
+        self.emit(MOV_D, destination, FLOAT_RESULT)
+
+    # compare two float64 expressions, leaving 1 or 0 in an integer register
+    def emit_float_comparison(self, operator: str, left: ASTNODE, right: ASTNODE, destination: str) -> None:
+        self.emit_flag(self.emit_float_compare(operator, left, right), destination)
+
+    # 1 or 0 in an integer register, from the FPU condition flag and the branch taken when the comparison holds
+    def emit_flag(self, branch: int, destination: str) -> None:
+        done = self.new_label("compare")
+        self.emit(LI, destination, 1)
+        self.emit(branch, done)
+        self.emit(LI, destination, 0)
+        self.emit(LABEL, done)
+
+    # set the FPU condition flag from two float64 expressions, returns the branch taken when the comparison holds
+    def emit_float_compare(self, operator: str, left: ASTNODE, right: ASTNODE) -> int:
+        compare, swap, when_set = FLOAT_COMPARISONS[operator]
+        first_register, second_register = self.emit_float_operands(left, right, FLOAT_SCRATCH_REGISTERS)
+        if swap:
+            first_register, second_register = second_register, first_register
+        self.emit(compare, first_register, second_register)
+        return BC1T if when_set else BC1F
+
+    # stack mode: compare two float64 expressions and push 1 or 0
+    def emit_float_comparison_top(self, operator: str, left: ASTNODE, right: ASTNODE) -> None:
+        self.emit_float_comparison(operator, left, right, "$t0")
+        self.push("$t0")
+
+    # store a float64 expression into its variable
+    def emit_float_store(self, _node: ASTNODE, value: ASTNODE) -> None:
+        self.emit(S_D, self.emit_float_value(value), *self.address(_node))
+
+    # system calls printing a float64 expression and a newline
+    def emit_float_print(self, value: ASTNODE) -> None:
+        self.emit(MOV_D, "$f12", self.emit_float_value(value))
+        self.emit_float_print_call()
+
+    # system calls printing the double in $f12 and a newline
+    def emit_float_print_call(self) -> None:
+        self.emit(LI, "$v0", 3)
+        self.emit(SYSCALL)
+        self.emit(LI, "$a0", 10)
+        self.emit(LI, "$v0", 11)
+        self.emit(SYSCALL)
+
+    # register mode: store a value into a variable's register or data segment word
+    def emit_store(self, _node: ASTNODE, register: str) -> None:
+        home = self.homes.get(self.word_slot(_node))
+        if home is None:
+            self.emit(SW, register, *self.address(_node))
+        elif home != register:
+            self.emit(MOVE, home, register)
+
+    # system calls printing the integer in $a0 and a newline
+    def emit_print_call(self) -> None:
+        self.emit(LI, "$v0", 1)
+        self.emit(SYSCALL)
+        self.emit(LI, "$a0", 10)
+        self.emit(LI, "$v0", 11)
+        self.emit(SYSCALL)
+
+    # replace the two values on top of the stack with the result of a binary operator
+    def emit_binary_top(self, operator: str) -> None:
+        self.emit(LW, "$t1", 4, "$sp")  # get the previously saved RHS value off the stack
+        self.emit(LW, "$t0", 8, "$sp")  # get the previously saved LHS value off the stack
+        if operator in BINARY_OPCODES:
+            self.emit(BINARY_OPCODES[operator], "$t0", "$t0", "$t1")  # $t0 = $t0 op $t1
+        else:
+            self.emit_min_max(operator, "$t0", "$t0", "$t1", "$t2", "$t3")
+        self.emit(ADDI, "$sp", "$sp", 4)  # deallocate space where $t1 was saved on the stack
+        self.emit(SW, "$t0", 4, "$sp")
+
+    # multiply, divide or take the remainder by 2 ** shift; Go's division truncates toward zero, so a negative
+    # dividend is biased by 2 ** shift - 1 before the arithmetic shift
+    def emit_shift(self, operator: str, destination: str, source: str, shift: int, temporary: str) -> None:
+        if operator == "*":
+            self.emit(SLL, destination, source, shift)
+            return
+        self.emit(SRA, temporary, source, 31)
+        self.emit(SRL, temporary, temporary, 32 - shift)
+        self.emit(ADDU, temporary, source, temporary)
+        if operator == "/":
+            self.emit(SRA, destination, temporary, shift)
+        else:
+            self.emit(AND, temporary, temporary, -(1 << shift))
+            self.emit(SUBU, destination, source, temporary)
+
+    # replace the value on top of the stack with the result of a shift
+    def emit_shift_top(self, operator: str, shift: int) -> None:
+        self.emit(LW, "$t0", 4, "$sp")
+        self.emit_shift(operator, "$t0", "$t0", shift, "$t1")
+        self.emit(SW, "$t0", 4, "$sp")
+
+    # replace the value on top of the stack with its absolute value
+    def emit_abs_top(self) -> None:
+        self.emit(LW, "$t0", 4, "$sp")
+        self.emit(ABS, "$t0", "$t0")
+        self.emit(SW, "$t0", 4, "$sp")
+
+    # pop the value on top of the stack into a variable
+    def emit_store_top(self, _node: ASTNODE) -> None:
+        self.pop("$t0")  # load the result of the expression
+        self.emit(SW, "$t0", *self.address(_node))  # store it in the variable
+
+    # pop the value on top of the stack and print it
+    def emit_print_top(self) -> None:
+        self.pop("$a0")  # 2024-02-14, DMW, my emitter was missing this line of assembly!
+        self.emit_print_call()
+
+    # min/max without branches: mask = -(a < b), min = b + ((a - b) & mask), max = a - ((a - b) & mask)
+    def emit_min_max(self, function: str, destination: str, left: str, right: str, mask: str, difference: str):
+        self.emit(SLT, mask, left, right)
+        self.emit(SUBU, mask, "$zero", mask)
+        self.emit(SUBU, difference, left, right)
+        self.emit(AND, difference, difference, mask)
+        if function == "min":
+            self.emit(ADDU, destination, right, difference)
+        else:
+            self.emit(SUBU, destination, left, difference)
+
+    # walk the tree with an explicit stack instead of recursing, so long statement lists and deep expressions
+    # don't reach the recursion limit; an entry is either a node to emit or a (method, arguments...) tuple to
+    # call once the nodes pushed above it have been emitted
+    def emit_node(self, _node: ASTNODE) -> None:
+        pending = [_node]
+        while pending:
+            _node = pending.pop()
+            if type(_node) is tuple:
+                _node[0](*_node[1:])
+                continue
+            if _node.name in ["program", "block_statement", "statements", "statement_list"]:
+                pending.extend(reversed(_node.children))
+            elif _node.name == "statement":
+                for child in reversed(_node.children):
+                    if child.name == "expression" or \
+                            (child.name == "assign" and child.value not in ASSIGNMENT_OPERATORS):
+                        if self.mode == "register":
+                            # the value of the statement is unused; only a division that may trap is kept
+                            if not self.is_float(child) and may_trap(child):
+                                pending.append((self.emit_value, child))
+                            continue
+                        if self.is_float(child):
+                            pending.append((self.emit_float_value, child))  # the value is left in $f0
+                            continue
+                        pending.append((self.emit, ADDI, "$sp", "$sp", 4))  # the value of the statement is unused
+                    pending.append(child)
+            elif _node.name == "print":
+                if self.is_float(_node.children[0]):
+                    self.emit_float_print(_node.children[0])
+                    continue
+                if self.mode == "register":
+                    self.emit(MOVE, "$a0", self.emit_value(_node.children[0]))
+                    self.emit_print_call()
+                    continue
+                pending.append((self.emit_print_top,))
+                pending.extend(reversed(_node.children))
+            elif _node.name == "assign":
+                if _node.value not in ASSIGNMENT_OPERATORS:
+                    # the grammar parses comparisons such as "x > 1" as assign nodes
+                    self.push_binary(pending, _node.value, _node.children[0], _node.children[1])
+                elif self.is_float(_node.children[0]):
+                    self.emit_float_store(_node.children[0], _node.children[1])
+                elif self.mode == "register":
+                    self.emit_store(_node.children[0], self.emit_value(_node.children[1]))
+                else:
+                    pending.append((self.emit_store_top, _node.children[0]))
+                    pending.append(_node.children[1])  # evaluate the expression and place result on stack
+            elif _node.name == "expression":
+                if len(_node.children) == 1 and _node.value is None:
+                    pending.append(_node.children[0])
+                elif len(_node.children) == 1 and _node.value == "abs":
+                    pending.append((self.emit_abs_top,))
+                    pending.append(_node.children[0])
+                elif len(_node.children) == 1:
+                    raise EmitterError("Unsupported intrinsic {}".format(_node.value))
+                elif len(_node.children) == 2:
+                    self.push_binary(pending, _node.value, _node.children[0], _node.children[1])
+                else:
+                    raise EmitterError("Unsupported expression {}".format(_node.value))
+            elif _node.name == "number":
+                self.emit(LI, "$t0", int(_node.value[0]))  # load immediate number, 2.0 is an int where one is needed
+                self.push("$t0")
+            elif _node.name == "name":
+                self.emit(LW, "$t0", *self.address(_node))
+                self.push("$t0")
+            elif _node.name in ["for", "if_statement"]:
+                if self.graph is None:
+                    # lower the statement into a graph of its own, laid out into the code once it is done
+                    self.graph = ControlFlowGraph(self.new_label)
+                    self.outer_code = self.code
+                    self.start_block(self.graph.new_block())
+                    pending.append((self.end_graph,))
+                if _node.name == "for":
+                    self.lower_for(pending, _node)
+                else:
+                    self.lower_if(pending, _node)
             else:
-                for child in _node.children:
-                    self.emit_ast(child)
-                    if len(_node.children) == 3:
-                        print("lw $t0, 8($sp)")  # get the previously saved LHS value off the stack
-                        print("lw $t1, 4($sp)")  # get the previously saved RHS value off the stack
-                        if _node.value == "+":
-                            print("add $t0, $t0, $t1")  # add the values: $t0 = $t0 + $t1
-                        elif _node.value == "-":
-                            self.emit_ast("sub $t0, $t0, $t1")
-                        elif _node.value == "*":
-                            self.emit_asm("mul $t0, $t0, $t1")
-                    #fix this for other binop
-                    print("addi $sp, $sp, 4")  # deallocate space where $t1 was saved on the stack
-                    print("sw $t0, 4($sp)")
+                raise EmitterError("Unknown node name {}".format(_node.name))
+
+    # continue emitting into a block, laid out after the blocks started so far
+    def start_block(self, block: BasicBlock) -> None:
+        self.graph.start(block)
+        self.block = block
+        self.code = block.code
+
+    # end the current block with a jump
+    def jump(self, target: BasicBlock) -> None:
+        self.block.next = target
+
+    # end the current block with a branch to taken when the condition is when, going on to next otherwise
+    def branch(self, condition: ASTNODE, when: bool, taken: BasicBlock, next_block: BasicBlock) -> None:
+        opcode, operands = self.emit_condition(condition)
+        self.block.branch = (opcode if when else INVERTED_BRANCHES[opcode], operands)
+        self.block.taken = taken
+        self.block.next = next_block
+
+    # lay the graph out into the code it was started from
+    def end_graph(self) -> None:
+        self.code = self.outer_code
+        self.graph.linearize(self.code)
+        self.graph = self.block = self.outer_code = None
+
+    # guard, body, step and the test at the bottom, branching back to the top of the body
+    def lower_for(self, pending: list, _node: ASTNODE) -> None:
+        if len(_node.children) == 4:
+            init, condition, step, body = _node.children
+        else:
+            init = step = None
+            condition, body = _node.children
+        body_block = self.graph.new_block()
+        exit_block = self.graph.new_block()
+        pending.append((self.start_block, exit_block))
+        pending.append((self.branch, condition, True, body_block, exit_block))
+        if step is not None:
+            pending.append(step)
+        pending.append(body)
+        pending.append((self.start_block, body_block))
+        pending.append((self.branch, condition, False, exit_block, body_block))
+        if init is not None:
+            pending.append(init)
+
+    # the condition branches around the then block to the else block, or to the join when there is none
+    def lower_if(self, pending: list, _node: ASTNODE) -> None:
+        then_block = self.graph.new_block()
+        join_block = self.graph.new_block()
+        else_block = self.graph.new_block() if len(_node.children) == 3 else join_block
+        self.branch(_node.children[0], False, else_block, then_block)
+        pending.append((self.start_block, join_block))
+        if len(_node.children) == 3:
+            pending.append((self.jump, join_block))
+            pending.append(_node.children[2])
+            pending.append((self.start_block, else_block))
+        pending.append((self.jump, join_block))
+        pending.append(_node.children[1])
+        pending.append((self.start_block, then_block))
+
+    # evaluate a condition, returns the (opcode, operands) of the branch taken when it holds: a comparison
+    # branches on its operands, or on one operand against zero or a constant, without computing a boolean first
+    def emit_condition(self, condition: ASTNODE) -> tuple:
+        condition = unwrap(condition)
+        parts = binary_parts(condition)
+        if parts is None or parts[0] not in BRANCH_OPCODES:
+            return BNEZ, (self.emit_operand(condition),)
+        operator, left, right = parts
+        if self.is_float(left):
+            return self.emit_float_compare(operator, left, right), ()
+        constant = immediate(right)
+        if constant == 0:
+            return ZERO_BRANCH_OPCODES[operator], (self.emit_operand(left),)
+        if constant is not None:
+            return BRANCH_OPCODES[operator], (self.emit_operand(left), constant)
+        if self.mode == "register":
+            return BRANCH_OPCODES[operator], self.emit_operands(left, right)
+        self.emit_node(left)
+        self.emit_node(right)
+        self.pop("$t1")
+        self.pop("$t0")
+        return BRANCH_OPCODES[operator], ("$t0", "$t1")
+
+    # evaluate an int expression into a register
+    def emit_operand(self, _node: ASTNODE) -> str:
+        if self.mode == "register":
+            return self.emit_value(_node)
+        self.emit_node(_node)
+        self.pop("$t0")
+        return "$t0"
+
+    # evaluate both operands onto the stack, then replace them with the result
+    def push_binary(self, pending: list, operator: str, left: ASTNODE, right: ASTNODE) -> None:
+        if operator in FLOAT_COMPARISONS and self.is_float(left):
+            pending.append((self.emit_float_comparison_top, operator, left, right))
+            return
+        if operator in SHIFT_OPERATORS:
+            if operator == "*" and power_of_two(right) is None and power_of_two(left) is not None:
+                left, right = right, left
+            if power_of_two(right) is not None:
+                pending.append((self.emit_shift_top, operator, power_of_two(right)))
+                pending.append(left)
+                return
+        if operator not in BINARY_OPCODES and operator not in ("min", "max"):
+            raise EmitterError("Unknown operator {}".format(operator))
+        pending.append((self.emit_binary_top, operator))
+        pending.append(right)
+        pending.append(left)
+
+    # ----------------------------------------------------------------------------------------------------
+    # ssa mode
+
+    # build the SSA form of a program, run its passes and lower it
+    def emit_ssa(self, ast: ASTNODE) -> None:
+        if self.stats is not None:
+            self.stats.begin("ssa")
+        try:
+            program, self.ssa_timings = build_ssa(ast, self.types, self.layout)
+        except SSAError as error:
+            raise EmitterError(str(error)) from error
+        if self.stats is not None:
+            self.stats.end()
+        start = time.perf_counter()
+        self.lower_ssa(program)
+        self.ssa_timings.append(("lower", time.perf_counter() - start, 0, program.value_count()))
+
+    # allocate the values, then emit the blocks into a ControlFlowGraph laid out into the code
+    def lower_ssa(self, program: SSAProgram) -> None:
+        self.ssa = program
+        fused = self.fused_comparisons(program)
+        live_in, live_out = ssa_liveness(program, fused)
+        groups = coalesce(program, *ssa_intervals(program, fused, live_in, live_out))
+        spilled = {INTEGER: [], FLOAT: []}
+        for value_type, registers in ((INTEGER, VARIABLE_REGISTERS), (FLOAT, SSA_FLOAT_REGISTERS)):
+            intervals = {id(interval): interval for value, interval in groups.items()
+                         if program.types[value] == value_type}
+            intervals = sorted(intervals.values(), key=lambda item: (item.start, item.end))
+            LinearScanAllocator(registers).scan(intervals)
+            for interval in intervals:
+                if interval.register is None:
+                    interval.register = "spill_{:05d}".format(len(spilled[INTEGER]) + len(spilled[FLOAT]))
+                    spilled[value_type].append(interval.register)
+        self.locations = {value: interval.register for value, interval in groups.items()}
+        # the doubles first, so they stay 8 byte aligned
+        self.spill_lines = ["{}:    .double 0.0".format(label) for label in spilled[FLOAT]] + \
+                           ["{}:    .word 0".format(label) for label in spilled[INTEGER]]
+        self.graph = ControlFlowGraph(self.new_label)
+        self.outer_code = self.code
+        basic_blocks = {block: self.graph.new_block() for block in program.blocks}
+        for block in program.blocks:
+            self.start_block(basic_blocks[block])
+            for value in block.values:
+                if value not in fused:
+                    self.emit_ssa_value(value)
+            split = self.split_edges(block, live_in)
+            self.emit_phi_copies(block, [successor for successor in block.successors() if successor not in split])
+            end = self.block
+            if block.condition is not None:
+                end.branch = self.emit_ssa_condition(block.condition, fused)
+                end.taken = basic_blocks[block.taken]
+            if block.next is not None:
+                end.next = basic_blocks[block.next]
+            for successor in split:
+                # the copies go in a block of their own on the edge, laid out right after
+                edge = self.graph.new_block()
+                self.start_block(edge)
+                self.emit_phi_copies(block, [successor])
+                edge.next = basic_blocks[successor]
+                if successor is block.taken:
+                    end.taken = edge
                 else:
-                    print("li, $t0, {}".format(_node.value[0]))
-                    # allocate then push - for current output
-                    print("addi $sp, $sp, -4")  # Decrease stack pointer to allocate 4 bytes
-                    print("sw $t0, 0($sp)")  # Store the value at the new top of the stack
-        elif _node.name == "number":
-            print(f"li $t0, {_node.value[0]}")  # load immediate number
-            print("addi $sp, $sp, -4")  # adjust stack
-            print("sw $t0, 4($sp)")  # push onto stack
-        elif _node.name == "for":
-            pass
-        elif _node.name == "name":
-            pass
+                    end.next = edge
+        self.end_graph()
+
+    # the successors of a branching block whose phi copies would overwrite a value live on the other edge
+    def split_edges(self, block: SSABlock, live_in: dict) -> list:
+        successors = block.successors()
+        if len(successors) < 2:
+            return []
+        split = []
+        for successor, other in ((successors[0], successors[1]), (successors[1], successors[0])):
+            written = {self.locations[phi] for phi in successor.phis}
+            if not written:
+                continue
+            index = other.preds.index(block)
+            read = set(live_in[other])
+            read.update(self.ssa.operands[phi][index] for phi in other.phis)
+            if any(self.locations.get(value) in written for value in read):
+                split.append(successor)
+        return split
+
+    # the comparisons only used by the branch ending their block, which compile to a compare-and-branch
+    @staticmethod
+    def fused_comparisons(program: SSAProgram) -> set:
+        counts = {}
+        for block in program.blocks:
+            for value in list(block.phis) + list(block.values):
+                for operand in program.uses(value):
+                    counts[operand] = counts.get(operand, 0) + 1
+        fused = set()
+        for block in program.blocks:
+            condition = block.condition
+            if condition is not None and program.opcodes[condition] in COMPARISONS and \
+                    condition not in counts and condition in block.values:
+                fused.add(condition)
+        return fused
+
+    def ssa_constant(self, value: int):
+        return self.ssa.operands[value][0] if self.ssa.opcodes[value] == OP_CONST else None
+
+    # the register holding a value: its own, or scratch loaded from its spill word or with the constant
+    def ssa_operand(self, value: int, scratch: str) -> str:
+        is_float = self.ssa.types[value] == FLOAT
+        constant = self.ssa_constant(value)
+        if constant is not None:
+            if is_float:
+                self.emit(L_D, scratch, 0, self.float_constant(constant))
+            else:
+                self.emit(LI, scratch, constant)
+            return scratch
+        location = self.locations[value]
+        if location[0] == "$":
+            return location
+        self.emit(L_D if is_float else LW, scratch, 0, location)
+        return scratch
+
+    # the label of the .double holding a float64 constant
+    def float_constant(self, value: float) -> str:
+        label = self.float_constants.get(value)
+        if label is None:
+            label = self.float_constants[value] = "double_{:05d}".format(len(self.float_constants))
+        return label
+
+    def emit_ssa_value(self, value: int) -> None:
+        program = self.ssa
+        opcode = program.opcodes[value]
+        operands = program.operands[value]
+        if opcode == OP_CONST:
+            return  # loaded where it is used
+        if opcode == OP_PRINT:
+            if program.types[operands[0]] == FLOAT:
+                self.emit(MOV_D, "$f12", self.ssa_operand(operands[0], "$f0"))
+                self.emit_float_print_call()
+            else:
+                register = self.ssa_operand(operands[0], "$a0")
+                if register != "$a0":
+                    self.emit(MOVE, "$a0", register)
+                self.emit_print_call()
+            return
+        is_float = program.types[value] == FLOAT
+        location = self.locations[value]
+        destination = location if location[0] == "$" else ("$f4" if is_float else "$t2")
+        operator = OPERATORS[opcode]
+        if opcode == OP_ABS:
+            source = self.ssa_operand(operands[0], "$f0" if is_float else "$t0")
+            self.emit(ABS_D if is_float else ABS, destination, source)
+        elif is_float:
+            left, right = self.ssa_operand(operands[0], "$f0"), self.ssa_operand(operands[1], "$f2")
+            if operator in FLOAT_OPCODES:
+                self.emit(FLOAT_OPCODES[operator], destination, left, right)
+            else:
+                self.emit_float_min_max(operator, destination, left, right)
+        elif opcode in COMPARISONS and program.types[operands[0]] == FLOAT:
+            self.emit_flag(self.emit_ssa_float_compare(operator, operands[0], operands[1]), destination)
+        else:
+            self.emit_ssa_int(operator, destination, operands[0], operands[1])
+        if location[0] != "$":
+            self.emit(S_D if is_float else SW, destination, 0, location)
+
+    # an int operator, with an immediate operand or shifts where the constants allow
+    def emit_ssa_int(self, operator: str, destination: str, left: int, right: int) -> None:
+        if operator in ("+", "*") and self.ssa_constant(left) is not None and self.ssa_constant(right) is None:
+            left, right = right, left
+        constant = self.ssa_constant(right)
+        if operator in IMMEDIATE_OPERATORS and constant is not None and -32767 <= constant <= 32767:
+            self.emit(ADDIU, destination, self.ssa_operand(left, "$t0"), constant if operator == "+" else -constant)
+            return
+        if operator in SHIFT_OPERATORS and constant is not None and constant > 1 and constant & (constant - 1) == 0:
+            self.emit_shift(operator, destination, self.ssa_operand(left, "$t0"), constant.bit_length() - 1, "$v1")
+            return
+        left_register, right_register = self.ssa_operand(left, "$t0"), self.ssa_operand(right, "$t1")
+        if operator in BINARY_OPCODES:
+            self.emit(BINARY_OPCODES[operator], destination, left_register, right_register)
+        else:
+            self.emit_min_max(operator, destination, left_register, right_register, "$v1", "$a1")
+
+    # set the FPU condition flag from two float64 values, returns the branch taken when the comparison holds
+    def emit_ssa_float_compare(self, operator: str, left: int, right: int) -> int:
+        compare, swap, when_set = FLOAT_COMPARISONS[operator]
+        left_register, right_register = self.ssa_operand(left, "$f0"), self.ssa_operand(right, "$f2")
+        if swap:
+            left_register, right_register = right_register, left_register
+        self.emit(compare, left_register, right_register)
+        return BC1T if when_set else BC1F
+
+    # the (opcode, operands) of the branch taken when a condition holds
+    def emit_ssa_condition(self, condition: int, fused: set) -> tuple:
+        if condition not in fused:
+            return BNEZ, (self.ssa_operand(condition, "$t0"),)
+        left, right = self.ssa.operands[condition]
+        operator = OPERATORS[self.ssa.opcodes[condition]]
+        if self.ssa.types[left] == FLOAT:
+            return self.emit_ssa_float_compare(operator, left, right), ()
+        constant = self.ssa_constant(right)
+        if constant == 0:
+            return ZERO_BRANCH_OPCODES[operator], (self.ssa_operand(left, "$t0"),)
+        if constant is not None and -32767 <= constant <= 32767:
+            return BRANCH_OPCODES[operator], (self.ssa_operand(left, "$t0"), constant)
+        return BRANCH_OPCODES[operator], (self.ssa_operand(left, "$t0"), self.ssa_operand(right, "$t1"))
+
+    # the phis of the successors of a block get their operands from it at its end, before the branch
+    def emit_phi_copies(self, block: SSABlock, successors: list) -> None:
+        copies = {INTEGER: [], FLOAT: []}
+        for successor in successors:
+            index = successor.preds.index(block)
+            for phi in successor.phis:
+                copies[self.ssa.types[phi]].append((self.locations[phi], self.ssa.operands[phi][index]))
+        for value_type, moves in copies.items():
+            if moves:
+                self.emit_parallel_copy(moves, value_type)
+
+    # copies that all read their sources before any destination is written: a move whose destination no other
+    # move reads goes first, a cycle is broken through a temporary; constants are loaded last
+    def emit_parallel_copy(self, copies: list, value_type: int) -> None:
+        moves = {}
+        constants = []
+        for destination, source in copies:
+            if self.ssa_constant(source) is not None:
+                constants.append((destination, source))
+            elif self.locations[source] != destination:
+                moves[destination] = self.locations[source]
+        temporary = COPY_TEMPORARIES[value_type][0]
+        while moves:
+            sources = set(moves.values())
+            ready = [destination for destination in moves if destination not in sources]
+            if ready:
+                for destination in ready:
+                    self.emit_move(destination, moves.pop(destination), value_type)
+                continue
+            destination = next(iter(moves))
+            self.emit_move(temporary, destination, value_type)
+            for other, source in moves.items():
+                if source == destination:
+                    moves[other] = temporary
+        for destination, source in constants:
+            register = self.ssa_operand(source, destination if destination[0] == "$" else temporary)
+            if destination[0] != "$":
+                self.emit_move(destination, register, value_type)
+
+    # a move between two registers or spill words
+    def emit_move(self, destination: str, source: str, value_type: int) -> None:
+        is_float = value_type == FLOAT
+        if source[0] != "$":
+            register = destination if destination[0] == "$" else COPY_TEMPORARIES[value_type][1]
+            self.emit(L_D if is_float else LW, register, 0, source)
+            source = register
+        if destination[0] == "$":
+            if destination != source:
+                self.emit(MOV_D if is_float else MOVE, destination, source)
         else:
-            raise Exception("Unknown node name {}".format(_node.name))
+            self.emit(S_D if is_float else SW, source, 0, destination)
+
+
+# ssa mode: the values live into and out of each block that live in a register or a spill word, from the usual
+# backward data flow; a phi operand is live at the end of its predecessor
+def ssa_liveness(program: SSAProgram, fused: set) -> tuple:
+    opcodes = program.opcodes
+    operands = program.operands
+
+    def allocated(value: int) -> bool:
+        return opcodes[value] != OP_CONST and value not in fused
+
+    # the values a block reads before any definition in it (an SSA value is defined before its uses in a block)
+    upward = {}
+    phi_operands = {block: set() for block in program.blocks}
+    defined = {}
+    for block in program.blocks:
+        defined[block] = set(block.phis) | set(block.values)
+        used = set()
+        for value in block.values:
+            for operand in program.uses(value):
+                if allocated(operand):
+                    used.add(operand)
+                elif operand in fused:
+                    used.update(operand_ for operand_ in operands[operand] if allocated(operand_))
+        used.update(condition_operands(program, block, fused, allocated))
+        upward[block] = used - defined[block]
+        for phi in block.phis:
+            for pred, operand in zip(block.preds, operands[phi]):
+                if allocated(operand):
+                    phi_operands[pred].add(operand)
+    live_in = {block: set() for block in program.blocks}
+    live_out = {block: set() for block in program.blocks}
+    changed = True
+    while changed:
+        changed = False
+        for block in reversed(program.blocks):
+            out = set(phi_operands[block])
+            for successor in block.successors():
+                out |= live_in[successor]
+            into = upward[block] | (out - defined[block])
+            if len(out) != len(live_out[block]) or len(into) != len(live_in[block]):
+                live_out[block] = out
+                live_in[block] = into
+                changed = True
+    return live_in, live_out
+
+
+# ssa mode: the live interval of every value that lives in a register or a spill word, over positions numbering
+# the blocks in layout order: a block's start (where its phis are defined), each of its values, and its end
+# (where the phis of its successors are copied and its branch reads its condition). Returns the intervals,
+# the phi copies as (phi, operand, position of the end of the predecessor, its loop depth) and the positions
+# of the starts and ends of the blocks
+def ssa_intervals(program: SSAProgram, fused: set, live_in: dict, live_out: dict) -> tuple:
+    opcodes = program.opcodes
+    operands = program.operands
+
+    def allocated(value: int) -> bool:
+        return opcodes[value] != OP_CONST and value not in fused
+
+    intervals = {}
+
+    def touch(value: int, position: int, weight: int) -> None:
+        interval = intervals.get(value)
+        if interval is None:
+            interval = intervals[value] = Interval(value, position)
+        interval.start = min(interval.start, position)
+        interval.end = max(interval.end, position)
+        interval.weight += weight
+
+    copies = []
+    boundaries = set()
+    position = 0
+    for block in program.blocks:
+        weight = 10 ** block.depth
+        boundaries.add(position)
+        for value in block.phis:
+            touch(value, position, weight)
+        for value in live_in[block]:
+            touch(value, position, 0)
+        position += 1
+        for value in block.values:
+            if allocated(value):
+                if opcodes[value] != OP_PRINT:
+                    touch(value, position, weight)
+                for operand in operands[value]:
+                    if allocated(operand):
+                        touch(operand, position, weight)
+            position += 1
+        for value in live_out[block]:
+            touch(value, position, 0)
+        for value in condition_operands(program, block, fused, allocated):
+            touch(value, position, weight)
+        for successor in block.successors():
+            index = successor.preds.index(block)
+            for phi in successor.phis:
+                copies.append((phi, operands[phi][index], position, block.depth))
+        boundaries.add(position)
+        position += 1
+    return intervals, copies, boundaries
+
+
+# ssa mode: give a phi and an operand of it one location where their intervals don't meet, so the copy between
+# them goes away; the copies in the deepest loops are tried first. A phi whose operand is in another group is
+# written at the end of that predecessor, which stretches its group's interval there. Values may only meet at
+# the position of a value, which reads its operands before it writes its result, not at the start or end of
+# a block. Returns value -> the Interval of its group
+def coalesce(program: SSAProgram, intervals: dict, copies: list, boundaries: set) -> dict:
+    group_of = {value: [value] for value in intervals}  # value -> the list of members of its group
+    incoming = {}                                       # phi -> [(operand, position)]
+    for phi, operand, position, _ in copies:
+        incoming.setdefault(phi, []).append((operand, position))
+
+    # the (start, end) of members that share a location with the values in inside
+    def extent(members: list, inside: set) -> tuple:
+        start = min(intervals[value].start for value in members)
+        end = max(intervals[value].end for value in members)
+        for value in members:
+            for operand, position in incoming.get(value, ()):
+                if operand not in inside:
+                    start = min(start, position)
+                    end = max(end, position)
+        return start, end
+
+    def apart(first: tuple, second: tuple) -> bool:
+        if first[1] > second[1]:
+            first, second = second, first
+        return first[1] < second[0] or (first[1] == second[0] and first[1] not in boundaries)
+
+    for phi, operand, _, _ in sorted(copies, key=lambda copy: -copy[3]):
+        first, second = group_of[phi], group_of.get(operand)
+        if second is None or first is second:
+            continue
+        inside = set(first) | set(second)
+        if apart(extent(first, inside), extent(second, inside)):
+            first.extend(second)
+            for value in second:
+                group_of[value] = first
+    groups = {}
+    for value, members in group_of.items():
+        interval = groups.get(id(members))
+        if interval is None:
+            start, end = extent(members, set(members))
+            interval = groups[id(members)] = Interval(members[0], start)
+            interval.end = end
+            interval.weight = sum(intervals[member].weight for member in members)
+        groups[value] = interval
+    return {value: groups[id(members)] for value, members in group_of.items()}
+
+
+# does an expression hold an int division or remainder by something other than a nonzero constant, which
+# traps at run time when the divisor is zero
+def may_trap(_node: ASTNODE) -> bool:
+    pending = [_node]
+    while pending:
+        _node = pending.pop()
+        if _node.name in ("expression", "assign") and _node.value in ("/", "%") and len(_node.children) == 2 and \
+                not nonzero_constant(_node.children[1]):
+            return True
+        pending.extend(_node.children)
+    return False
+
+
+# the allocated values a block's branch reads: its condition, or the operands of the comparison fused into it
+def condition_operands(program: SSAProgram, block: SSABlock, fused: set, allocated) -> list:
+    condition = block.condition
+    if condition is None:
+        return []
+    if condition in fused:
+        return [operand for operand in program.operands[condition] if allocated(operand)]
+    return [condition] if allocated(condition) else []
+
+
+# the odd register holding the other half of the double in an even FPU register
+def odd_half(register: str) -> str:
+    return "$f{}".format(int(register[2:]) + 1)
+
+
+# compare instructions/sec of the original print() path against the buffered sinks
+if __name__ == "__main__":
+    import contextlib
+    import os
+    import time
+    import go_grammar
+
+    def benchmark(statements: int = 20000, repeat: int = 3, peephole: bool = False) -> None:
+        source = "\n".join("var v{} = {}\nfmt.Println({})".format(i % 50, i, i) for i in range(statements))
+        ast = go_grammar.parser.parse(source)
+        instructions = sum(1 for _ in MIPS32Emitter(peephole=peephole).iter_lines(ast))
+
+        def run_print():
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                MIPS32Emitter(PrintSink(), peephole=peephole).emit_program(ast)
+
+        def run_buffer():
+            MIPS32Emitter(BufferSink(), peephole=peephole).emit_program(ast)
+
+        def run_file():
+            with FileSink(os.devnull) as sink:
+                MIPS32Emitter(sink, peephole=peephole).emit_program(ast)
+
+        def run_stream():
+            for _ in MIPS32Emitter(peephole=peephole).iter_lines(ast):
+                pass
+
+        print("{} statements, {} lines of assembly, peephole={}".format(statements, instructions, peephole))
+        for label, run in [("print()", run_print), ("BufferSink", run_buffer),
+                           ("FileSink", run_file), ("iter_lines", run_stream)]:
+            best = min(timed(run) for _ in range(repeat))
+            print("{:>12}: {:8.3f}s  {:12,.0f} instructions/sec".format(label, best, instructions / best))
+
+    def timed(run) -> float:
+        start = time.perf_counter()
+        run()
+        return time.perf_counter() - start
+
+    benchmark(peephole=False)
+    benchmark(peephole=True)
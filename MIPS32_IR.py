@@ -0,0 +1,194 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Compact instruction IR for the MIPS32 emitter: opcodes in an array, operands as tuples.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - MIPS32 instruction set: https://www.cs.cmu.edu/afs/cs/academic/class/15740-f97/public/doc/mips-isa.pdf
+  - Memory operands are (register, offset, base); a base starting with '$' is a register, anything else
+    is a data segment label.
+  - Go's int arithmetic wraps around, so the + and - of a program are addu, subu and addiu, which don't trap on
+    overflow; addi is kept for moving the stack pointer, which never overflows.
+
+"""
+from array import array
+
+# operand layouts, used for rendering and for the def/use information needed by the optimizer
+FMT_R3 = 0        # op rd, rs, rt
+FMT_RI = 1        # op rd, rs, imm
+FMT_LOAD_IMM = 2  # op rd, imm / label
+FMT_MOVE = 3      # op rd, rs
+FMT_LOAD = 4      # op rt, offset(base)
+FMT_STORE = 5     # op rt, offset(base)
+FMT_SYSCALL = 6   # op
+FMT_LABEL = 7     # name:
+FMT_BRANCH2 = 8   # op rs, rt, label
+FMT_BRANCH1 = 9   # op rs, label
+FMT_JUMP = 10     # op label
+# double precision floating point; kept apart from the layouts above so the optimizer leaves them alone
+FMT_FLOAT_R3 = 11       # op fd, fs, ft
+FMT_FLOAT_MOVE = 12     # op fd, fs
+FMT_FLOAT_COMPARE = 13  # op fs, ft - sets the FPU condition flag
+FMT_FLOAT_LOAD = 14     # op ft, offset(base)
+FMT_FLOAT_STORE = 15    # op ft, offset(base)
+FMT_FLAG_BRANCH = 16    # op label - branches on the FPU condition flag
+
+# opcode number -> (mnemonic, layout); the opcode constants below are indexes into this table
+OPCODES = [
+    ("li", FMT_LOAD_IMM), ("la", FMT_LOAD_IMM), ("move", FMT_MOVE), ("abs", FMT_MOVE),
+    ("lw", FMT_LOAD), ("sw", FMT_STORE),
+    ("add", FMT_R3), ("sub", FMT_R3), ("mul", FMT_R3), ("div", FMT_R3), ("rem", FMT_R3), ("and", FMT_R3),
+    ("slt", FMT_R3), ("sle", FMT_R3), ("sgt", FMT_R3), ("sge", FMT_R3), ("seq", FMT_R3), ("sne", FMT_R3),
+    ("addi", FMT_RI), ("syscall", FMT_SYSCALL), ("label", FMT_LABEL),
+    ("beq", FMT_BRANCH2), ("bne", FMT_BRANCH2), ("blt", FMT_BRANCH2),
+    ("ble", FMT_BRANCH2), ("bgt", FMT_BRANCH2), ("bge", FMT_BRANCH2),
+    ("beqz", FMT_BRANCH1), ("bnez", FMT_BRANCH1), ("blez", FMT_BRANCH1),
+    ("bgtz", FMT_BRANCH1), ("bltz", FMT_BRANCH1), ("bgez", FMT_BRANCH1),
+    ("j", FMT_JUMP),
+    ("l.d", FMT_FLOAT_LOAD), ("s.d", FMT_FLOAT_STORE), ("lwc1", FMT_FLOAT_LOAD), ("swc1", FMT_FLOAT_STORE),
+    ("add.d", FMT_FLOAT_R3), ("sub.d", FMT_FLOAT_R3), ("mul.d", FMT_FLOAT_R3), ("div.d", FMT_FLOAT_R3),
+    ("abs.d", FMT_FLOAT_MOVE), ("mov.d", FMT_FLOAT_MOVE),
+    ("c.eq.d", FMT_FLOAT_COMPARE), ("c.lt.d", FMT_FLOAT_COMPARE), ("c.le.d", FMT_FLOAT_COMPARE),
+    ("bc1t", FMT_FLAG_BRANCH), ("bc1f", FMT_FLAG_BRANCH),
+    ("sll", FMT_RI), ("sra", FMT_RI), ("srl", FMT_RI),
+    ("addu", FMT_R3), ("subu", FMT_R3), ("addiu", FMT_RI),
+]
+
+(LI, LA, MOVE, ABS, LW, SW,
+ ADD, SUB, MUL, DIV, REM, AND,
+ SLT, SLE, SGT, SGE, SEQ, SNE,
+ ADDI, SYSCALL, LABEL,
+ BEQ, BNE, BLT, BLE, BGT, BGE,
+ BEQZ, BNEZ, BLEZ, BGTZ, BLTZ, BGEZ,
+ J,
+ L_D, S_D, LWC1, SWC1,
+ ADD_D, SUB_D, MUL_D, DIV_D,
+ ABS_D, MOV_D,
+ C_EQ_D, C_LT_D, C_LE_D,
+ BC1T, BC1F,
+ SLL, SRA, SRL,
+ ADDU, SUBU, ADDIU) = range(len(OPCODES))
+
+MNEMONICS = [mnemonic for mnemonic, _ in OPCODES]
+LAYOUTS = bytes(layout for _, layout in OPCODES)
+
+# registers the syscall instruction reads and writes
+SYSCALL_USES = ("$v0", "$a0", "$a1", "$f12")
+SYSCALL_DEFS = ("$v0",)
+
+# the FPU condition flag, as a register name for def/use information
+CONDITION_FLAG = "$fcc"
+
+# binary operators of the AST mapped to the instruction computing them
+BINARY_OPCODES = {
+    "+": ADDU, "-": SUBU, "*": MUL, "/": DIV, "%": REM,
+    "<": SLT, "<=": SLE, ">": SGT, ">=": SGE, "==": SEQ, "!=": SNE,
+}
+FLOAT_OPCODES = {"+": ADD_D, "-": SUB_D, "*": MUL_D, "/": DIV_D}
+
+
+# format a memory operand
+def address(offset: int, base: str) -> str:
+    if base[0] == "$":
+        return "{}({})".format(offset, base)
+    if offset:
+        return "{}+{}".format(base, offset)
+    return base
+
+
+# render one instruction as a line of assembly
+def render(opcode: int, operands: tuple) -> str:
+    layout = LAYOUTS[opcode]
+    mnemonic = MNEMONICS[opcode]
+    if layout == FMT_R3 or layout == FMT_RI or layout == FMT_BRANCH2 or layout == FMT_FLOAT_R3:
+        return "{} {}, {}, {}".format(mnemonic, *operands)
+    if layout == FMT_LOAD or layout == FMT_STORE or layout == FMT_FLOAT_LOAD or layout == FMT_FLOAT_STORE:
+        return "{} {}, {}".format(mnemonic, operands[0], address(operands[1], operands[2]))
+    if layout == FMT_LOAD_IMM or layout == FMT_MOVE or layout == FMT_BRANCH1 or layout == FMT_FLOAT_MOVE or \
+            layout == FMT_FLOAT_COMPARE:
+        return "{} {}, {}".format(mnemonic, *operands)
+    if layout == FMT_LABEL:
+        return "{}:".format(operands[0])
+    if layout == FMT_JUMP or layout == FMT_FLAG_BRANCH:
+        return "{} {}".format(mnemonic, operands[0])
+    return mnemonic
+
+
+# the registers an instruction writes and reads
+def defs_uses(opcode: int, operands: tuple) -> tuple:
+    layout = LAYOUTS[opcode]
+    if layout == FMT_R3:
+        return (operands[0],), (operands[1], operands[2])
+    if layout == FMT_RI or layout == FMT_MOVE:
+        return (operands[0],), (operands[1],)
+    if layout == FMT_LOAD_IMM:
+        return (operands[0],), ()
+    if layout == FMT_LOAD:
+        return (operands[0],), ((operands[2],) if operands[2][0] == "$" else ())
+    if layout == FMT_STORE:
+        return (), ((operands[0], operands[2]) if operands[2][0] == "$" else (operands[0],))
+    if layout == FMT_SYSCALL:
+        return SYSCALL_DEFS, SYSCALL_USES
+    if layout == FMT_BRANCH2:
+        return (), tuple(operand for operand in operands[:2] if isinstance(operand, str))
+    if layout == FMT_BRANCH1:
+        return (), (operands[0],)
+    if layout == FMT_FLOAT_R3:
+        return (operands[0],), (operands[1], operands[2])
+    if layout == FMT_FLOAT_MOVE:
+        return (operands[0],), (operands[1],)
+    if layout == FMT_FLOAT_COMPARE:
+        return (CONDITION_FLAG,), (operands[0], operands[1])
+    if layout == FMT_FLOAT_LOAD:
+        return (operands[0],), ((operands[2],) if operands[2][0] == "$" else ())
+    if layout == FMT_FLOAT_STORE:
+        return (), ((operands[0], operands[2]) if operands[2][0] == "$" else (operands[0],))
+    if layout == FMT_FLAG_BRANCH:
+        return (), (CONDITION_FLAG,)
+    return (), ()
+
+
+# a sequence of instructions; opcodes are kept in a byte array parallel to the operand tuples
+class InstructionList:
+    __slots__ = ("opcodes", "operands")
+
+    def __init__(self) -> None:
+        self.opcodes = array("B")
+        self.operands = []
+
+    def append(self, opcode: int, *operands) -> None:
+        self.opcodes.append(opcode)
+        self.operands.append(operands)
+
+    def extend(self, other: "InstructionList") -> None:
+        self.opcodes.extend(other.opcodes)
+        self.operands.extend(other.operands)
+
+    def clear(self) -> None:
+        self.opcodes = array("B")
+        self.operands = []
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    def __iter__(self):
+        return zip(self.opcodes, self.operands)
+
+    def lines(self) -> list:
+        return [render(opcode, operands) for opcode, operands in zip(self.opcodes, self.operands)]
+
+
+if __name__ == "__main__":
+    code = InstructionList()
+    code.append(LABEL, "main")
+    code.append(LI, "$t0", 17)
+    code.append(ADDI, "$sp", "$sp", -4)
+    code.append(SW, "$t0", 4, "$sp")
+    code.append(LW, "$a0", 4, "$sp")
+    code.append(SW, "$a0", 0, "x_00000")
+    code.append(SYSCALL)
+    print("\n".join(code.lines()))
+    for opcode, operands in code:
+        print(MNEMONICS[opcode], defs_uses(opcode, operands))
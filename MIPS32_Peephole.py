@@ -0,0 +1,235 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Peephole optimizer over the MIPS32 instruction IR, run before the emitter renders text.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - The emitter is a stack machine: $sp points at the next free word and the top of the stack is 4($sp).
+  - Each pass works on regions of straight-line code; labels, branches, jumps and any instruction that
+    uses $sp other than "addi $sp, $sp, imm" or a $sp-relative lw/sw end a region.
+  - Passes, repeated until the code stops shrinking:
+      1. sink every "addi $sp" to the end of its region, folding them together and rebasing the
+         $sp-relative offsets in between
+      2. forward stored values to later loads of the same slot (push/pop pairs become a move, or vanish)
+      3. remove stores to stack slots that are popped before they are read
+      4. remove loads and other pure instructions whose result is overwritten before it is read; div and
+         rem stay, they trap on a zero divisor
+      5. compute a value straight into the destination of the move that copies it ("li $t0, 3" followed
+         by "move $t1, $t0" becomes "li $t1, 3" when $t0 is overwritten before it is read again)
+  - System calls are assumed not to read or write the stack or the data segment.
+  - Floating point instructions are left as they are; those addressing the stack end a region, like any
+    other instruction using $sp, so the passes never see a stack slot written or read as a float.
+  - Variables are addressed by label or relative to $gp, which main sets once, and every variable has a word
+    of its own, so these addresses are known exactly like the $sp-relative ones and never alias the stack.
+
+"""
+from MIPS32_IR import *
+
+# layouts that always end a region
+BARRIER_LAYOUTS = (FMT_LABEL, FMT_BRANCH1, FMT_BRANCH2, FMT_JUMP, FMT_FLAG_BRANCH)
+
+# layouts of instructions without side effects other than writing their destination register
+PURE_LAYOUTS = (FMT_R3, FMT_RI, FMT_LOAD_IMM, FMT_MOVE, FMT_LOAD)
+
+# instructions of a pure layout that trap, on a zero divisor; they are never removed
+TRAPPING_OPCODES = (DIV, REM)
+
+
+# a memory operand whose address is known: a stack slot, a $gp-relative variable or a label
+def is_known_address(base: str) -> bool:
+    return base == "$sp" or base == "$gp" or base[0] != "$"
+
+
+def is_stack_adjustment(opcode: int, operands: tuple) -> bool:
+    return opcode == ADDI and operands[0] == "$sp" and operands[1] == "$sp"
+
+
+def is_barrier(opcode: int, operands: tuple) -> bool:
+    layout = LAYOUTS[opcode]
+    if layout in BARRIER_LAYOUTS:
+        return True
+    if is_stack_adjustment(opcode, operands):
+        return False
+    if layout == FMT_LOAD or layout == FMT_STORE:
+        return operands[0] == "$sp"
+    defs, uses = defs_uses(opcode, operands)
+    return "$sp" in defs or "$sp" in uses
+
+
+# split instructions into regions of straight-line code and the barriers between them
+def split_regions(instructions) -> tuple:
+    regions = []
+    barriers = []
+    region = []
+    for opcode, operands in instructions:
+        if is_barrier(opcode, operands):
+            regions.append(region)
+            barriers.append((opcode, operands))
+            region = []
+        else:
+            region.append((opcode, operands))
+    regions.append(region)
+    return regions, barriers
+
+
+# pass 1: move every stack pointer adjustment to the end of the region and fold them into one
+def sink_stack_adjustments(region: list) -> list:
+    result = []
+    pending = 0
+    for opcode, operands in region:
+        if is_stack_adjustment(opcode, operands):
+            pending += operands[2]
+        elif pending and (opcode == LW or opcode == SW) and operands[2] == "$sp":
+            result.append((opcode, (operands[0], operands[1] + pending, "$sp")))
+        else:
+            result.append((opcode, operands))
+    if pending:
+        result.append((ADDI, ("$sp", "$sp", pending)))
+    return result
+
+
+# pass 2: replace a load from a stack slot or variable with the register that was last stored there
+def forward_stores(region: list) -> list:
+    result = []
+    memory = {}  # (base, offset) -> register holding the value in memory
+    for opcode, operands in region:
+        if opcode == LW and is_known_address(operands[2]):
+            key = (operands[2], operands[1])
+            source = memory.get(key)
+            if source is not None:
+                if source != operands[0]:
+                    forget(memory, operands[0])
+                    result.append((MOVE, (operands[0], source)))
+                continue
+            forget(memory, operands[0])
+            memory[key] = operands[0]
+        elif opcode == SW:
+            if is_known_address(operands[2]):
+                memory[(operands[2], operands[1])] = operands[0]
+            else:
+                memory.clear()  # unknown address, it may alias anything
+        else:
+            for register in defs_uses(opcode, operands)[0]:
+                forget(memory, register)
+        result.append((opcode, operands))
+    return result
+
+
+# remove the memory entries held in a register that is about to be overwritten
+def forget(memory: dict, register: str) -> None:
+    stale = [key for key, held in memory.items() if held == register]
+    for key in stale:
+        del memory[key]
+
+
+# pass 3: remove stores to stack slots that are overwritten or popped before they are read
+def remove_dead_stores(region: list) -> list:
+    # slots at or below the stack pointer left at the end of the region are free, everything above is live
+    final_adjustment = 0
+    if region and is_stack_adjustment(*region[-1]):
+        final_adjustment = region[-1][1][2]
+    read = set()     # slots read further on, before being overwritten
+    killed = set()   # slots overwritten further on, before being read
+    everything_live = False
+    result = []
+    for opcode, operands in reversed(region):
+        if opcode == LW:
+            if operands[2] == "$sp":
+                read.add(operands[1])
+                killed.discard(operands[1])
+            elif not is_known_address(operands[2]):
+                everything_live = True
+        elif opcode == SW and operands[2] == "$sp":
+            offset = operands[1]
+            live = everything_live or offset in read or (offset not in killed and offset > final_adjustment)
+            if not live:
+                continue
+            killed.add(offset)
+            read.discard(offset)
+        result.append((opcode, operands))
+    result.reverse()
+    return result
+
+
+# pass 4: remove loads, moves and arithmetic whose destination is overwritten before it is read
+def remove_dead_definitions(region: list) -> list:
+    dead = set()
+    result = []
+    for opcode, operands in reversed(region):
+        defs, uses = defs_uses(opcode, operands)
+        if opcode == MOVE and operands[0] == operands[1]:
+            continue
+        if LAYOUTS[opcode] in PURE_LAYOUTS and opcode not in TRAPPING_OPCODES and defs[0] != "$sp" and \
+                defs[0] in dead:
+            continue
+        dead.update(defs)
+        dead.difference_update(uses)
+        result.append((opcode, operands))
+    result.reverse()
+    return result
+
+
+# pass 5: retarget a pure instruction to the destination of the move that copies its result
+def coalesce_moves(region: list) -> list:
+    # for every "move rY, rX", is rX overwritten before it is read again?
+    source_dead = {}
+    dead = set()
+    for index in range(len(region) - 1, -1, -1):
+        opcode, operands = region[index]
+        if opcode == MOVE:
+            source_dead[index] = operands[1] in dead
+        defs, uses = defs_uses(opcode, operands)
+        dead.update(defs)
+        dead.difference_update(uses)
+    if not source_dead:
+        return region
+    result = []
+    index = 0
+    while index < len(region):
+        opcode, operands = region[index]
+        if source_dead.get(index + 1) and LAYOUTS[opcode] in PURE_LAYOUTS and operands[0] != "$sp":
+            next_operands = region[index + 1][1]
+            if next_operands[1] == operands[0]:
+                result.append((opcode, (next_operands[0],) + operands[1:]))
+                index += 2
+                continue
+        result.append((opcode, operands))
+        index += 1
+    return result
+
+
+PASSES = (sink_stack_adjustments, forward_stores, remove_dead_stores, remove_dead_definitions, coalesce_moves)
+
+
+def optimize(code: InstructionList) -> InstructionList:
+    regions, barriers = split_regions(code)
+    optimized = InstructionList()
+    for index, region in enumerate(regions):
+        while region:
+            size = len(region)
+            for region_pass in PASSES:
+                region = region_pass(region)
+            if len(region) >= size:
+                break
+        for opcode, operands in region:
+            optimized.append(opcode, *operands)
+        if index < len(barriers):
+            optimized.append(barriers[index][0], *barriers[index][1])
+    return optimized
+
+
+# report the instruction count reduction on the sample programs
+if __name__ == "__main__":
+    from CompileStats import instruction_count
+    from MIPS32_Emitter import MIPS32Emitter
+    from SamplePrograms import SAMPLE_PROGRAMS
+    import go_grammar
+
+    for sample_name, source in SAMPLE_PROGRAMS.items():
+        program = go_grammar.parser.parse(source)
+        before = instruction_count(list(MIPS32Emitter(peephole=False).iter_lines(program)))
+        after = instruction_count(list(MIPS32Emitter(peephole=True).iter_lines(program)))
+        print("{:>10}: {:4} instructions -> {:4} ({:.1%} fewer)".format(sample_name, before, after,
+                                                                         (before - after) / before))
@@ -0,0 +1,838 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: MIPS32 simulator for the assembly the compiler emits and the programs in "Assembly code/": runs a
+         program and counts the instructions, loads, stores and branches it executes, per basic block.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - MARS memory layout: .text at 0x00400000, .data at 0x10010000, $gp = 0x10008000, $sp = 0x7fffeffc.
+    Execution starts at main when the program has one, else at the first instruction, and ends with
+    syscall 10/17 or by running past the last instruction.
+  - The program is split into basic blocks and every block is translated once into a Python function that
+    runs its instructions and returns the index of the next block. While running, the simulator only counts
+    how many times each block runs and how often its branch is taken; the totals are the block counts times
+    the instructions, loads, stores and branches of each block (a numpy product).
+  - Memory is numpy: the data segment and the stack are uint8 arrays with int32 views for the words. The
+    FPU registers are a uint32 array viewed as float32 and float64 (a double is an even/odd pair), so
+    mtc1/mfc1 move bit patterns and float arithmetic rounds like the hardware. The integer registers are
+    a list of Python ints wrapped to 32 bits by the translated code: numpy scalar arithmetic measured about
+    3x slower and warns on overflow. add, addi, sub, subi and neg trap on signed overflow like MARS does;
+    addu, addiu, subu and negu wrap, and are what the emitter uses for the wrapping arithmetic of Go.
+  - Instructions are counted as written: a pseudo-instruction such as li, la, blt or "lw $t0, label" is
+    one instruction, not the instructions the assembler expands it to.
+  - Syscalls: 1 print int, 2 print float, 3 print double, 4 print string, 10 exit, 11 print character,
+    17 exit with a code.
+
+"""
+import math
+import re
+import struct
+import numpy
+
+TEXT_SEGMENT = 0x00400000
+DATA_SEGMENT = 0x10000000       # the data segment array starts here, $gp points into it
+STATIC_DATA = 0x10010000        # .data
+GLOBAL_POINTER = 0x10008000
+STACK_POINTER = 0x7fffeffc
+STACK_END = 0x80000000          # the stack array ends here
+HEAP_SIZE = 1 << 16             # bytes after the static data, reachable by address arithmetic
+
+REGISTER_NAMES = ("$zero", "$at", "$v0", "$v1", "$a0", "$a1", "$a2", "$a3",
+                  "$t0", "$t1", "$t2", "$t3", "$t4", "$t5", "$t6", "$t7",
+                  "$s0", "$s1", "$s2", "$s3", "$s4", "$s5", "$s6", "$s7",
+                  "$t8", "$t9", "$k0", "$k1", "$gp", "$sp", "$fp", "$ra")
+REGISTERS = {name: number for number, name in enumerate(REGISTER_NAMES)}
+REGISTERS.update({"${}".format(number): number for number in range(32)})
+REGISTERS["$s8"] = 30
+FLOAT_REGISTERS = {"$f{}".format(number): number for number in range(32)}
+# slots of the register list after the 32 general purpose registers
+HI, LO, FCC = 32, 33, 34
+
+LOADS = ("lw", "lh", "lhu", "lb", "lbu", "lwc1", "l.s", "ldc1", "l.d")
+STORES = ("sw", "sh", "sb", "swc1", "s.s", "sdc1", "s.d")
+BRANCHES = ("beq", "bne", "blt", "ble", "bgt", "bge", "bltu", "bleu", "bgtu", "bgeu")
+ZERO_BRANCHES = {"beqz": "==", "bnez": "!=", "blez": "<=", "bgtz": ">", "bltz": "<", "bgez": ">="}
+JUMPS = ("b", "j", "jal", "jr", "jalr", "bc1t", "bc1f")
+
+# operators of the three register (or register and immediate) instructions
+ARITHMETIC = {"add": "+", "addu": "+", "sub": "-", "subu": "-", "mul": "*", "addi": "+", "addiu": "+",
+              "subi": "-", "subiu": "-"}
+# the ones that trap on signed overflow instead of wrapping
+TRAPPING_ARITHMETIC = ("add", "sub", "addi", "subi", "neg")
+BITWISE = {"and": "&", "or": "|", "xor": "^", "andi": "&", "ori": "|", "xori": "^"}
+COMPARES = {"slt": "<", "sle": "<=", "sgt": ">", "sge": ">=", "seq": "==", "sne": "!=", "slti": "<",
+            "sltu": "<", "sltiu": "<", "sleu": "<=", "sgtu": ">", "sgeu": ">="}
+BRANCH_COMPARES = {"beq": "==", "bne": "!=", "blt": "<", "ble": "<=", "bgt": ">", "bge": ">=",
+                   "bltu": "<", "bleu": "<=", "bgtu": ">", "bgeu": ">="}
+FLOAT_ARITHMETIC = {"add": "+", "sub": "-", "mul": "*", "div": "/"}
+FLOAT_COMPARES = {"c.eq": "==", "c.lt": "<", "c.le": "<="}
+
+SOURCE_NAME = "<MIPS32 simulator>"
+
+LABEL = re.compile(r"([A-Za-z_.][\w.$]*)\s*:")
+STATEMENT = re.compile(r"(\S+)\s*(.*)")
+OPERAND_SEPARATOR = re.compile(r"[,\s]+")
+NUMBER = re.compile(r"[-+]?(0[xX][0-9a-fA-F]+|\d+)|'(\\?.)'")
+BASE_REGISTER = re.compile(r"(.*?)\((\$\w+)\)")
+LABEL_OFFSET = re.compile(r"([A-Za-z_.$][\w.$]*)(?:([+-])(\w+))?")
+
+
+class SimulatorError(Exception):
+    pass
+
+
+# a 32 bit two's complement value as a Python expression
+def wrap(expression: str) -> str:
+    return "((({}) + 2147483648 & 4294967295) - 2147483648)".format(expression)
+
+
+def wrap32(value: int) -> int:
+    return ((value + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+
+
+# the result of add, addi, sub, subi or neg, which trap when it doesn't fit in 32 bits
+def no_overflow(value: int) -> int:
+    if not -2147483648 <= value <= 2147483647:
+        raise SimulatorError("arithmetic overflow")
+    return value
+
+
+# the div/rem pseudo-instructions: Go and MIPS truncate toward zero, dividing by zero breaks
+def divide(left: int, right: int) -> int:
+    if right == 0:
+        raise SimulatorError("division by zero")
+    quotient = abs(left) // abs(right)
+    return wrap32(quotient if (left < 0) == (right < 0) else -quotient)
+
+
+def remainder(left: int, right: int) -> int:
+    if right == 0:
+        raise SimulatorError("division by zero")
+    return wrap32(left - divide(left, right) * right)
+
+
+# cvt.w/trunc.w/round.w/floor.w/ceil.w: a float to a word, 2^31 - 1 when it doesn't fit
+def float_to_word(value, rounding: str) -> int:
+    value = float(value)
+    if math.isnan(value) or not -2147483648.0 <= value < 2147483648.0:
+        return 0x7FFFFFFF
+    if rounding == "trunc":
+        return math.trunc(value)
+    if rounding == "floor":
+        return math.floor(value)
+    if rounding == "ceil":
+        return math.ceil(value)
+    return round(value)  # round half to even, the default rounding mode
+
+
+class Instruction:
+    __slots__ = ("mnemonic", "operands", "line")
+
+    def __init__(self, mnemonic: str, operands: list, line: int) -> None:
+        self.mnemonic = mnemonic
+        self.operands = operands
+        self.line = line
+
+
+# the static instruction mix of a basic block, and how often it ran
+class BlockStats:
+    __slots__ = ("label", "line", "instructions", "loads", "stores", "branches", "executions", "taken")
+
+    def __init__(self, label, line: int, instructions: int, loads: int, stores: int, branches: int) -> None:
+        self.label = label            # the label the block starts at, or None
+        self.line = line              # the source line of its first instruction
+        self.instructions = instructions
+        self.loads = loads
+        self.stores = stores
+        self.branches = branches
+        self.executions = 0
+        self.taken = 0                # times its branch or jump was taken
+
+    def __repr__(self) -> str:
+        return "BlockStats({}, line {}, {} instructions, executed {})".format(
+            self.label, self.line, self.instructions, self.executions)
+
+
+class SimulationResult:
+    __slots__ = ("output", "exit_code", "instructions", "loads", "stores", "branches", "taken", "blocks")
+
+    def __init__(self, output: str, exit_code: int, blocks: list) -> None:
+        self.output = output
+        self.exit_code = exit_code
+        self.blocks = blocks
+        executions = numpy.array([block.executions for block in blocks], dtype=numpy.int64)
+        mix = numpy.array([(block.instructions, block.loads, block.stores, block.branches) for block in blocks],
+                          dtype=numpy.int64).reshape(len(blocks), 4)
+        self.instructions, self.loads, self.stores, self.branches = (int(total) for total in executions @ mix)
+        self.taken = sum(block.taken for block in blocks)
+
+    def __str__(self) -> str:
+        return "{} instructions, {} loads, {} stores, {} branches ({} taken)".format(
+            self.instructions, self.loads, self.stores, self.branches, self.taken)
+
+    # the blocks that executed the most instructions, one line each
+    def report(self, top: int = 10) -> list:
+        lines = ["{:>6} {:>16} {:>11} {:>7} {:>12} {:>6} {:>6} {:>8}".format(
+            "line", "label", "executions", "size", "instructions", "loads", "stores", "branches")]
+        ranked = sorted(self.blocks, key=lambda block: -block.executions * block.instructions)
+        for block in ranked[:top]:
+            if not block.executions:
+                break
+            lines.append("{:>6} {:>16} {:>11} {:>7} {:>12} {:>6} {:>6} {:>8}".format(
+                block.line, block.label or "", block.executions, block.instructions,
+                block.executions * block.instructions, block.executions * block.loads,
+                block.executions * block.stores, block.executions * block.branches))
+        return lines
+
+
+# the data segment and the stack
+class Memory:
+    def __init__(self, static_data: bytes, stack_size: int) -> None:
+        size = (STATIC_DATA - DATA_SEGMENT + len(static_data) + HEAP_SIZE + 7) & ~7
+        self.data = numpy.zeros(size, dtype=numpy.uint8)
+        self.data[STATIC_DATA - DATA_SEGMENT:STATIC_DATA - DATA_SEGMENT + len(static_data)] = \
+            numpy.frombuffer(static_data, dtype=numpy.uint8)
+        self.data_words = self.data.view(numpy.int32)
+        self.stack = numpy.zeros(stack_size, dtype=numpy.uint8)
+        self.stack_words = self.stack.view(numpy.int32)
+        self.stack_base = STACK_END - stack_size
+
+    # the byte array and the offset in it of an address
+    def locate(self, address: int, size: int) -> tuple:
+        if address & (size - 1):
+            raise SimulatorError("address 0x{:08x} is not aligned on a {} byte boundary".format(
+                address & 0xFFFFFFFF, size))
+        offset = address - DATA_SEGMENT
+        if 0 <= offset <= len(self.data) - size:
+            return self.data, offset
+        offset = address - self.stack_base
+        if 0 <= offset <= len(self.stack) - size:
+            return self.stack, offset
+        raise SimulatorError("address 0x{:08x} is out of range".format(address & 0xFFFFFFFF))
+
+    def load_word(self, address: int) -> int:
+        offset = address - DATA_SEGMENT
+        if 0 <= offset < len(self.data) and not address & 3:
+            return self.data_words.item(offset >> 2)
+        offset = address - self.stack_base
+        if 0 <= offset < len(self.stack) and not address & 3:
+            return self.stack_words.item(offset >> 2)
+        self.locate(address, 4)
+        return 0
+
+    def store_word(self, address: int, value: int) -> None:
+        offset = address - DATA_SEGMENT
+        if 0 <= offset < len(self.data) and not address & 3:
+            self.data_words[offset >> 2] = value
+            return
+        offset = address - self.stack_base
+        if 0 <= offset < len(self.stack) and not address & 3:
+            self.stack_words[offset >> 2] = value
+            return
+        self.locate(address, 4)
+
+    def load(self, address: int, size: int, signed: bool) -> int:
+        memory, offset = self.locate(address, size)
+        return int.from_bytes(memory[offset:offset + size].tobytes(), "little", signed=signed)
+
+    def store(self, address: int, size: int, value: int) -> None:
+        memory, offset = self.locate(address, size)
+        memory[offset:offset + size] = numpy.frombuffer(
+            (value & ((1 << 8 * size) - 1)).to_bytes(size, "little"), dtype=numpy.uint8)
+
+    # the NUL terminated string at an address
+    def load_string(self, address: int) -> str:
+        memory, offset = self.locate(address, 1)
+        end = offset
+        while end < len(memory) and memory[end]:
+            end += 1
+        return memory[offset:end].tobytes().decode("latin-1")
+
+
+class MIPS32Simulator:
+    def __init__(self, stack_size: int = 1 << 20, max_instructions: int = 10 ** 9) -> None:
+        self.stack_size = stack_size
+        self.max_instructions = max_instructions
+        self.instructions = []
+        self.labels = {}          # label -> instruction index (text) or address (data)
+        self.text_labels = set()
+        self.static_data = bytearray()
+        self.data_fixups = []     # (offset in static_data, label, source line) of .word label values
+        self.blocks = []          # BlockStats, in program order
+        self.functions = []       # the translated blocks
+        self.block_of = {}        # instruction index -> block index, for the leaders
+        self.source_lines = {}    # line of the translated Python source -> line of the assembly
+        self.namespace = {}       # the globals of the translated blocks
+        self.memory = None
+        self.registers = None
+        self.float_registers = None
+        self.output = []
+        self.exit_code = 0
+
+    # assemble, translate and run a program given as text or as a list of lines
+    def run(self, program) -> SimulationResult:
+        lines = program.splitlines() if isinstance(program, str) else list(program)
+        self.assemble(lines)
+        self.translate()
+        return self.execute()
+
+    # ----------------------------------------------------------------------------------------------------
+    # assembling
+
+    def assemble(self, lines: list) -> None:
+        self.instructions = []
+        self.labels = {}
+        self.text_labels = set()
+        self.static_data = bytearray()
+        self.data_fixups = []
+        in_text = True
+        pending_labels = []
+        for line_number, line in enumerate(lines, 1):
+            line = self.strip_comment(line).strip()
+            while True:
+                match = LABEL.match(line)
+                if match is None:
+                    break
+                pending_labels.append((match.group(1), line_number))
+                line = line[match.end():].strip()
+            if not line:
+                continue
+            mnemonic, rest = STATEMENT.match(line).groups()
+            if mnemonic in (".text", ".ktext"):
+                self.place_labels(pending_labels, in_text)
+                in_text = True
+            elif mnemonic in (".data", ".kdata"):
+                self.place_labels(pending_labels, in_text)
+                in_text = False
+            elif mnemonic in (".globl", ".global", ".extern", ".set", ".ent", ".end"):
+                continue
+            elif mnemonic.startswith("."):
+                if in_text:
+                    raise SimulatorError("line {}: {} in the text segment".format(line_number, mnemonic))
+                self.directive(mnemonic, rest, pending_labels, line_number)
+            else:
+                if not in_text:
+                    raise SimulatorError("line {}: instruction in the data segment".format(line_number))
+                self.place_labels(pending_labels, True)
+                operands = [operand for operand in OPERAND_SEPARATOR.split(rest) if operand] if rest else []
+                self.instructions.append(Instruction(mnemonic.lower(), operands, line_number))
+        self.place_labels(pending_labels, in_text)
+        for offset, label, line_number in self.data_fixups:
+            self.static_data[offset:offset + 4] = struct.pack("<i", wrap32(self.address_of(label, line_number)))
+
+    @staticmethod
+    def strip_comment(line: str) -> str:
+        if "#" not in line:
+            return line
+        if '"' not in line:
+            return line[:line.index("#")]
+        quoted = False
+        for index, character in enumerate(line):
+            if character == '"' and (index == 0 or line[index - 1] != "\\"):
+                quoted = not quoted
+            elif character == "#" and not quoted:
+                return line[:index]
+        return line
+
+    # labels seen since the last instruction or data item name what comes next
+    def place_labels(self, pending_labels: list, in_text: bool) -> None:
+        for label, line_number in pending_labels:
+            if label in self.labels:
+                raise SimulatorError("line {}: label {} defined twice".format(line_number, label))
+            if in_text:
+                self.labels[label] = len(self.instructions)
+                self.text_labels.add(label)
+            else:
+                self.labels[label] = STATIC_DATA + len(self.static_data)
+        pending_labels.clear()
+
+    def align(self, size: int) -> None:
+        while len(self.static_data) % size:
+            self.static_data.append(0)
+
+    def directive(self, name: str, rest: str, pending_labels: list, line_number: int) -> None:
+        sizes = {".word": 4, ".half": 2, ".byte": 1, ".float": 4, ".double": 8}
+        if name in sizes:
+            self.align(sizes[name])
+            self.place_labels(pending_labels, False)
+            for item in [item.strip() for item in rest.split(",") if item.strip()]:
+                value, _, count = item.partition(":")
+                for _ in range(int(count, 0) if count else 1):
+                    self.data_value(name, value.strip(), line_number)
+        elif name in (".ascii", ".asciiz"):
+            self.place_labels(pending_labels, False)
+            for text in re.findall(r'"((?:[^"\\]|\\.)*)"', rest):
+                self.static_data += text.encode("latin-1").decode("unicode_escape").encode("latin-1")
+                if name == ".asciiz":
+                    self.static_data.append(0)
+        elif name == ".space":
+            self.place_labels(pending_labels, False)
+            self.static_data += bytes(int(rest, 0))
+        elif name == ".align":
+            self.align(1 << int(rest, 0))
+            self.place_labels(pending_labels, False)
+        else:
+            raise SimulatorError("line {}: unsupported directive {}".format(line_number, name))
+
+    def data_value(self, directive: str, value: str, line_number: int) -> None:
+        if directive == ".float":
+            self.static_data += struct.pack("<f", float(value))
+        elif directive == ".double":
+            self.static_data += struct.pack("<d", float(value))
+        elif directive == ".word" and not self.is_number(value):
+            self.data_fixups.append((len(self.static_data), value, line_number))
+            self.static_data += bytes(4)
+        else:
+            size = {".word": 4, ".half": 2, ".byte": 1}[directive]
+            number = self.number(value, line_number)
+            self.static_data += (number & ((1 << 8 * size) - 1)).to_bytes(size, "little")
+
+    @staticmethod
+    def is_number(text: str) -> bool:
+        return NUMBER.fullmatch(text) is not None
+
+    def number(self, text: str, line_number: int) -> int:
+        if not self.is_number(text):
+            raise SimulatorError("line {}: {} is not a number".format(line_number, text))
+        if text[0] == "'":
+            return ord(text[1:-1].encode("latin-1").decode("unicode_escape"))
+        return int(text, 0)
+
+    # the address of a label: text labels by instruction index
+    def address_of(self, label: str, line_number: int) -> int:
+        if label not in self.labels:
+            raise SimulatorError("line {}: undefined label {}".format(line_number, label))
+        if label in self.text_labels:
+            return TEXT_SEGMENT + 4 * self.labels[label]
+        return self.labels[label]
+
+    # ----------------------------------------------------------------------------------------------------
+    # translating
+
+    def translate(self) -> None:
+        instructions = self.instructions
+        leaders = {0} | {self.labels[label] for label in self.text_labels if self.labels[label] < len(instructions)}
+        for index, instruction in enumerate(instructions):
+            if self.ends_block(instruction):
+                leaders.add(index + 1)
+        starts = sorted(leader for leader in leaders if leader < len(instructions))
+        self.block_of = {start: block for block, start in enumerate(starts)}
+        label_at = {}
+        for label in sorted(self.text_labels):
+            label_at.setdefault(self.labels[label], label)
+        self.blocks = []
+        self.source_lines = {}
+        source = []
+        for block, start in enumerate(starts):
+            end = starts[block + 1] if block + 1 < len(starts) else len(instructions)
+            body = instructions[start:end]
+            self.blocks.append(BlockStats(label_at.get(start), body[0].line, len(body),
+                                          sum(item.mnemonic in LOADS for item in body),
+                                          sum(item.mnemonic in STORES for item in body),
+                                          sum(self.ends_block(item) and item.mnemonic != "syscall" for item in body)))
+            source.append("def block_{}():".format(block))
+            for index in range(start, end):
+                instruction = instructions[index]
+                try:
+                    code = self.translate_instruction(instruction, index, block)
+                except (SimulatorError, KeyError, ValueError, IndexError) as error:
+                    raise SimulatorError("line {}: cannot translate '{} {}': {}".format(
+                        instruction.line, instruction.mnemonic, ", ".join(instruction.operands), error))
+                for code_line in code:
+                    source.append("    " + code_line)
+                    self.source_lines[len(source)] = instruction.line
+            if not self.ends_block(body[-1]):
+                source.append("    return {}".format(self.next_block(end)))
+        namespace = {"divide": divide, "remainder": remainder, "float_to_word": float_to_word,
+                     "no_overflow": no_overflow, "numpy": numpy, "wrap32": wrap32}
+        exec(compile("\n".join(source) + "\n", SOURCE_NAME, "exec"), namespace)
+        self.functions = [namespace["block_{}".format(block)] for block in range(len(starts))]
+        self.namespace = namespace
+
+    @staticmethod
+    def ends_block(instruction: Instruction) -> bool:
+        mnemonic = instruction.mnemonic
+        return mnemonic == "syscall" or mnemonic in BRANCHES or mnemonic in ZERO_BRANCHES or mnemonic in JUMPS
+
+    # the block starting at an instruction index, -1 (stop) past the end of the program
+    def next_block(self, index: int) -> int:
+        if index >= len(self.instructions):
+            return -1
+        return self.block_of[index]
+
+    def branch_target(self, label: str, line_number: int) -> int:
+        if label not in self.text_labels:
+            raise SimulatorError("line {}: undefined label {}".format(line_number, label))
+        return self.next_block(self.labels[label])
+
+    @staticmethod
+    def register(operand: str) -> int:
+        if operand not in REGISTERS:
+            raise SimulatorError("unknown register {}".format(operand))
+        return REGISTERS[operand]
+
+    @staticmethod
+    def float_register(operand: str, double: bool = False) -> int:
+        if operand not in FLOAT_REGISTERS:
+            raise SimulatorError("unknown floating point register {}".format(operand))
+        number = FLOAT_REGISTERS[operand]
+        if double and number & 1:
+            raise SimulatorError("{} is not an even register".format(operand))
+        return number
+
+    # a register or immediate source operand as a Python expression
+    def value(self, operand: str, line_number: int) -> str:
+        if operand[0] == "$":
+            number = self.register(operand)
+            return "r[{}]".format(number) if number else "0"
+        return str(self.number(operand, line_number))
+
+    @staticmethod
+    def assign(register: int, expression: str) -> list:
+        return ["r[{}] = {}".format(register, expression)] if register else []
+
+    # the address of a memory operand: off($reg), ($reg), label, label+off, label($reg) or an address
+    def address(self, operand: str, line_number: int) -> tuple:
+        match = BASE_REGISTER.fullmatch(operand)
+        base = None
+        if match:
+            operand, base = match.group(1), self.register(match.group(2))
+        constant = 0
+        if operand:
+            match = LABEL_OFFSET.fullmatch(operand)
+            if match and not self.is_number(operand):
+                constant = self.address_of(match.group(1), line_number)
+                if match.group(2):
+                    offset = self.number(match.group(3), line_number)
+                    constant += offset if match.group(2) == "+" else -offset
+            else:
+                constant = self.number(operand, line_number)
+        if base is None:
+            return str(constant), constant
+        if not base:
+            return str(constant), constant
+        return ("r[{}] + {}".format(base, constant) if constant else "r[{}]".format(base)), None
+
+    # the Python statements of one instruction, the last one returns the next block for a block's last
+    def translate_instruction(self, instruction: Instruction, index: int, block: int) -> list:
+        mnemonic, operands, line_number = instruction.mnemonic, instruction.operands, instruction.line
+        following = self.next_block(index + 1) if self.ends_block(instruction) else None
+        if mnemonic in ("li", "lui", "la", "move", "neg", "negu", "not", "abs"):
+            destination = self.register(operands[0])
+            if mnemonic == "li":
+                return self.assign(destination, str(wrap32(self.number(operands[1], line_number))))
+            if mnemonic == "lui":
+                return self.assign(destination, str(wrap32(self.number(operands[1], line_number) << 16)))
+            if mnemonic == "la":
+                return self.assign(destination, wrap(self.address(operands[1], line_number)[0]))
+            source = self.value(operands[1], line_number)
+            expression = {"move": "{}", "neg": "-{}", "negu": "-{}", "not": "~{}", "abs": "abs({})"}[mnemonic]
+            if mnemonic == "move":
+                return self.assign(destination, source)
+            if mnemonic in TRAPPING_ARITHMETIC:
+                checked = "no_overflow({})".format(expression.format(source))
+                return self.assign(destination, checked) or [checked]
+            return self.assign(destination, wrap(expression.format(source)))
+        if mnemonic in ARITHMETIC or mnemonic in BITWISE or mnemonic in COMPARES or mnemonic in \
+                ("div", "divu", "rem", "remu", "nor", "sll", "srl", "sra", "sllv", "srlv", "srav"):
+            if mnemonic in ("div", "divu") and len(operands) == 2:
+                return self.translate_hi_lo(mnemonic, operands, line_number)
+            destination = self.register(operands[0])
+            left = self.value(operands[1], line_number)
+            right = self.value(operands[2], line_number)
+            if mnemonic in TRAPPING_ARITHMETIC:
+                # checked even when the result goes to $zero
+                checked = "no_overflow({} {} {})".format(left, ARITHMETIC[mnemonic], right)
+                return self.assign(destination, checked) or [checked]
+            if mnemonic in ARITHMETIC:
+                return self.assign(destination, wrap("{} {} {}".format(left, ARITHMETIC[mnemonic], right)))
+            if mnemonic in BITWISE:
+                return self.assign(destination, wrap("{} {} {}".format(left, BITWISE[mnemonic], right)))
+            if mnemonic == "nor":
+                return self.assign(destination, "~({} | {})".format(left, right))
+            if mnemonic in COMPARES:
+                if mnemonic.endswith("u") or mnemonic.endswith("iu"):
+                    left, right = "({} & 4294967295)".format(left), "({} & 4294967295)".format(right)
+                return self.assign(destination, "1 if {} {} {} else 0".format(left, COMPARES[mnemonic], right))
+            if mnemonic in ("div", "rem"):
+                return self.assign(destination, "{}({}, {})".format(
+                    "divide" if mnemonic == "div" else "remainder", left, right))
+            if mnemonic in ("divu", "remu"):
+                return self.assign(destination, "wrap32({}(({}) & 4294967295, ({}) & 4294967295))".format(
+                    "divide" if mnemonic == "divu" else "remainder", left, right))
+            shift = "({} & 31)".format(right) if mnemonic.endswith("v") else right
+            if mnemonic.startswith("sll"):
+                return self.assign(destination, wrap("{} << {}".format(left, shift)))
+            if mnemonic.startswith("srl"):
+                return self.assign(destination, wrap("({} & 4294967295) >> {}".format(left, shift)))
+            return self.assign(destination, "{} >> {}".format(left, shift))
+        if mnemonic in ("mult", "multu"):
+            return self.translate_hi_lo(mnemonic, operands, line_number)
+        if mnemonic in ("mfhi", "mflo"):
+            return self.assign(self.register(operands[0]), "r[{}]".format(HI if mnemonic == "mfhi" else LO))
+        if mnemonic in ("mthi", "mtlo"):
+            return ["r[{}] = {}".format(HI if mnemonic == "mthi" else LO, self.value(operands[0], line_number))]
+        if mnemonic in LOADS or mnemonic in STORES:
+            return self.translate_memory(mnemonic, operands, line_number)
+        if mnemonic in BRANCH_COMPARES or mnemonic in ZERO_BRANCHES:
+            if mnemonic in ZERO_BRANCHES:
+                left, right, label = self.value(operands[0], line_number), "0", operands[1]
+                operator = ZERO_BRANCHES[mnemonic]
+            else:
+                left, right = self.value(operands[0], line_number), self.value(operands[1], line_number)
+                label, operator = operands[2], BRANCH_COMPARES[mnemonic]
+                if mnemonic.endswith("u"):
+                    left, right = "({} & 4294967295)".format(left), "({} & 4294967295)".format(right)
+            return ["if {} {} {}:".format(left, operator, right),
+                    "    taken[{}] += 1".format(block),
+                    "    return {}".format(self.branch_target(label, line_number)),
+                    "return {}".format(following)]
+        if mnemonic in ("bc1t", "bc1f"):
+            return ["if {}r[{}]:".format("" if mnemonic == "bc1t" else "not ", FCC),
+                    "    taken[{}] += 1".format(block),
+                    "    return {}".format(self.branch_target(operands[-1], line_number)),
+                    "return {}".format(following)]
+        if mnemonic in ("b", "j"):
+            return ["taken[{}] += 1".format(block), "return {}".format(self.branch_target(operands[0], line_number))]
+        if mnemonic == "jal":
+            return ["r[31] = {}".format(TEXT_SEGMENT + 4 * (index + 1)), "taken[{}] += 1".format(block),
+                    "return {}".format(self.branch_target(operands[0], line_number))]
+        if mnemonic in ("jr", "jalr"):
+            code = ["target = r[{}]".format(self.register(operands[0]))]
+            if mnemonic == "jalr":
+                code.append("r[31] = {}".format(TEXT_SEGMENT + 4 * (index + 1)))
+            return code + ["taken[{}] += 1".format(block), "return jump(target)"]
+        if mnemonic == "syscall":
+            return ["if syscall():", "    return -1", "return {}".format(following)]
+        if mnemonic == "nop":
+            return []
+        return self.translate_float(mnemonic, operands, line_number)
+
+    def translate_hi_lo(self, mnemonic: str, operands: list, line_number: int) -> list:
+        left, right = self.value(operands[0], line_number), self.value(operands[1], line_number)
+        if mnemonic.endswith("u"):
+            left, right = "({} & 4294967295)".format(left), "({} & 4294967295)".format(right)
+        if mnemonic.startswith("mult"):
+            return ["product = {} * {}".format(left, right),
+                    "r[{}] = {}".format(LO, wrap("product")), "r[{}] = {}".format(HI, wrap("product >> 32"))]
+        # dividing by zero leaves hi and lo as they were
+        return ["if {}:".format(right),
+                "    r[{}] = wrap32(divide({}, {}))".format(LO, left, right),
+                "    r[{}] = wrap32(remainder({}, {}))".format(HI, left, right)]
+
+    # the index in the data segment's words of a static data address, None for any other address
+    def data_word(self, address: int):
+        offset = address - DATA_SEGMENT
+        if address & 3 or not 0 <= offset < STATIC_DATA - DATA_SEGMENT + len(self.static_data):
+            return None
+        return offset >> 2
+
+    def translate_memory(self, mnemonic: str, operands: list, line_number: int) -> list:
+        expression, constant = self.address(operands[1], line_number)
+        double = mnemonic in ("ldc1", "l.d", "sdc1", "s.d")
+        is_float = double or mnemonic in ("lwc1", "l.s", "swc1", "s.s")
+        target = self.float_register(operands[0], double) if is_float else self.register(operands[0])
+        size = {"lh": 2, "lhu": 2, "lb": 1, "lbu": 1, "sh": 2, "sb": 1}.get(mnemonic, 4)
+        code = []
+        if size != 4:
+            code.append("address = {}".format(expression))
+            if mnemonic in LOADS:
+                access = "load(address, {}, {})".format(size, not mnemonic.endswith("u"))
+                return code + (self.assign(target, access) or [access])
+            return code + ["store(address, {}, {})".format(size, self.value(operands[0], line_number))]
+        words = [(0, target)] + ([(4, target + 1)] if double else [])
+        # a label is an element of the data segment's word view, no range check needed
+        direct = constant is not None and self.data_word(constant) is not None and \
+            self.data_word(constant + 4 * (len(words) - 1)) is not None
+        if not direct:
+            code.append("address = {}".format(expression))
+        for offset, register in words:
+            if direct:
+                location = "data_words[{}]".format(self.data_word(constant + offset))
+            else:
+                location = "address + {}".format(offset) if offset else "address"
+            if mnemonic in LOADS:
+                access = "data_words.item({})".format(location[11:-1]) if direct else \
+                    "load_word({})".format(location)
+                if is_float:
+                    code.append("fi[{}] = {}".format(register, access))
+                elif register:
+                    code.append("r[{}] = {}".format(register, access))
+                elif not direct:
+                    code.append(access)  # a load into $zero can still fault
+            else:
+                value = "fi.item({})".format(register) if is_float else self.value(operands[0], line_number)
+                code.append("{} = {}".format(location, value) if direct else
+                            "store_word({}, {})".format(location, value))
+        return code
+
+    def translate_float(self, mnemonic: str, operands: list, line_number: int) -> list:
+        name, _, kind = mnemonic.rpartition(".")
+        if mnemonic in ("mtc1", "mfc1"):
+            register, float_register = self.register(operands[0]), self.float_register(operands[1])
+            if mnemonic == "mtc1":
+                return ["fi[{}] = {}".format(float_register, self.value(operands[0], line_number))]
+            return self.assign(register, "fi.item({})".format(float_register))
+        if kind not in ("s", "d", "w"):
+            raise SimulatorError("unsupported instruction {}".format(mnemonic))
+        double = kind == "d"
+
+        # the float register operand as an element of the float32 or float64 view
+        def element(operand: str, is_double: bool = double) -> str:
+            number = self.float_register(operand, is_double)
+            return ("f64[{}]" if is_double else "f32[{}]").format(number // 2 if is_double else number)
+
+        if name in FLOAT_ARITHMETIC:
+            return ["{} = {} {} {}".format(element(operands[0]), element(operands[1]), FLOAT_ARITHMETIC[name],
+                                           element(operands[2]))]
+        if name in ("abs", "neg", "mov", "sqrt"):
+            expression = {"abs": "abs({})", "neg": "-{}", "mov": "{}", "sqrt": "numpy.sqrt({})"}[name]
+            return ["{} = {}".format(element(operands[0]), expression.format(element(operands[1])))]
+        if name in FLOAT_COMPARES:
+            return ["r[{}] = 1 if {} {} {} else 0".format(FCC, element(operands[-2]), FLOAT_COMPARES[name],
+                                                         element(operands[-1]))]
+        conversion = mnemonic.split(".")
+        if len(conversion) == 3 and conversion[0] in ("cvt", "trunc", "round", "floor", "ceil"):
+            _, to_kind, from_kind = conversion
+            source = "fi[{}]".format(self.float_register(operands[1])) if from_kind == "w" else \
+                element(operands[1], from_kind == "d")
+            if to_kind == "w":
+                rounding = "nearest" if conversion[0] in ("cvt", "round") else conversion[0]
+                return ["fi[{}] = float_to_word({}, {!r})".format(self.float_register(operands[0]), source, rounding)]
+            return ["{} = {}".format(element(operands[0], to_kind == "d"), source)]
+        raise SimulatorError("unsupported instruction {}".format(mnemonic))
+
+    # ----------------------------------------------------------------------------------------------------
+    # running
+
+    def execute(self) -> SimulationResult:
+        self.memory = Memory(bytes(self.static_data), self.stack_size)
+        registers = [0] * 35
+        registers[REGISTERS["$gp"]] = GLOBAL_POINTER
+        registers[REGISTERS["$sp"]] = STACK_POINTER
+        self.registers = registers
+        self.float_registers = numpy.zeros(32, dtype=numpy.uint32)
+        self.output = []
+        self.exit_code = 0
+        taken = [0] * len(self.blocks)
+        self.namespace.update({
+            "r": registers, "fi": self.float_registers.view(numpy.int32),
+            "f32": self.float_registers.view(numpy.float32), "f64": self.float_registers.view(numpy.float64),
+            "data_words": self.memory.data_words, "load_word": self.memory.load_word,
+            "store_word": self.memory.store_word, "load": self.memory.load, "store": self.memory.store,
+            "syscall": self.syscall, "jump": self.jump, "taken": taken})
+        executions = [0] * len(self.blocks)
+        sizes = [block.instructions for block in self.blocks]
+        functions = self.functions
+        budget = self.max_instructions
+        entry = self.labels["main"] if "main" in self.text_labels else 0
+        index = self.next_block(entry) if self.instructions else -1
+        try:
+            with numpy.errstate(all="ignore"):
+                while index >= 0:
+                    executions[index] += 1
+                    budget -= sizes[index]
+                    if budget < 0:
+                        raise SimulatorError("more than {} instructions executed".format(self.max_instructions))
+                    index = functions[index]()
+        except SimulatorError as error:
+            raise SimulatorError("line {}: {}".format(self.failing_line(error, index), error)) from None
+        for block, count in enumerate(executions):
+            self.blocks[block].executions = count
+            self.blocks[block].taken = taken[block]
+        return SimulationResult("".join(self.output), self.exit_code, self.blocks)
+
+    # the assembly line of the instruction that raised, from the translated code in the traceback
+    def failing_line(self, error: Exception, index: int) -> int:
+        traceback = error.__traceback__
+        line = None
+        while traceback is not None:
+            if traceback.tb_frame.f_code.co_filename == SOURCE_NAME:
+                line = self.source_lines.get(traceback.tb_lineno)
+            traceback = traceback.tb_next
+        return line if line is not None else self.blocks[index].line
+
+    # the block a jr/jalr goes to
+    def jump(self, address: int) -> int:
+        index = (address - TEXT_SEGMENT) >> 2
+        if address & 3 or index not in self.block_of:
+            if index == len(self.instructions):
+                return -1
+            raise SimulatorError("jump to 0x{:08x}, not the start of a basic block".format(address & 0xFFFFFFFF))
+        return self.block_of[index]
+
+    # returns True when the program exits
+    def syscall(self) -> bool:
+        registers = self.registers
+        service = registers[2]
+        if service == 1:
+            self.output.append(str(registers[4]))
+        elif service == 2:
+            self.output.append(str(self.float_registers.view(numpy.float32)[12]))
+        elif service == 3:
+            self.output.append(str(self.float_registers.view(numpy.float64)[6]))
+        elif service == 4:
+            self.output.append(self.memory.load_string(registers[4]))
+        elif service == 11:
+            self.output.append(chr(registers[4] & 0xFF))
+        elif service == 10:
+            return True
+        elif service == 17:
+            self.exit_code = registers[4]
+            return True
+        else:
+            raise SimulatorError("unsupported syscall {}".format(service))
+        return False
+
+
+# run the hand written programs and the compiled sample programs, and time a long running loop
+if __name__ == "__main__":
+    import glob
+    import os
+    import sys
+    import time
+    from CompilerSession import CompilerSession
+    from SamplePrograms import SAMPLE_PROGRAMS
+
+    directory = os.path.dirname(os.path.abspath(__file__))
+    file_names = sys.argv[1:] or sorted(glob.glob(os.path.join(directory, "Assembly code", "*.asm")))
+    for file_name in file_names:
+        with open(file_name) as assembly_file:
+            result = MIPS32Simulator().run(assembly_file.read())
+        print("{}: {}".format(os.path.basename(file_name), result))
+        print("    output: {!r}".format(result.output))
+
+    for mode in ("stack", "register"):
+        session = CompilerSession(mode=mode)
+        for sample_name, source in SAMPLE_PROGRAMS.items():
+            result = MIPS32Simulator().run(session.compile(source).lines)
+            print("{} ({}): {}, output {!r}".format(sample_name, mode, result, result.output))
+
+    loop = """
+.text
+main:
+    li $t0, 0
+    li $t1, 1000000
+    la $t3, counter
+loop:
+    lw $t2, 0($t3)
+    addi $t2, $t2, 3
+    sw $t2, 0($t3)
+    addi $t0, $t0, 1
+    blt $t0, $t1, loop
+    lw $a0, 0($t3)
+    li $v0, 1
+    syscall
+    li $v0, 10
+    syscall
+.data
+counter: .word 0
+"""
+    start = time.perf_counter()
+    result = MIPS32Simulator().run(loop)
+    seconds = time.perf_counter() - start
+    print("loop: {}, output {}, {:.2f}s, {:.1f} million instructions/s".format(
+        result, result.output, seconds, result.instructions / seconds / 1e6))
+    print("\n".join(result.report()))
@@ -5,30 +5,116 @@
 # Purpose:  Read in a file's lines
 #
 # History:
+#           2026-10-18, TP, memory-mapped mode (mapped=True) with a lazy, newline indexed raw_data; the
+#                           attributes belong to each instance instead of the class
 #           2024-02-05, DMW, updated for CSC420
 #           2023-04-13, DMW, updated
 #           2021-09-21, DMW, stronger typing hints added where appropriate
 #           2021-09-08, DMW, created
+#
+# Notes:
+#           mapped=True maps the file read-only instead of reading it: .buffer is the mmap, which FastLexer
+#           and CompilerSession.compile() take as it is, and raw_data reads a line from the buffer only when
+#           it is asked for, using the offsets of the newlines found by one vectorized (numpy) scan. raw_text
+#           decodes the whole file the first time it is used. Lines are split at "\n" only, a "\r" before it
+#           is dropped.
 
-class ReadFile:
-    raw_data = []
-    raw_text = ""
-    raw_lines = 0
-    error = False
-    error_message = ""
-    source_file_name = ""
+import mmap
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# bytes of the file scanned for newlines at a time, bounds the scratch memory of the scan
+SCAN_CHUNK = 16 << 20
+
+
+# the offsets of the "\n" bytes of a buffer, in order
+def newline_offsets(buffer) -> "array":
+    offsets = array("q")
+    if numpy is not None:
+        data = numpy.frombuffer(buffer, dtype=numpy.uint8)
+        for start in range(0, len(data), SCAN_CHUNK):
+            found = numpy.flatnonzero(data[start:start + SCAN_CHUNK] == 10)
+            offsets.frombytes((found + start).astype(numpy.int64).tobytes())
+        del data  # the mmap can't be closed while numpy holds a view of it
+        return offsets
+    position = buffer.find(b"\n")
+    while position >= 0:
+        offsets.append(position)
+        position = buffer.find(b"\n", position + 1)
+    return offsets
+
+
+# the lines of a mapped file as a read-only sequence, each decoded when it is asked for
+class MappedLines:
+    def __init__(self, buffer, newlines: "array", encoding: str) -> None:
+        self.buffer = buffer
+        self.newlines = newlines
+        self.encoding = encoding
+        # a last line without a "\n" still counts
+        self.count = len(newlines) + (1 if len(buffer) and (not newlines or newlines[-1] != len(buffer) - 1) else 0)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[line] for line in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("line index out of range")
+        start = self.newlines[index - 1] + 1 if index else 0
+        end = self.newlines[index] if index < len(self.newlines) else len(self.buffer)
+        if end > start and self.buffer[end - 1] == 13:  # "\r"
+            end -= 1
+        return self.buffer[start:end].decode(self.encoding)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
 
+
+class ReadFile:
     # this is the class constructor function
-    def __init__(self, source_file_name: str = ""):
+    def __init__(self, source_file_name: str = "", mapped: bool = False, encoding: str = "utf-8"):
+        self.raw_data = []
+        self._raw_text = None
+        self.raw_lines = 0
+        self.error = False
+        self.error_message = ""
+        self.source_file_name = ""
+        self.mapped = mapped
+        self.encoding = encoding
+        self.buffer = None
+        self.newlines = None
+
         # this code was added for REPL support
         if len(source_file_name) == 0:
             return
 
         self.read_file(source_file_name)
 
+    # the whole file as a string; a mapped file is decoded on first use
+    @property
+    def raw_text(self) -> str:
+        if self._raw_text is None:
+            self._raw_text = self.buffer[:].decode(self.encoding) if self.buffer is not None else ""
+        return self._raw_text
+
+    @raw_text.setter
+    def raw_text(self, text: str) -> None:
+        self._raw_text = text
+
     def read_file(self, source_file_name: str) -> None:
         self.source_file_name = source_file_name
         try:
+            if self.mapped:
+                self.map_file(source_file_name)
+                return
             source_file = open(source_file_name, "r")
             self.raw_text = source_file.read()
             source_file.close()
@@ -38,6 +124,27 @@ class ReadFile:
             self.error = True
             self.error_message = str(ex)
 
+    def map_file(self, source_file_name: str) -> None:
+        with open(source_file_name, "rb") as source_file:
+            try:
+                self.buffer = mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                self.buffer = b""  # an empty file can't be mapped
+        self.newlines = newline_offsets(self.buffer)
+        self.raw_data = MappedLines(self.buffer, self.newlines, self.encoding)
+        self.raw_lines = len(self.raw_data)
+
+    # unmap a mapped file; raw_data can't be used afterwards
+    def close(self) -> None:
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
 
 if __name__ == "__main__":
     # limited simple testing
@@ -45,3 +152,39 @@ if __name__ == "__main__":
     print(p.raw_data)
     print(p.error)
     print(p.error_message)
+
+    # read time and peak memory of both modes on a large generated file, each in a fresh process
+    import os
+    import subprocess
+    import sys
+    import tempfile
+
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200 << 20
+    measure = """
+import resource, sys, time
+from ReadFile import ReadFile
+start = time.perf_counter()
+source = ReadFile(sys.argv[1], mapped=sys.argv[2] == "mapped")
+lines = source.raw_lines
+middle = source.raw_data[lines // 2]
+seconds = time.perf_counter() - start
+print("{:>8}: {:7.3f}s, peak RSS {:7.1f} MB, {} lines".format(
+    sys.argv[2], seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, lines))
+"""
+    with tempfile.NamedTemporaryFile("w", suffix=".go", delete=False) as large_file:
+        line_number = 0
+        while large_file.tell() < size:
+            large_file.write("".join("var v{0} = v{1} * 3 + {0}\nfmt.Println(v{0})\n".format(
+                line_number + index, line_number + index - 1) for index in range(10000)))
+            line_number += 10000
+    try:
+        print("{:.0f} MB file".format(os.path.getsize(large_file.name) / (1 << 20)))
+        for mode in ("read", "mapped"):
+            subprocess.run([sys.executable, "-c", measure, large_file.name, mode], check=True,
+                           cwd=os.path.dirname(os.path.abspath(__file__)))
+        check = ReadFile(large_file.name, mapped=True)
+        same = list(check.raw_data) == ReadFile(large_file.name).raw_data
+        check.close()
+        print("mapped lines {} the lines read".format("are the same as" if same else "DIFFER from"))
+    finally:
+        os.remove(large_file.name)
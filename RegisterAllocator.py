@@ -0,0 +1,264 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Register allocation for the MIPS32 emitter: Sethi-Ullman numbering of expression trees and
+         linear-scan allocation of variables to registers.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - Sethi, Ullman, "The Generation of Optimal Code for Arithmetic Expressions", JACM 1970
+  - Poletto, Sarkar, "Linear Scan Register Allocation", TOPLAS 1999
+  - Every statement gets a position in program order; a variable's live interval runs from its first to its
+    last reference and is stretched over any for loop that references it, so values survive the back edge.
+  - When registers run out the interval with the lowest spill weight (references weighted by 10 ** loop
+    depth) lives in its data segment word instead.
+  - A key of None leaves a variable out of the allocation; the emitter keeps float64 variables in memory.
+
+"""
+from ASTNODE import ASTNODE, ASSIGNMENT_OPERATORS
+from ConstantFolder import INTRINSICS
+
+# registers handed out to variables, and the scratch registers used to evaluate expressions
+VARIABLE_REGISTERS = ("$s0", "$s1", "$s2", "$s3", "$s4", "$s5", "$s6", "$s7",
+                      "$t4", "$t5", "$t6", "$t7", "$t8", "$t9")
+SCRATCH_REGISTERS = ("$t0", "$t1", "$t2", "$t3")
+
+# operators that have an immediate form, when the right operand is a small integer constant
+IMMEDIATE_OPERATORS = ("+", "-")
+
+
+# skip over the single-child expression nodes wrapping a name, number or operator node
+def unwrap(_node: ASTNODE) -> ASTNODE:
+    while _node.name == "expression" and len(_node.children) == 1 and _node.value is None:
+        _node = _node.children[0]
+    return _node
+
+
+# the operator and operands of a binary node or a min/max call, or None; comparisons are parsed as assign nodes
+def binary_parts(_node: ASTNODE):
+    if (_node.name == "expression" and len(_node.children) == 2) or \
+            (_node.name == "assign" and _node.value not in ASSIGNMENT_OPERATORS):
+        return _node.value, _node.children[0], _node.children[1]
+    return None
+
+
+# the key a name node's variable is allocated under: its name, or its DataLayout slot when the emitter passes
+# key=layout.slot so that a shadowed variable is a variable of its own
+def variable_name(_node: ASTNODE) -> str:
+    return _node.value
+
+
+# a small integer constant that fits the 16 bit immediate field of addiu
+def immediate(_node: ASTNODE):
+    _node = unwrap(_node)
+    if _node.name == "number" and _node.value[1] == "integer" and -32767 <= _node.value[0] <= 32767:
+        return _node.value[0]
+    return None
+
+
+class Interval:
+    __slots__ = ("name", "start", "end", "weight", "read_first", "register")
+
+    def __init__(self, name: str, start: int) -> None:
+        self.name = name
+        self.start = start
+        self.end = start
+        self.weight = 0
+        self.read_first = False  # the first reference reads the variable, it has to start out as 0
+        self.register = None
+
+    def __repr__(self) -> str:
+        return "Interval({}, [{}, {}], weight={}, register={})".format(self.name, self.start, self.end,
+                                                                      self.weight, self.register)
+
+
+class LinearScanAllocator:
+    def __init__(self, registers=VARIABLE_REGISTERS, key=variable_name) -> None:
+        self.registers = registers
+        self.key = key
+        self.intervals = {}
+        self.loops = []          # [first position, last position, names referenced inside]
+        self.open_loops = []     # the loops enclosing the current position
+        self.position = 0
+
+    # assign registers to the variables of a program, returns {key: register or None when spilled}
+    def allocate(self, ast: ASTNODE) -> dict:
+        self.intervals = {}
+        self.loops = []
+        self.open_loops = []
+        self.position = 0
+        self.visit(ast)
+        for start, end, names in self.loops:
+            for name in names:
+                interval = self.intervals[name]
+                interval.start = min(interval.start, start)
+                interval.end = max(interval.end, end)
+        for interval in self.intervals.values():
+            if interval.read_first:
+                interval.start = 0  # cleared in the prologue, before any other variable uses the register
+        self.scan(sorted(self.intervals.values(), key=lambda item: (item.start, item.end)))
+        return {name: interval.register for name, interval in self.intervals.items()}
+
+    # the variables that are read before they are written and so need to be cleared on entry
+    def read_first(self) -> list:
+        return [interval for interval in self.intervals.values() if interval.read_first and interval.register]
+
+    # the classic linear scan, spilling the interval that is cheapest to keep in memory
+    def scan(self, intervals: list) -> None:
+        free = list(reversed(self.registers))
+        active = []
+        for interval in intervals:
+            for expired in [item for item in active if item.end < interval.start]:
+                active.remove(expired)
+                free.append(expired.register)
+            if free:
+                interval.register = free.pop()
+                active.append(interval)
+                continue
+            cheapest = min(active, key=lambda item: item.weight)
+            if cheapest.weight < interval.weight:
+                interval.register = cheapest.register
+                cheapest.register = None
+                active.remove(cheapest)
+                active.append(interval)
+
+    # record a reference to a variable at the current position
+    def reference(self, name: str, write: bool) -> None:
+        if name is None:
+            return
+        interval = self.intervals.get(name)
+        if interval is None:
+            interval = self.intervals[name] = Interval(name, self.position)
+            interval.read_first = not write
+        interval.end = self.position
+        interval.weight += 10 ** len(self.open_loops)
+        for loop in self.open_loops:
+            loop[2].add(name)
+
+    # give a statement level node the next position and record the variables it reads
+    def statement(self, _node: ASTNODE) -> None:
+        self.position += 1
+        pending = [_node]
+        while pending:
+            _node = pending.pop()
+            if _node.name == "name":
+                self.reference(self.key(_node), False)
+            else:
+                pending.extend(reversed(_node.children))
+
+    # the assigned variable is written after the right hand side is read, at the same position
+    def assignment(self, _node: ASTNODE) -> None:
+        self.statement(_node.children[1])
+        self.reference(self.key(_node.children[0]), True)
+
+    # walk the statements with an explicit stack; an entry is a node or a (method,) tuple to call once the
+    # nodes pushed above it are done
+    def visit(self, _node: ASTNODE) -> None:
+        pending = [_node]
+        while pending:
+            _node = pending.pop()
+            if type(_node) is tuple:
+                _node[0]()
+            elif _node.name in ["program", "block_statement", "statement_list", "statement", "if_statement"]:
+                pending.extend(reversed(_node.children))
+            elif _node.name == "assign" and _node.value in ASSIGNMENT_OPERATORS:
+                self.assignment(_node)
+            elif _node.name == "for":
+                if len(_node.children) == 4:
+                    clauses = [_node.children[1], _node.children[3], _node.children[2]]
+                else:
+                    clauses = [_node.children[0], _node.children[1]]
+                pending.append((self.close_loop,))
+                pending.extend(reversed(clauses))
+                pending.append((self.open_loop,))
+                if len(_node.children) == 4:
+                    pending.append(_node.children[0])  # the init clause runs once, before the loop
+            else:
+                self.statement(_node)
+
+    def open_loop(self) -> None:
+        loop = [self.position + 1, 0, set()]
+        self.loops.append(loop)
+        self.open_loops.append(loop)
+
+    def close_loop(self) -> None:
+        self.open_loops.pop()[1] = self.position
+
+
+# Sethi-Ullman numbers: the number of scratch registers needed to evaluate each expression node without
+# storing intermediate values; names already living in a register need none. immediate is the function telling
+# which right operands are folded into the instruction, pass one returning None where there is no immediate form
+class SethiUllman:
+    def __init__(self, homes: dict, key=variable_name, immediate=immediate) -> None:
+        self.homes = homes
+        self.key = key
+        self.immediate = immediate
+        self.labels = {}
+
+    # label an expression bottom up with an explicit stack; a node is labelled once its operands are
+    def label(self, _node: ASTNODE) -> int:
+        root = unwrap(_node)
+        pending = [root]
+        while pending:
+            _node = pending[-1]
+            if _node in self.labels:
+                pending.pop()
+                continue
+            parts = binary_parts(_node)
+            if parts is None:
+                if _node.name == "expression" and _node.value in INTRINSICS:
+                    operands = [unwrap(_node.children[0])]
+                else:
+                    operands = []
+            else:
+                operator, left, right = parts
+                operands = [unwrap(left)]
+                if operator not in IMMEDIATE_OPERATORS or self.immediate(right) is None:
+                    operands.append(unwrap(right))
+            unlabelled = [operand for operand in operands if operand not in self.labels]
+            if unlabelled:
+                pending.extend(unlabelled)
+                continue
+            pending.pop()
+            if parts is None:
+                if operands:
+                    need = max(1, self.labels[operands[0]])
+                else:
+                    need = 0 if _node.name == "name" and self.homes.get(self.key(_node)) else 1
+            else:
+                left_need = self.labels[operands[0]]
+                right_need = self.labels[operands[1]] if len(operands) == 2 else 0
+                if left_need == right_need:
+                    need = max(1, left_need + 1 if left_need else 1)
+                else:
+                    need = max(1, left_need, right_need)
+            self.labels[_node] = need
+        return self.labels[root]
+
+
+# compare the register mode against the stack mode on the sample programs
+if __name__ == "__main__":
+    from MIPS32_Emitter import MIPS32Emitter
+    from SamplePrograms import SAMPLE_PROGRAMS
+    import go_grammar
+
+    def count(lines) -> dict:
+        counts = {"instructions": 0, "loads": 0, "stores": 0}
+        for line in lines:
+            if line.startswith(".") or line.endswith(":"):
+                continue
+            counts["instructions"] += 1
+            counts["loads"] += line.startswith("lw ")
+            counts["stores"] += line.startswith("sw ")
+        return counts
+
+    generated = "\n".join("var v{0} = v{1} * {0} + (v{2} - v{3}) * (v{1} + {0})".format(i, max(i - 1, 0),
+                                                                                      max(i - 2, 0), i // 2)
+                          for i in range(40)) + "\nfmt.Println(v39)\n"
+    for sample_name, source in list(SAMPLE_PROGRAMS.items()) + [("generated", generated)]:
+        program = go_grammar.parser.parse(source)
+        for mode in MIPS32Emitter.modes:
+            counts = count(MIPS32Emitter(mode=mode).iter_lines(program))
+            print("{:>10} {:>8}: {instructions:5} instructions, {loads:4} loads, {stores:4} stores".format(
+                sample_name, mode, **counts))
@@ -0,0 +1,710 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Mid-level SSA IR between the AST and the MIPS32 code: basic blocks of values with phi nodes, built
+         from the AST and cleaned up by copy propagation, global value numbering and dead code elimination
+         before MIPS32_Emitter lowers it in mode="ssa".
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - Cytron, Ferrante, Rosen, Wegman, Zadeck, "Efficiently Computing Static Single Assignment Form and the
+    Control Dependence Graph", TOPLAS 1991
+  - Cooper, Harvey, Kennedy, "A Simple, Fast Dominance Algorithm", 2001
+  - Briggs, Cooper, Simpson, "Value Numbering", Software: Practice and Experience 1997
+  - usage: python SSA.py [FILE.go]   dumps the IR of a program before and after the passes, with the time
+    each pass took; without a file it reports the sample programs in every emitter mode.
+  - Values are numbered from 0. The opcode and the type (TypeChecker's INTEGER or FLOAT) of every value are
+    kept in byte arrays and its operands in a list of tuples, all indexed by the value's number, like
+    MIPS32_IR keeps instructions. The operands are value numbers, except for a constant whose operand is the
+    number itself. A phi has an operand per predecessor of its block, in the order of block.preds.
+  - A block holds the numbers of its phis and of its other values in order. It ends in a branch on a value,
+    to taken when the value isn't 0 and to next otherwise, or it goes on to next; the last block has no next.
+    Blocks are numbered in the order they are laid out, which is source order.
+  - The language only has if and for statements, so SSA is built in one walk over the tree, keeping the
+    value of every variable at the current point in a dict: an if statement joins the dicts of its arms with
+    a phi for every variable whose values differ, and a for loop, rotated like the emitter lowers it, gets a
+    phi in its body for every variable assigned inside it and phis in its exit joining the guard and the
+    bottom test. Variables are DataLayout slots, so a shadowed variable is a variable of its own.
+  - A variable read before it is assigned is 0, as in the other modes. Constants and those zeroes are
+    values like any other; the emitter loads a constant where it is used instead of keeping it in a register.
+  - x = y is a copy value, and a phi whose operands are all one value (or the phi itself) is a copy of it;
+    copy propagation replaces the uses of copies by their source.
+  - Global value numbering walks the dominator tree with a scoped hash table of (opcode, type, operands),
+    commutative operands sorted: a value computed again where an equal one dominates it becomes a copy of
+    that one. Phis of one block with the same operands are equal too. A value whose operands are constants
+    is folded first, with ConstantFolder's arithmetic.
+  - A branch on a constant becomes a jump, and blocks that can no longer be reached are removed.
+  - Dead code elimination keeps the prints, the branch conditions, the int divisions and remainders that may
+    trap (the divisor isn't a nonzero constant) and what they use, and removes the rest: unused assignments
+    and expression statements.
+
+"""
+from array import array
+import time
+from ASTNODE import ASTNODE, ASSIGNMENT_OPERATORS
+from ConstantFolder import evaluate_binary, evaluate_intrinsic
+from RegisterAllocator import unwrap, binary_parts
+from TypeChecker import INTEGER, FLOAT
+
+# the opcodes of values
+SSA_OPCODES = ("const", "copy", "phi", "add", "sub", "mul", "div", "rem", "lt", "le", "gt", "ge", "eq", "ne",
+               "min", "max", "abs", "print")
+
+(OP_CONST, OP_COPY, OP_PHI, OP_ADD, OP_SUB, OP_MUL, OP_DIV, OP_REM, OP_LT, OP_LE, OP_GT, OP_GE, OP_EQ, OP_NE,
+ OP_MIN, OP_MAX, OP_ABS, OP_PRINT) = range(len(SSA_OPCODES))
+
+# the operators of the AST and the opcodes computing them
+OPERATOR_OPCODES = {
+    "+": OP_ADD, "-": OP_SUB, "*": OP_MUL, "/": OP_DIV, "%": OP_REM,
+    "<": OP_LT, "<=": OP_LE, ">": OP_GT, ">=": OP_GE, "==": OP_EQ, "!=": OP_NE,
+    "min": OP_MIN, "max": OP_MAX, "abs": OP_ABS,
+}
+OPERATORS = {opcode: operator for operator, opcode in OPERATOR_OPCODES.items()}
+
+COMPARISONS = (OP_LT, OP_LE, OP_GT, OP_GE, OP_EQ, OP_NE)
+COMMUTATIVE = (OP_ADD, OP_MUL, OP_EQ, OP_NE, OP_MIN, OP_MAX)
+
+TYPE_NAMES = {INTEGER: "int", FLOAT: "float64"}
+
+
+# a construct the SSA form can't express
+class SSAError(Exception):
+    pass
+
+
+class SSABlock:
+    __slots__ = ("index", "phis", "values", "preds", "condition", "taken", "next", "depth")
+
+    def __init__(self, depth: int) -> None:
+        self.index = None          # the position in the layout, once the block is started
+        self.phis = array("I")
+        self.values = array("I")
+        self.preds = []            # the blocks control comes from, in the order of the phi operands
+        self.condition = None      # the value branched on, or None
+        self.taken = None          # where the branch goes when the condition isn't 0
+        self.next = None           # where control goes otherwise, None to leave the program
+        self.depth = depth         # the number of loops around the block
+
+    def __repr__(self) -> str:
+        return "SSABlock(block_{}, {} phis, {} values)".format(self.index, len(self.phis), len(self.values))
+
+    def successors(self) -> list:
+        if self.taken is None or self.taken is self.next:
+            return [self.next] if self.next is not None else []
+        return [self.taken, self.next]
+
+
+class SSAProgram:
+    def __init__(self) -> None:
+        self.opcodes = array("B")
+        self.types = array("B")
+        self.operands = []
+        self.blocks = []  # in layout order, the first one is the entry
+
+    def new_value(self, opcode: int, value_type: int, operands: tuple) -> int:
+        self.opcodes.append(opcode)
+        self.types.append(value_type)
+        self.operands.append(operands)
+        return len(self.opcodes) - 1
+
+    # the value numbers a value uses
+    def uses(self, value: int) -> tuple:
+        return () if self.opcodes[value] == OP_CONST else self.operands[value]
+
+    # lay a block out after the ones started so far
+    def start(self, block: SSABlock) -> None:
+        block.index = len(self.blocks)
+        self.blocks.append(block)
+
+    def value_count(self) -> int:
+        return sum(len(block.phis) + len(block.values) for block in self.blocks)
+
+    # the immediate dominator of every block, by its index; the entry is its own
+    def dominators(self) -> list:
+        order = reverse_postorder(self.blocks[0])
+        rank = {block: position for position, block in enumerate(order)}
+        idom = {self.blocks[0]: self.blocks[0]}
+        changed = True
+        while changed:
+            changed = False
+            for block in order[1:]:
+                new_idom = None
+                for pred in block.preds:
+                    if pred not in idom:
+                        continue
+                    if new_idom is None:
+                        new_idom = pred
+                        continue
+                    finger = pred
+                    while finger is not new_idom:
+                        while rank[finger] > rank[new_idom]:
+                            finger = idom[finger]
+                        while rank[new_idom] > rank[finger]:
+                            new_idom = idom[new_idom]
+                    new_idom = finger
+                if idom.get(block) is not new_idom:
+                    idom[block] = new_idom
+                    changed = True
+        return [idom[block].index if block in idom else None for block in self.blocks]
+
+    def render(self, value: int) -> str:
+        opcode = self.opcodes[value]
+        operands = self.operands[value]
+        if opcode == OP_PRINT:
+            return "print v{}".format(operands[0])
+        if opcode == OP_CONST:
+            text = repr(operands[0])
+        else:
+            text = ", ".join("v{}".format(operand) for operand in operands)
+        return "v{} = {} {} : {}".format(value, SSA_OPCODES[opcode], text, TYPE_NAMES[self.types[value]])
+
+    def dump(self) -> list:
+        lines = []
+        for block in self.blocks:
+            header = "block_{}:".format(block.index)
+            if block.preds:
+                header += "  ; preds " + ", ".join("block_{}".format(pred.index) for pred in block.preds)
+            lines.append(header)
+            for value in block.phis:
+                lines.append("    v{} = phi {} : {}".format(
+                    value, ", ".join("v{} [block_{}]".format(operand, pred.index)
+                                     for operand, pred in zip(self.operands[value], block.preds)),
+                    TYPE_NAMES[self.types[value]]))
+            for value in block.values:
+                lines.append("    " + self.render(value))
+            if block.condition is not None:
+                lines.append("    branch v{} ? block_{} : block_{}".format(block.condition, block.taken.index,
+                                                                           block.next.index))
+            elif block.next is not None:
+                lines.append("    jump block_{}".format(block.next.index))
+            else:
+                lines.append("    exit")
+        return lines
+
+
+# the blocks reachable from the entry, each one before its successors except along back edges
+def reverse_postorder(entry: SSABlock) -> list:
+    order = []
+    seen = {entry}
+    pending = [(entry, iter(entry.successors()))]
+    while pending:
+        block, successors = pending[-1]
+        for successor in successors:
+            if successor not in seen:
+                seen.add(successor)
+                pending.append((successor, iter(successor.successors())))
+                break
+        else:
+            pending.pop()
+            order.append(block)
+    order.reverse()
+    return order
+
+
+# a for loop being built: its blocks and the variables at the guard and at the bottom test
+class Loop:
+    __slots__ = ("node", "condition", "body", "exit", "guard", "guard_definitions", "phis")
+
+    def __init__(self, node: ASTNODE, condition: ASTNODE, body: SSABlock, exit_block: SSABlock) -> None:
+        self.node = node
+        self.condition = condition
+        self.body = body
+        self.exit = exit_block
+        self.guard = None
+        self.guard_definitions = None
+        self.phis = {}  # variable -> its phi in the body
+
+
+class SSABuilder:
+    def __init__(self, types: dict, layout) -> None:
+        self.types = types        # node -> TypeChecker tag
+        self.layout = layout      # the DataLayout whose slots are the variables
+        self.program = SSAProgram()
+        self.block = None         # the block being built
+        self.definitions = {}     # variable -> the value it holds at the current point
+        self.zeroes = {}          # type -> the constant 0 of that type, in the entry block
+
+    # walk the program with an explicit stack; an entry is a node or a (method, arguments...) tuple to call once
+    # the nodes pushed above it are done
+    def build(self, ast: ASTNODE) -> SSAProgram:
+        self.start(SSABlock(0))
+        pending = [ast]
+        while pending:
+            _node = pending.pop()
+            if type(_node) is tuple:
+                _node[0](*_node[1:])
+            elif _node.name in ["program", "block_statement", "statements", "statement_list", "statement"]:
+                pending.extend(reversed(_node.children))
+            elif _node.name == "print":
+                value = self.value(_node.children[0])
+                self.emit(OP_PRINT, self.program.types[value], (value,))
+            elif _node.name == "assign" and _node.value in ASSIGNMENT_OPERATORS:
+                self.assign(_node.children[0], _node.children[1])
+            elif _node.name == "for":
+                self.lower_for(pending, _node)
+            elif _node.name == "if_statement":
+                self.lower_if(pending, _node)
+            else:
+                self.value(_node)  # an expression statement, left to dead code elimination
+        return self.program
+
+    def emit(self, opcode: int, value_type: int, operands: tuple) -> int:
+        value = self.program.new_value(opcode, value_type, operands)
+        self.block.values.append(value)
+        return value
+
+    def start(self, block: SSABlock) -> None:
+        self.program.start(block)
+        self.block = block
+
+    def value_type(self, _node: ASTNODE) -> int:
+        return FLOAT if self.types.get(unwrap(_node)) == FLOAT else INTEGER
+
+    # the constant 0 of a type, defined in the entry block so that it dominates every use
+    def zero(self, value_type: int) -> int:
+        value = self.zeroes.get(value_type)
+        if value is None:
+            value = self.program.new_value(OP_CONST, value_type, (0.0 if value_type == FLOAT else 0,))
+            self.program.blocks[0].values.append(value)
+            self.zeroes[value_type] = value
+        return value
+
+    def read(self, _node: ASTNODE) -> int:
+        variable = self.layout.slot(_node)
+        value = self.definitions.get(variable)
+        if value is None:
+            value = self.definitions[variable] = self.zero(self.value_type(_node))
+        return value
+
+    def assign(self, name: ASTNODE, expression: ASTNODE) -> None:
+        value = self.value(expression)
+        if unwrap(expression).name == "name":
+            value = self.emit(OP_COPY, self.program.types[value], (value,))
+        self.definitions[self.layout.slot(name)] = value
+
+    # the value of an expression, built bottom up with an explicit stack; an (opcode, node) entry builds the
+    # node from the values of its operands, which are on top of results
+    def value(self, root: ASTNODE) -> int:
+        results = []
+        pending = [unwrap(root)]
+        while pending:
+            _node = pending.pop()
+            if type(_node) is tuple:
+                opcode, _node = _node
+                count = 1 if opcode == OP_ABS else 2
+                operands = tuple(results[len(results) - count:])
+                del results[len(results) - count:]
+                results.append(self.emit(opcode, self.value_type(_node), operands))
+                continue
+            parts = binary_parts(_node)
+            if parts is not None:
+                operator, left, right = parts
+                if operator not in OPERATOR_OPCODES:
+                    raise SSAError("Unknown operator {}".format(operator))
+                pending.append((OPERATOR_OPCODES[operator], _node))
+                pending.append(unwrap(right))
+                pending.append(unwrap(left))
+            elif _node.name == "name":
+                results.append(self.read(_node))
+            elif _node.name == "number":
+                value_type = self.value_type(_node)
+                number = float(_node.value[0]) if value_type == FLOAT else int(_node.value[0])
+                results.append(self.emit(OP_CONST, value_type, (number,)))
+            elif _node.name == "expression" and _node.value == "abs":
+                pending.append((OP_ABS, _node))
+                pending.append(unwrap(_node.children[0]))
+            else:
+                raise SSAError("Unsupported expression {}".format(_node.value if _node.value else _node.name))
+        return results[0]
+
+    # end the current block with a branch on a condition
+    def branch(self, condition: ASTNODE, taken: SSABlock, next_block: SSABlock) -> None:
+        self.block.condition = self.value(condition)
+        self.block.taken = taken
+        self.block.next = next_block
+
+    # join the variables coming from the blocks in arms, a list of (block, definitions), at the start of a block
+    def join(self, block: SSABlock, arms: list) -> None:
+        block.preds = [pred for pred, _ in arms]
+        self.start(block)
+        variables = {}
+        for _, definitions in arms:
+            variables.update(definitions)
+        joined = {}
+        for variable, value in variables.items():
+            values = [definitions.get(variable) for _, definitions in arms]
+            if all(other == value for other in values):
+                joined[variable] = value
+                continue
+            value_type = self.program.types[value]
+            values = tuple(self.zero(value_type) if other is None else other for other in values)
+            joined[variable] = self.program.new_value(OP_PHI, value_type, values)
+            block.phis.append(joined[variable])
+        self.definitions = joined
+
+    # the condition branches to the then block, or to the else block or the join
+    def lower_if(self, pending: list, _node: ASTNODE) -> None:
+        then_block = SSABlock(self.block.depth)
+        join_block = SSABlock(self.block.depth)
+        else_block = SSABlock(self.block.depth) if len(_node.children) == 3 else join_block
+        self.branch(_node.children[0], then_block, else_block)
+        head = self.block
+        before = self.definitions
+        arms = []
+        pending.append((self.join, join_block, arms))
+        if len(_node.children) == 3:
+            pending.append((self.leave, join_block, arms))
+            pending.append(_node.children[2])
+            pending.append((self.enter, else_block, head, before))
+        else:
+            arms.append((head, before))
+        pending.append((self.leave, join_block, arms))
+        pending.append(_node.children[1])
+        pending.append((self.enter, then_block, head, before))
+
+    # start the single successor of the block ending in a branch, with the variables as they were there
+    def enter(self, block: SSABlock, head: SSABlock, definitions: dict) -> None:
+        block.preds = [head]
+        self.start(block)
+        self.definitions = dict(definitions)
+
+    # the current block goes on to a join
+    def leave(self, join_block: SSABlock, arms: list) -> None:
+        self.block.next = join_block
+        arms.append((self.block, self.definitions))
+
+    # guard, body with its phis, step and the test at the bottom branching back to the body, then the exit
+    def lower_for(self, pending: list, _node: ASTNODE) -> None:
+        if len(_node.children) == 4:
+            init, condition, step, body = _node.children
+        else:
+            init = step = None
+            condition, body = _node.children
+        depth = self.block.depth
+        loop = Loop(_node, condition, SSABlock(depth + 1), SSABlock(depth))
+        pending.append((self.end_loop, loop))
+        if step is not None:
+            pending.append(step)
+        pending.append(body)
+        pending.append((self.enter_loop, loop))
+        if init is not None:
+            pending.append(init)
+
+    # branch around the loop, then start the body with a phi for every variable the loop assigns
+    def enter_loop(self, loop: Loop) -> None:
+        self.branch(loop.condition, loop.body, loop.exit)
+        loop.guard = self.block
+        loop.guard_definitions = self.definitions
+        definitions = dict(self.definitions)
+        parts = loop.node.children[1:] if len(loop.node.children) == 4 else loop.node.children
+        pending = list(parts)
+        while pending:
+            _node = pending.pop()
+            if _node.name == "assign" and _node.value in ASSIGNMENT_OPERATORS:
+                variable = self.layout.slot(_node.children[0])
+                if variable not in loop.phis:
+                    value = self.definitions.get(variable)
+                    if value is None:
+                        value = self.zero(self.value_type(_node.children[0]))
+                    phi = self.program.new_value(OP_PHI, self.program.types[value], (value,))
+                    loop.body.phis.append(phi)
+                    loop.phis[variable] = definitions[variable] = phi
+            pending.extend(_node.children)
+        self.start(loop.body)
+        self.definitions = definitions
+
+    # the test at the bottom branches back to the body, whose phis get their second operand, or to the exit
+    def end_loop(self, loop: Loop) -> None:
+        self.branch(loop.condition, loop.body, loop.exit)
+        latch = self.block
+        loop.body.preds = [loop.guard, latch]
+        for variable, phi in loop.phis.items():
+            self.program.operands[phi] += (self.definitions[variable],)
+        self.join(loop.exit, [(loop.guard, loop.guard_definitions), (latch, self.definitions)])
+
+
+# ----------------------------------------------------------------------------------------------------------
+# passes; each one returns the number of values it removed or replaced
+
+# replace the uses of copies, and of phis whose operands are one value, by their source
+def propagate_copies(program: SSAProgram) -> int:
+    opcodes = program.opcodes
+    operands = program.operands
+    forward = {}
+
+    def resolve(value: int) -> int:
+        source = forward.get(value)
+        if source is None:
+            return value
+        path = []
+        while source is not None:
+            path.append(value)
+            value, source = source, forward.get(source)
+        for step in path:
+            forward[step] = value
+        return value
+
+    for block in program.blocks:
+        for value in block.values:
+            if opcodes[value] == OP_COPY:
+                forward[value] = operands[value][0]
+    changed = True
+    while changed:
+        changed = False
+        for block in program.blocks:
+            for value in block.phis:
+                if value in forward:
+                    continue
+                sources = {resolve(operand) for operand in operands[value]}
+                sources.discard(value)
+                if len(sources) == 1:
+                    forward[value] = sources.pop()
+                    changed = True
+    if not forward:
+        return 0
+    for block in program.blocks:
+        block.phis = array("I", [value for value in block.phis if value not in forward])
+        block.values = array("I", [value for value in block.values if value not in forward])
+        for value in block.phis:
+            operands[value] = tuple(resolve(operand) for operand in operands[value])
+        for value in block.values:
+            if opcodes[value] != OP_CONST:
+                operands[value] = tuple(resolve(operand) for operand in operands[value])
+        if block.condition is not None:
+            block.condition = resolve(block.condition)
+    return len(forward)
+
+
+# turn a value into a copy of an equal value that dominates it; the copies are left to propagate_copies
+def number_values(program: SSAProgram) -> int:
+    opcodes = program.opcodes
+    types = program.types
+    operands = program.operands
+    idom = program.dominators()
+    children = [[] for _ in program.blocks]
+    for index, parent in enumerate(idom):
+        if parent is not None and parent != index:
+            children[parent].append(program.blocks[index])
+    leader = {}
+    table = {}
+    replaced = 0
+    pending = [program.blocks[0]]
+    while pending:
+        block = pending.pop()
+        if type(block) is list:
+            for key in block:
+                del table[key]  # leaving the dominator subtree the keys were added in
+            continue
+        added = []
+        for value in list(block.phis) + list(block.values):
+            opcode = opcodes[value]
+            if opcode == OP_CONST:
+                key = (OP_CONST, types[value], repr(operands[value][0]))
+            else:
+                operands[value] = tuple(leader.get(operand, operand) for operand in operands[value])
+                if opcode == OP_PRINT or opcode == OP_COPY:
+                    continue
+                if opcode != OP_PHI and fold(program, value):
+                    opcode = OP_CONST
+                if opcode == OP_CONST:
+                    key = (OP_CONST, types[value], repr(operands[value][0]))
+                elif opcode == OP_PHI:
+                    key = (OP_PHI, block.index, operands[value])
+                elif opcode in COMMUTATIVE:
+                    key = (opcode, types[value], tuple(sorted(operands[value])))
+                else:
+                    key = (opcode, types[value], operands[value])
+            existing = table.get(key)
+            if existing is None:
+                table[key] = value
+                added.append(key)
+            else:
+                leader[value] = existing
+                opcodes[value] = OP_COPY
+                operands[value] = (existing,)
+                replaced += 1
+        if block.condition is not None:
+            block.condition = leader.get(block.condition, block.condition)
+        pending.append(added)
+        pending.extend(children[block.index])
+    # a phi replaced by another one is a copy in the phi list, move it to the values for propagate_copies
+    for block in program.blocks:
+        copies = [value for value in block.phis if opcodes[value] == OP_COPY]
+        if copies:
+            block.phis = array("I", [value for value in block.phis if opcodes[value] != OP_COPY])
+            block.values = array("I", copies) + block.values
+    return replaced
+
+
+# turn a value whose operands are all constants into a constant, as ConstantFolder would; False when it can't be
+# done at compile time
+def fold(program: SSAProgram, value: int) -> bool:
+    constants = []
+    for operand in program.operands[value]:
+        if program.opcodes[operand] != OP_CONST:
+            return False
+        constants.append((program.operands[operand][0], "float" if program.types[operand] == FLOAT else "integer"))
+    operator = OPERATORS[program.opcodes[value]]
+    if len(constants) == 1 or operator in ("min", "max"):
+        folded = evaluate_intrinsic(operator, constants)
+    else:
+        folded = evaluate_binary(operator, *constants)
+    if folded is None:
+        return False
+    program.opcodes[value] = OP_CONST
+    program.operands[value] = (float(folded[0]) if program.types[value] == FLOAT else int(folded[0]),)
+    return True
+
+
+# a branch on a constant becomes a jump, and the blocks that can't be reached any more are removed along with
+# the phi operands coming from them
+def remove_unreachable(program: SSAProgram) -> int:
+    for block in program.blocks:
+        condition = block.condition
+        if condition is not None and program.opcodes[condition] == OP_CONST:
+            if program.operands[condition][0]:
+                block.next = block.taken
+            block.condition = block.taken = None
+    reachable = set(reverse_postorder(program.blocks[0]))
+    if len(reachable) == len(program.blocks) and all(
+            all(block in pred.successors() for pred in block.preds) for block in program.blocks):
+        return 0
+    removed = 0
+    blocks = []
+    for block in program.blocks:
+        if block not in reachable:
+            removed += len(block.phis) + len(block.values)
+            continue
+        kept = [index for index, pred in enumerate(block.preds) if pred in reachable and block in pred.successors()]
+        if len(kept) != len(block.preds):
+            for phi in block.phis:
+                program.operands[phi] = tuple(program.operands[phi][index] for index in kept)
+            block.preds = [block.preds[index] for index in kept]
+        block.index = len(blocks)
+        blocks.append(block)
+    program.blocks = blocks
+    return removed
+
+
+# keep what the prints and branches need, remove everything else
+def eliminate_dead_code(program: SSAProgram) -> int:
+    live = bytearray(len(program.opcodes))
+    pending = []
+    for block in program.blocks:
+        pending.extend(value for value in block.values
+                       if program.opcodes[value] == OP_PRINT or may_trap_value(program, value))
+        if block.condition is not None:
+            pending.append(block.condition)
+    while pending:
+        value = pending.pop()
+        if not live[value]:
+            live[value] = 1
+            pending.extend(program.uses(value))
+    removed = 0
+    for block in program.blocks:
+        phis = array("I", [value for value in block.phis if live[value]])
+        values = array("I", [value for value in block.values if live[value]])
+        removed += len(block.phis) - len(phis) + len(block.values) - len(values)
+        block.phis = phis
+        block.values = values
+    return removed
+
+
+# an int division or remainder whose divisor isn't a nonzero constant, which traps when the divisor is 0
+def may_trap_value(program: SSAProgram, value: int) -> bool:
+    opcode = program.opcodes[value]
+    if (opcode != OP_DIV and opcode != OP_REM) or program.types[value] != INTEGER:
+        return False
+    divisor = program.operands[value][1]
+    return program.opcodes[divisor] != OP_CONST or program.operands[divisor][0] == 0
+
+
+PASSES = (
+    ("copy propagation", propagate_copies),
+    ("value numbering", number_values),
+    ("unreachable code", remove_unreachable),
+    ("copy propagation", propagate_copies),
+    ("dead code", eliminate_dead_code),
+)
+
+
+# build the SSA form of a program and run the passes; returns the program and a list of (pass, seconds,
+# values changed, values left), the first entry being the construction
+def build_ssa(ast: ASTNODE, types: dict, layout) -> tuple:
+    start = time.perf_counter()
+    program = SSABuilder(types, layout).build(ast)
+    timings = [("build", time.perf_counter() - start, program.value_count(), program.value_count())]
+    for pass_name, run in PASSES:
+        start = time.perf_counter()
+        changed = run(program)
+        timings.append((pass_name, time.perf_counter() - start, changed, program.value_count()))
+    return program, timings
+
+
+def format_timings(timings: list) -> list:
+    lines = ["{:>18} {:>10} {:>8} {:>8}".format("pass", "ms", "changed", "values")]
+    for pass_name, seconds, changed, values in timings:
+        lines.append("{:>18} {:>10.3f} {:>8} {:>8}".format(pass_name, seconds * 1000, changed, values))
+    return lines
+
+
+# dump a program's IR before and after the passes, or compare the emitter modes on the sample programs
+if __name__ == "__main__":
+    import sys
+    import go_grammar
+    from ConstantFolder import ConstantFolder
+    from DataLayout import DataLayout
+    from MIPS32_Emitter import MIPS32Emitter
+    from MIPS32_Simulator import MIPS32Simulator
+    from ReadFile import ReadFile
+    from SamplePrograms import SAMPLE_PROGRAMS
+    from TypeChecker import TypeChecker
+
+    def parse(source: str) -> ASTNODE:
+        go_grammar.lexer.lineno = 1
+        ast = go_grammar.parser.parse(source)
+        ConstantFolder().fold(ast)
+        return ast
+
+    if len(sys.argv) > 1:
+        source_file = ReadFile(sys.argv[1])
+        if source_file.error:
+            print(source_file.error_message)
+            sys.exit(1)
+        ast = parse(source_file.raw_text)
+        types = TypeChecker(ast).types
+        program = SSABuilder(types, DataLayout(ast, types=types)).build(ast)
+        print("\n".join(["; as built"] + program.dump()))
+        program, timings = build_ssa(ast, types, DataLayout(ast, types=types))
+        print("\n".join(["; after the passes"] + program.dump()))
+        print("\n".join(format_timings(timings)))
+        sys.exit(0)
+
+    programs = dict(SAMPLE_PROGRAMS)
+    programs["redundant"] = """var a = 6
+var b = 7
+var unused = a * b * 100
+for var i = 0; i < 200; i = i + 1 {
+    var x = a * b + i
+    var y = b * a + i
+    var z = x
+    a + b
+    fmt.Println(z + y)
+}
+"""
+    print("{:>10} {:>9} {:>13} {:>13}  {}".format("program", "mode", "listed", "instructions", "output"))
+    for program_name, source in programs.items():
+        for mode in MIPS32Emitter.modes:
+            lines = list(MIPS32Emitter(mode=mode).iter_lines(parse(source)))
+            listed = sum(1 for line in lines if not line.startswith(".") and not line.endswith(":") and
+                         ".word" not in line and ".double" not in line)
+            result = MIPS32Simulator().run(lines)
+            output = result.output.split()
+            print("{:>10} {:>9} {:>13} {:>13}  {}".format(program_name, mode, listed, result.instructions,
+                                                         output if len(output) < 8 else output[:3] + ["..."]))
+    ast = parse(programs["redundant"])
+    types = TypeChecker(ast).types
+    program, timings = build_ssa(ast, types, DataLayout(ast, types=types))
+    print("\n".join(program.dump()))
+    print("\n".join(format_timings(timings)))
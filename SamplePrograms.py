@@ -0,0 +1,45 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Sample programs written in the subset of Go accepted by go_grammar.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - "Concreate syntax/factorial.go" and "Concreate syntax/fibonacci.go" are full Go programs; the grammar
+    does not accept package/func/:= yet, so these are the same programs as written in the comments of
+    the "Assembly code/" files.
+
+"""
+
+FACTORIAL = """var x = 5
+var ans = 1
+for x > 1 {
+    ans = ans * x
+    x = x - 1
+}
+fmt.Println(ans)
+"""
+
+FIBONACCI = """var n = 10
+if n <= 0 {
+    fmt.Println(0)
+} else {
+    var previous = 0
+    var current = 1
+    if n == 1 {
+        fmt.Println(1)
+    } else {
+        for var i = 2; i <= n; i = i + 1 {
+            var next = previous + current
+            previous = current
+            current = next
+        }
+        fmt.Println(current)
+    }
+}
+"""
+
+SAMPLE_PROGRAMS = {
+    "factorial": FACTORIAL,
+    "fibonacci": FIBONACCI,
+}
@@ -3,11 +3,15 @@
 #  Course:  CSC386 Fall 2021
 # Purpose:  Create a class for stacks
 # History:
+#           2026-10-18, TP, underflow is caught from the list instead of checked before every operation, the methods
+#                           taking several items check once and work on slices, types are compared by identity;
+#                           added pop_n(), push_n() and IntStack
 #           2023-04-04, DMW, added check for underflow on the peek methods
 #           2023-03-27, DMW, updated for CSC420 Programming Languages
 #           2021-09-19, DMW, added many stack manipulating methods
 #           2021-09-08, DMW, created
 
+from array import array
 from Common import Common
 
 
@@ -27,8 +31,10 @@ class Stack:
 
     # duplicate the top of stack
     def dup(self):
-        self.check_underflow(1)
-        self.stack.append(self.stack[-1])
+        try:
+            self.stack.append(self.stack[-1])
+        except IndexError:
+            raise IndexError("Stack underflow.") from None
 
     # drop, without returning the value, the top of the stack
     def drop(self):
@@ -36,70 +42,80 @@ class Stack:
 
     # drop everything on the stack
     def drop_all(self):
-        self.stack = []
+        del self.stack[:]
 
     # drop n items on the stack
     def drop_n(self):
-        self.check_underflow(1)
         n = self.pop()
         self.check_underflow(n)
-        for i in range(0, n):
-            self.drop()
+        if n > 0:
+            del self.stack[-n:]
 
     # the tertiary operator
     def question(self):
         self.check_underflow(3)
-        cond = self.pop()  # get the condition to be tested
-        false = self.pop()  # get the result if false
-        true = self.pop()  # get the result if true
-        self.push(true if cond else false)
+        stack = self.stack
+        cond = stack.pop()  # get the condition to be tested
+        false = stack.pop()  # get the result if false
+        stack[-1] = stack[-1] if cond else false  # the result if true is left in place
 
     def is_top_int(self):
-        if self.top_type() == 'int':
-            return True
-        return False
+        return type(self.stack[-1]) is int
 
     # make a list
     def make_list(self):
         self.check_top_int() # the top of the stack should be an integer, and is the size of the list
-        n = self.pop()
+        n = self.stack.pop()
         self.check_underflow(n) # make sure there are n items on the stack, or there is an underflow
-        l = []
-        for i in range(0, n):
-            l.insert(0, self.pop())
-        self.push(l)
+        self.push(self.pop_n(n) if n > 0 else [])
 
     # generic peek stack function
     def peek(self, item=1):
+        if item > 0:
+            try:
+                return self.stack[-item]
+            except IndexError:
+                raise IndexError("Stack underflow.") from None
         self.check_underflow(item)
         return self.stack[-item]
 
     # peek stack functions
     def peek_x(self):
-        self.check_underflow(1)
-        return self.peek()
+        return self.peek(1)
 
     def peek_y(self):
-        self.check_underflow(2)
         return self.peek(2)
 
     def peek_z(self):
-        self.check_underflow(3)
         return self.peek(3)
 
     def peek_t(self):
-        self.check_underflow(4)
         return self.peek(4)
 
     # pop the last item off the stack
     def pop(self):
-        self.check_underflow(1)
-        return self.stack.pop()
+        try:
+            return self.stack.pop()
+        except IndexError:
+            raise IndexError("Stack underflow.") from None
+
+    # pop the top n items with one underflow check, as a list in stack order (the top item last)
+    def pop_n(self, n: int) -> list:
+        self.check_underflow(n)
+        if n <= 0:
+            return []
+        items = list(self.stack[-n:])
+        del self.stack[-n:]
+        return items
 
     # push an item onto the stack
     def push(self, item):
         self.stack.append(item)
 
+    # push the items in order, the last one ends up on top
+    def push_n(self, items):
+        self.stack.extend(items)
+
     # rotate the third item to the top of the stack
     def rot(self):
         self.check_underflow(3)
@@ -118,10 +134,8 @@ class Stack:
     # swap the top two stack items
     def swap(self):
         self.check_underflow(2)
-        tmp_x = self.pop()
-        tmp_y = self.pop()
-        self.push(tmp_x)
-        self.push(tmp_y)
+        stack = self.stack
+        stack[-1], stack[-2] = stack[-2], stack[-1]
 
     # for internal use by class Stack
     def top_type(self, depth = -1):
@@ -129,17 +143,159 @@ class Stack:
 
     # to be used by RPL programs
     def type(self):
-        self.check_underflow(1)
-        self.push(Common.object_type(self.stack.pop()))
+        self.push(Common.object_type(self.pop()))
+
+
+# a stack of 64 bit integers in an array: a quarter of the memory of a list of ints, and no int objects are kept
+# alive; pushing anything else raises TypeError (OverflowError for ints out of range), true() and false() push 1
+# and 0, and make_list() and type() are not available
+class IntStack(Stack):
+    def __init__(self):
+        super().__init__()
+        self.stack = array("q")
+
+    def is_top_int(self):
+        self.peek(1)
+        return True
+
+    def make_list(self):
+        raise TypeError("An IntStack holds integers only.")
+
+    def top_type(self, depth = -1):
+        self.peek(-depth)
+        return "int"
+
+    def type(self):
+        raise TypeError("An IntStack holds integers only.")
 
 
+# a microbenchmark of every public method against the previous Stack, which checked for underflow before every
+# operation, and against IntStack
 if __name__ == "__main__":
+    import timeit
+
     x = Stack()
     x.push(13)
     for i in range(0, 6):
         x.push(i)
     x.push(6)
-    #print(x.stack)
     x.make_list()
     x.push(17)
     print(x.stack)
+
+    class CheckedStack(Stack):
+        def dup(self):
+            self.check_underflow(1)
+            self.stack.append(self.stack[-1])
+
+        def drop_n(self):
+            self.check_underflow(1)
+            n = self.pop()
+            self.check_underflow(n)
+            for i in range(0, n):
+                self.drop()
+
+        def question(self):
+            self.check_underflow(3)
+            cond = self.pop()
+            false = self.pop()
+            true = self.pop()
+            self.push(true if cond else false)
+
+        def is_top_int(self):
+            if self.top_type() == 'int':
+                return True
+            return False
+
+        def make_list(self):
+            self.check_top_int()
+            n = self.pop()
+            self.check_underflow(n)
+            l = []
+            for i in range(0, n):
+                l.insert(0, self.pop())
+            self.push(l)
+
+        def peek(self, item=1):
+            self.check_underflow(item)
+            return self.stack[-item]
+
+        def peek_x(self):
+            self.check_underflow(1)
+            return self.peek()
+
+        def peek_y(self):
+            self.check_underflow(2)
+            return self.peek(2)
+
+        def peek_z(self):
+            self.check_underflow(3)
+            return self.peek(3)
+
+        def peek_t(self):
+            self.check_underflow(4)
+            return self.peek(4)
+
+        def pop(self):
+            self.check_underflow(1)
+            return self.stack.pop()
+
+        def swap(self):
+            self.check_underflow(2)
+            tmp_x = self.pop()
+            tmp_y = self.pop()
+            self.push(tmp_x)
+            self.push(tmp_y)
+
+        def type(self):
+            self.check_underflow(1)
+            self.push(Common.object_type(self.stack.pop()))
+
+        # the batch methods, item by item
+        def pop_n(self, n: int) -> list:
+            return [self.pop() for _ in range(n)][::-1]
+
+        def push_n(self, items):
+            for item in items:
+                self.push(item)
+
+    # statement run on a stack s holding 1, 2, 3, 4 that leaves it as it was
+    benchmarks = [
+        ("push/pop", "s.push(5); s.pop()"),
+        ("dup/drop", "s.dup(); s.drop()"),
+        ("swap", "s.swap()"),
+        ("rot", "s.rot(); s.rot(); s.rot()"),
+        ("question", "s.push(5); s.push(0); s.push(1); s.question(); s.pop()"),
+        ("peek", "s.peek(2)"),
+        ("peek_x", "s.peek_x()"),
+        ("peek_y", "s.peek_y()"),
+        ("peek_z", "s.peek_z()"),
+        ("peek_t", "s.peek_t()"),
+        ("is_top_int", "s.is_top_int()"),
+        ("top_type", "s.top_type()"),
+        ("size", "s.size()"),
+        ("true/false", "s.true(); s.false(); s.pop(); s.pop()"),
+        ("check_underflow", "s.check_underflow(4)"),
+        ("check_top_int", "s.check_top_int()"),
+        ("type", "s.type(); s.pop(); s.push(4)"),
+        ("pop_n/push_n 1000", "s.push_n(items); s.pop_n(1000)"),
+        ("make_list 1000", "s.push_n(items); s.push(1000); s.make_list(); s.pop()"),
+        ("drop_n 1000", "s.push_n(items); s.push(1000); s.drop_n()"),
+        ("drop_all", "s.drop_all(); s.push_n(items[:4])"),
+    ]
+    print("{:>18} {:>14} {:>14} {:>14}  (microseconds per statement)".format(
+        "method", "checked", "Stack", "IntStack"))
+    for label, statement in benchmarks:
+        timings = []
+        for stack_class in (CheckedStack, Stack, IntStack):
+            if stack_class is IntStack and ("type" in statement or "make_list" in statement):
+                timings.append(None)
+                continue
+            s = stack_class()
+            s.push_n([1, 2, 3, 4])
+            number = 200 if "1000" in label else 100000
+            namespace = {"s": s, "items": list(range(1000))}
+            seconds = min(timeit.repeat(statement, number=number, repeat=3, globals=namespace))
+            timings.append(seconds / number * 1e6)
+        print("{:>18} {:>14.3f} {:>14.3f} {:>14}".format(
+            label, timings[0], timings[1], "-" if timings[2] is None else "{:.3f}".format(timings[2])))
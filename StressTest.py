@@ -0,0 +1,93 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Stress benchmark: compile generated programs of 10^3 to 10^6 statements and check that compile time
+         grows linearly and that the Python stack stays shallow whatever the program size.
+Course: CSC 486 - Compilers Design and Implementation
+
+Notes:
+  - BASE compiler: Prof. Deanna Wilborne
+  - usage: python StressTest.py [MAX_STATEMENTS]      (default 10^5; 10^6 needs a few GB of memory)
+  - Every program is parsed, constant folded and emitted in both modes with the recursion limit set only
+    NESTING_ALLOWANCE frames above the depth the benchmark starts at, so a walker that recursed once per
+    statement, per nested block or per operator would raise RecursionError.
+  - The programs mix assignments, prints, if statements and for loops, and end with an if statement nested
+    1000 deep and an expression of 1000 operators, so depth in the tree is tested as well as length.
+
+"""
+import gc
+import sys
+import time
+import go_grammar
+from ASTNODE import SlotNode
+from CompilerSession import CompilerSession
+
+NESTING_ALLOWANCE = 60
+NESTED_BLOCKS = 1000
+LONG_EXPRESSION = 1000
+
+
+# a program of about statement_count statements
+def generate(statement_count: int, nested: bool = True) -> str:
+    lines = ["var total = 0"]
+    for index in range(statement_count // 5):
+        lines.append("var v{0} = {1} * 3 + total % 7".format(index % 100, index))
+        lines.append("total = total + v{0}".format(index % 100))
+        lines.append("if total > {0} {{\ntotal = total - {0}\n}} else {{\ntotal = total + 1\n}}".format(index))
+        lines.append("for var i = 0; i < 2; i = i + 1 {\ntotal = total + i\n}")
+        lines.append("fmt.Println(total)")
+    if nested:
+        lines.append("if total > 0 {\n" * NESTED_BLOCKS + "fmt.Println(total)\n" + "}\n" * NESTED_BLOCKS)
+    return "\n".join(lines) + "\n"
+
+
+# compile a source with the recursion limit just above the current depth; returns (seconds, lines)
+def compile_shallow(session: CompilerSession, source: str) -> tuple:
+    depth = len_stack()
+    limit = sys.getrecursionlimit()
+    gc.collect()
+    start = time.perf_counter()
+    sys.setrecursionlimit(depth + NESTING_ALLOWANCE)
+    try:
+        result = session.compile(source)
+    finally:
+        sys.setrecursionlimit(limit)
+    seconds = time.perf_counter() - start
+    if not result.success:
+        raise RuntimeError("; ".join(str(diagnostic) for diagnostic in result.diagnostics))
+    return seconds, len(result.lines)
+
+
+# the number of frames on the Python stack
+def len_stack() -> int:
+    frame = sys._getframe()
+    depth = 0
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+if __name__ == "__main__":
+    max_statements = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 5
+    sessions = [CompilerSession(mode=mode, node_class=SlotNode) for mode in ("stack", "register")]
+    go_grammar.parser.parse("var x = 1\n")  # load everything before the limit is lowered
+
+    print("recursion limit during compilation: {} frames above the caller".format(NESTING_ALLOWANCE))
+    print("{:>10} {:>9} {:>10} {:>11} {:>10} {:>11}".format(
+        "statements", "mode", "seconds", "us/stmt", "asm lines", "us/line"))
+    sizes = [size for size in (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6) if size <= max_statements]
+    for size in sizes:
+        source = generate(size)
+        for session in sessions:
+            seconds, line_count = compile_shallow(session, source)
+            print("{:>10} {:>9} {:>10.3f} {:>11.2f} {:>10} {:>11.3f}".format(
+                size, session.mode, seconds, seconds / size * 1e6, line_count, seconds / line_count * 1e6))
+
+    for initial, kind in (("1", "an int"), ("1.5", "a float64")):
+        long_expression = "var x = {}\nfmt.Println(".format(initial) + " + ".join(["x"] * LONG_EXPRESSION) + ")\n"
+        for mode in ("stack", "register"):
+            seconds, line_count = compile_shallow(CompilerSession(fold=False, mode=mode, node_class=SlotNode),
+                                                  long_expression)
+            print("{} expression of {} operators, {} mode: {:.3f}s, {} lines".format(
+                kind, LONG_EXPRESSION, mode, seconds, line_count))
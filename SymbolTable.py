@@ -6,38 +6,164 @@ Course: CSC 486 - Compilers Design and Implementation
 
 Notes:
   - BASE compiler: Prof. Deanna Wilborne
-  - The Go Programming Language Specification: https://go.dev/ref/spec 
+  - The Go Programming Language Specification: https://go.dev/ref/spec
+  - 2026-10-18: scopes are chained. symbols maps a name to the symbol declared last, which keeps the symbol
+    it shadows in .shadowed; leaving a scope only marks its Scope closed, and the symbols of closed scopes
+    are dropped the next time their name is looked up or declared. enter_scope() and exit_scope() are
+    O(1), lookup() and add() amortized O(1), and an outer symbol is visible again when the inner scope
+    that shadowed it is left.
+  - Names are interned, FastLexer interns the NAME tokens too, so most dict probes compare by identity.
 
 """
+from sys import intern
+
+
+class Scope:
+    __slots__ = ("level", "open")
+
+    def __init__(self, level: int) -> None:
+        self.level = level
+        self.open = True
+
 
 class Symbol:
-    def __init__(self, name, type, scope_level, attributes=None):
+    __slots__ = ("name", "type", "scope_level", "attributes", "scope", "shadowed")
+
+    def __init__(self, name, type, scope_level, attributes=None, scope=None, shadowed=None):
         # name: the identifier's name, variable name, function name, etc.
         # type: the type of the symbol, e.g., int, float, string, etc.
         # scope_level: an integer indicating the depth of the scope in which the symbol is declared
         # attributes: a dictionary of additional attributes for the symbol, such as its values, parameters, etc.
+        # scope: the Scope it is declared in
+        # shadowed: the symbol of the same name it hides, from the same or an enclosing scope
         self.name = name
         self.type = type
         self.scope_level = scope_level
         self.attributes = attributes if attributes is not None else {}
+        self.scope = scope
+        self.shadowed = shadowed
+
+    def __repr__(self) -> str:
+        return "Symbol({!r}, {!r}, {})".format(self.name, self.type, self.scope_level)
+
 
 class SymbolTable:
     def __init__(self):
-        self.symbols = {}
+        self.symbols = {}           # name -> the symbol declared last, possibly in a closed scope
+        self.scopes = [Scope(0)]    # the open scopes, innermost last
         self.scope_level = 0
 
     def add(self, name, symbol_type, attributes=None):
-        symbol = Symbol(name, symbol_type, self.scope_level, attributes)
+        name = intern(name)
+        symbol = Symbol(name, symbol_type, self.scope_level, attributes, self.scopes[-1], self.lookup(name))
         self.symbols[name] = symbol
-    
+        return symbol
+
+    # the visible symbol of a name, or None
     def lookup(self, name):
-        return self.symbols.get(name, None)
-    
+        symbol = self.symbols.get(name)
+        if symbol is not None and not symbol.scope.open:
+            while symbol is not None and not symbol.scope.open:
+                symbol = symbol.shadowed
+            if symbol is None:
+                del self.symbols[name]
+            else:
+                self.symbols[name] = symbol
+        return symbol
+
+    # the symbol of a name declared in the innermost scope, or None
+    def lookup_current(self, name):
+        symbol = self.lookup(name)
+        return symbol if symbol is not None and symbol.scope is self.scopes[-1] else None
+
+    # all visible symbols by name
+    def visible_symbols(self) -> dict:
+        visible = {}
+        for name in list(self.symbols):
+            symbol = self.lookup(name)
+            if symbol is not None:
+                visible[name] = symbol
+        return visible
+
     def enter_scope(self):
         self.scope_level += 1
+        self.scopes.append(Scope(self.scope_level))
 
     def exit_scope(self):
-        to_delete = [name for name, sym in self.symbols.items() if sym.scope_level == self.scope_level]
-        for name in to_delete:
-            del self.symbols[name]
-        self.scope_level -= 1
\ No newline at end of file
+        if len(self.scopes) == 1:
+            raise IndexError("No scope to exit.")
+        self.scopes.pop().open = False
+        self.scope_level -= 1
+
+
+# shadowing, then deep nesting and many symbols against the previous table, which deleted the symbols of a
+# scope by scanning all of them and overwrote shadowed ones
+if __name__ == "__main__":
+    import time
+
+    class FlatSymbolTable:
+        def __init__(self):
+            self.symbols = {}
+            self.scope_level = 0
+
+        def add(self, name, symbol_type, attributes=None):
+            self.symbols[name] = Symbol(name, symbol_type, self.scope_level, attributes)
+
+        def lookup(self, name):
+            return self.symbols.get(name, None)
+
+        def enter_scope(self):
+            self.scope_level += 1
+
+        def exit_scope(self):
+            to_delete = [name for name, sym in self.symbols.items() if sym.scope_level == self.scope_level]
+            for name in to_delete:
+                del self.symbols[name]
+            self.scope_level -= 1
+
+    for table_class in (FlatSymbolTable, SymbolTable):
+        table = table_class()
+        table.add("n", "int")
+        table.enter_scope()
+        table.add("n", "float64")
+        inner = table.lookup("n").type
+        table.exit_scope()
+        outer = table.lookup("n")
+        print("{:>15}: n is {} inside, {} after the inner scope".format(
+            table_class.__name__, inner, outer.type if outer is not None else "lost"))
+
+    # nested blocks, each declaring variables of its own and shadowing a few of its parent's, and looking
+    # names up
+    def deep_nesting(table, depth: int, per_scope: int = 8, lookups: int = 16) -> None:
+        shadowing = ["v{}".format(index) for index in range(per_scope // 2)]
+        for level in range(depth):
+            table.enter_scope()
+            names = shadowing + ["l{}_{}".format(level, index) for index in range(per_scope // 2)]
+            for name in names:
+                table.add(name, "int")
+            for index in range(lookups):
+                table.lookup(names[index % per_scope])
+                table.lookup("global")
+        for _ in range(depth):
+            table.exit_scope()
+
+    # many symbols in the outer scope and many short blocks
+    def many_symbols(table, symbols: int, blocks: int) -> None:
+        for index in range(symbols):
+            table.add("g{}".format(index), "int")
+        for index in range(blocks):
+            table.enter_scope()
+            table.add("i", "int")
+            table.add("g{}".format(index), "float64")
+            table.lookup("g{}".format(index + 1))
+            table.exit_scope()
+
+    benchmarks = [("deep nesting, 2000 levels", lambda table: deep_nesting(table, 2000)),
+                  ("20000 symbols, 2000 blocks", lambda table: many_symbols(table, 20000, 2000))]
+    for label, run in benchmarks:
+        for table_class in (FlatSymbolTable, SymbolTable):
+            table = table_class()
+            table.add("global", "int")
+            start = time.perf_counter()
+            run(table)
+            print("{:>27} {:>15}: {:8.4f}s".format(label, table_class.__name__, time.perf_counter() - start))
@@ -4,90 +4,252 @@
 # Purpose:  AST Node Class
 # History:
 #           2024-04-15, DMW, created
+#           2026-10-18, TP, type_check() is a method again and walks the tree without recursion
+#           2026-10-18, TP, checks the node kinds go_grammar produces in one pass and tags every expression and
+#                           name node with INTEGER, FLOAT or STRING in .types; errors are collected in .errors
+#           2026-10-18, TP, sin, cos and tan only take constant arguments, the MIPS32 code has no instruction
+#                           for them and they are evaluated at compile time; a variable is never a constant
+#                           argument, whether or not ConstantFolder knows its value
 #
 #           Copyright (2024) Deanna M. Wilborne
 
+# Types follow Go (https://go.dev/ref/spec#Constants): a number literal is an untyped constant that takes the
+# type of the typed operand it is used with, 1 is a float64 in "f * 1"; a constant expression that is never
+# combined with a typed value gets its default type, int or float64, where it is assigned, printed or tested.
+# Comparisons give an INTEGER, 1 or 0, as everywhere else in this compiler. Names used without a declaration
+# are int variables.
 
 from ASTNODE import ASTNODE
+from SymbolTable import SymbolTable
+
+# the tags; the untyped ones only exist while an expression is being checked
+(INTEGER, FLOAT, STRING, UNTYPED_INTEGER, UNTYPED_FLOAT) = range(5)
+TYPE_NAMES = ("int", "float64", "string", "untyped int", "untyped float")
+DEFAULT_TYPES = (INTEGER, FLOAT, STRING, INTEGER, FLOAT)
+
+ARITHMETIC_OPERATORS = ("+", "-", "*", "/")
+COMPARISON_OPERATORS = ("<", "<=", ">", ">=", "==", "!=")
+FLOAT_FUNCTIONS = ("sin", "cos", "tan")
+
+
+class TypeCheckError(Exception):
+    pass
+
 
 class TypeChecker:
 
     def __init__(self, ast: ASTNODE = None) -> None:
-        self.no_type_nodes = [
-            'program', 'stmt_list', 'block_stmts', 'print'
-        ]
-
-        self.number_types = {
-            'double': 0,
-            'single': 1,
-            'float': 2,
-            'integer': 3
-        }
-
-        # this list should be in the same order as they keys : values in the number_types dictionary
-        self.number_type_names = [
-            'double',
-            'single',
-            'float',
-            'string'
-        ]
+        self.types = {}        # expression and name node -> tag
+        self.errors = []
+        self.symbol_table = SymbolTable()
+        self.undeclared = {}   # name -> tag of a name used without a declaration
 
         if ast is not None:
             self.ast = ast
             self.type_check(self.ast)
 
-        def type_check(self, _node: ASTNODE):
-            # recursively type check a node's children
-            def process_children(_node: ASTNODE) -> None:
-                for _child in _node.children:
-                    self.type_check(_child)
-
-            # if a node doesn't need type information, skip to its children
-            if _node.name in self.no_type_nodes:
-                # print("skipping: {}".format(_node.name))
-                process_children(_node)
-                return
-            
-            # at this point, we have a node where we should have type information;
-            # binop is a good example that has expressions as children nodes, and we should
-            # pull the type up from the expression nodes
-
-            if _node.name == "prt_expr":
-                process_children(_node)
-                _node.value['type'] = _node.children[0].value['type']
-            elif _node.name == "binop":
-                if 'type' not in _node.value:
-                    left_node = _node.children[0]
-                    right_node = _node.children[1]
-                    left_type = left_node.value['type']
-                    right_type = right_node.value['type']
-
-                if left_type == right_type:
-                    _node.value['type'] = left_type
+    # type check a program with an explicit stack, statements in order; an entry is a node or a (method,
+    # arguments...) tuple to call once the nodes pushed above it are checked. Returns the types
+    def type_check(self, _node: ASTNODE) -> dict:
+        pending = [_node]
+        while pending:
+            _node = pending.pop()
+            if type(_node) is tuple:
+                _node[0](*_node[1:])
+            elif _node.name in ["program", "statement_list", "statement"]:
+                pending.extend(reversed(_node.children))
+            elif _node.name == "block_statement":
+                self.symbol_table.enter_scope()
+                pending.append((self.symbol_table.exit_scope,))
+                pending.extend(reversed(_node.children))
+            elif _node.name == "assign" and _node.value == ":=":
+                self.declaration(_node.children[0], _node.children[1])
+            elif _node.name == "assign" and _node.value == "=":
+                self.assignment(_node.children[0], _node.children[1])
+            elif _node.name == "print":
+                self.print_arguments(_node)
+            elif _node.name == "if_statement":
+                self.condition(_node.children[0])
+                pending.extend(reversed(_node.children[1:]))
+            elif _node.name == "for":
+                # the for statement is a scope of its own around the variables its init clause declares
+                self.symbol_table.enter_scope()
+                pending.append((self.symbol_table.exit_scope,))
+                if len(_node.children) == 4:
+                    init, condition, step, body = _node.children
+                    pending.extend([body, step, (self.condition, condition), init])
                 else:
-                    # possible type mismatch, are both types numeric in nature?
-                    if left_type in self.number_types.keys() and right_type in self.number_types.keys():
-                        cast_to_type = min(self.number_types[left_type], self.number_types[right_type])
-                        _node.value['type'] = self.number_type_names[cast_to_type]
-                        # 2024-04-16, DMW, TODO: upconvert numeric cast warning
-                        return
-
-
-                # TODO: if typecasting isn't used at this point there is a TYPE MISMATCH ERROR
-                # print(left_type, " ", right_type)
+                    self.condition(_node.children[0])
+                    pending.append(_node.children[1])
             else:
-                print("Add type checking for node: {}".format(_node.name))
-
-    # 2024-04-15, DMW, TODO: implement unit testing
-    # simple testing of the TypeChecker class
-    if __name__ == "__main__":
-    # 2024-04-15, DMW, test 0001
-        num_left = ASTNODE(name="expr", value={'value': 5, 'type': 'integer'})
-        num_right = ASTNODE(name="expr", value={'value': 14, 'type': 'integer'})
-        binop = ASTNODE(name="binop", value={'op': '+'}, children=[num_left, num_right])
-
-    ASTNODE.render_tree(binop)
-
-    check = TypeChecker(binop)
-
-    ASTNODE.render_tree(binop)
+                self.settle(_node, self.expression(_node))  # an expression statement
+        return self.types
+
+    def error(self, _node: ASTNODE, message: str) -> None:
+        self.errors.append("line {}: {}".format(_node.line, message) if _node.line is not None else message)
+
+    # the tag of a variable, an int variable if it was never declared
+    def variable_type(self, _node: ASTNODE) -> int:
+        symbol = self.symbol_table.lookup(_node.value)
+        if symbol is not None:
+            return symbol.type
+        return self.undeclared.setdefault(_node.value, INTEGER)
+
+    def declaration(self, name: ASTNODE, value: ASTNODE) -> None:
+        value_type = DEFAULT_TYPES[self.expression(value)]
+        self.settle(value, value_type)
+        if self.symbol_table.lookup_current(name.value) is None:
+            self.symbol_table.add(name.value, value_type)
+        else:
+            self.assignment(name, value, value_type)  # declaring a name again in the same block assigns it
+            return
+        self.types[name] = value_type
+
+    def assignment(self, name: ASTNODE, value: ASTNODE, value_type: int = None) -> None:
+        variable_type = self.variable_type(name)
+        self.types[name] = variable_type
+        if value_type is None:
+            value_type = self.expression(value)
+        self.convert(value, value_type, variable_type)
+
+    def print_arguments(self, _node: ASTNODE) -> None:
+        pending = list(_node.children)
+        while pending:
+            argument = pending.pop()
+            if argument.name == "expression" and argument.value == ",":
+                pending.extend(argument.children)
+            else:
+                self.settle(argument, self.expression(argument))
+
+    def condition(self, _node: ASTNODE) -> None:
+        condition_type = DEFAULT_TYPES[self.expression(_node)]
+        self.settle(_node, condition_type)
+        if condition_type != INTEGER:
+            self.error(_node, "non-boolean condition of type {}".format(TYPE_NAMES[condition_type]))
+
+    # tag an expression bottom up with an explicit stack; returns its tag, which may still be untyped
+    def expression(self, root: ASTNODE) -> int:
+        types = self.types
+        pending = [(root, False)]
+        while pending:
+            _node, ready = pending.pop()
+            if _node.name == "number":
+                types[_node] = UNTYPED_INTEGER if _node.value[1] == "integer" else UNTYPED_FLOAT
+            elif _node.name == "name":
+                types[_node] = self.variable_type(_node)
+            elif not _node.children:
+                types[_node] = STRING  # string literals are expression nodes holding the quoted text
+            elif not ready:
+                pending.append((_node, True))
+                pending.extend((child, False) for child in _node.children)
+            elif len(_node.children) == 1:
+                operand_type = types[_node.children[0]]
+                if _node.value is None or _node.value == "abs":
+                    types[_node] = operand_type
+                elif _node.value in FLOAT_FUNCTIONS:
+                    if operand_type < UNTYPED_INTEGER:
+                        self.error(_node, "{} of a non-constant {} value is not supported".format(
+                            _node.value, TYPE_NAMES[operand_type]))
+                    self.convert(_node.children[0], operand_type, FLOAT)
+                    types[_node] = FLOAT
+                else:
+                    self.error(_node, "unknown function {}".format(_node.value))
+                    types[_node] = operand_type
+            else:
+                types[_node] = self.binary(_node)
+        return types[root]
+
+    def binary(self, _node: ASTNODE) -> int:
+        operator = _node.value
+        left, right = _node.children
+        operand_type = self.unify(_node, left, right)
+        if operator in COMPARISON_OPERATORS:
+            self.settle(left, DEFAULT_TYPES[operand_type])
+            self.settle(right, DEFAULT_TYPES[operand_type])
+            return INTEGER
+        if operand_type == STRING and operator != "+" and operator not in ("min", "max"):
+            self.error(_node, "operator {} not defined on string".format(operator))
+        elif operator == "%" and DEFAULT_TYPES[operand_type] == FLOAT:
+            self.error(_node, "operator % not defined on {}".format(TYPE_NAMES[operand_type]))
+        elif operator not in ARITHMETIC_OPERATORS and operator not in ("%", "min", "max"):
+            self.error(_node, "unknown operator {}".format(operator))
+        return operand_type
+
+    # the common type of two operands; an untyped operand is converted to the type of the other one
+    def unify(self, _node: ASTNODE, left: ASTNODE, right: ASTNODE) -> int:
+        left_type = self.types[left]
+        right_type = self.types[right]
+        if left_type == right_type:
+            return left_type
+        if left_type >= UNTYPED_INTEGER and right_type >= UNTYPED_INTEGER:
+            return UNTYPED_FLOAT
+        if left_type >= UNTYPED_INTEGER:
+            self.convert(left, left_type, right_type)
+            return right_type
+        if right_type >= UNTYPED_INTEGER:
+            self.convert(right, right_type, left_type)
+            return left_type
+        self.error(_node, "mismatched types {} and {} for {}".format(TYPE_NAMES[left_type], TYPE_NAMES[right_type],
+                                                                     _node.value))
+        return left_type
+
+    # use an expression where a value of the target type is needed
+    def convert(self, _node: ASTNODE, source: int, target: int) -> None:
+        if source == target or (source == UNTYPED_INTEGER and target in (INTEGER, FLOAT)):
+            self.settle(_node, target)
+        elif source == UNTYPED_FLOAT and target == FLOAT:
+            self.settle(_node, target)
+        elif source == UNTYPED_FLOAT and target == INTEGER and integral_constant(_node):
+            self.settle(_node, target)
+        else:
+            self.error(_node, "cannot use {} value as {} value".format(TYPE_NAMES[source], TYPE_NAMES[target]))
+            self.settle(_node, target)
+
+    # give the untyped nodes of an expression a type; typed subtrees are settled already
+    def settle(self, _node: ASTNODE, target: int) -> None:
+        target = DEFAULT_TYPES[target]
+        types = self.types
+        pending = [_node]
+        while pending:
+            _node = pending.pop()
+            if types.get(_node, UNTYPED_INTEGER) >= UNTYPED_INTEGER:
+                types[_node] = target
+                pending.extend(_node.children)
+
+
+# a float literal that is a whole number can be used as an int, 2.0 in "x * 2.0"
+def integral_constant(_node: ASTNODE) -> bool:
+    while _node.name == "expression" and len(_node.children) == 1 and _node.value is None:
+        _node = _node.children[0]
+    return _node.name == "number" and float(_node.value[0]).is_integer()
+
+
+# type errors of a few programs, then nodes checked per second on large generated programs
+if __name__ == "__main__":
+    import time
+    import go_grammar
+    from StressTest import generate
+
+    programs = ["var f = 2.5\nvar i = 3\nfmt.Println(f * 2, i / 2, f < 3)\n",
+                "var f = 2.5\nvar i = 3\nfmt.Println(f * i)\n",
+                "var i = 3\ni = 2.5\ni = 2.0\n",
+                "var s = \"go\"\nfmt.Println(s + \"pher\", s * 2)\n",
+                "var f = 1.5\nvar i = 2\nfmt.Println(f % 2, sin(2), sin(i), abs(f))\n",
+                "var x = 1.0\nvar y = sin(x)\nfmt.Println(y, cos(1 + 2.5))\n"]
+    for source in programs:
+        go_grammar.lexer.lineno = 1
+        checker = TypeChecker(go_grammar.parser.parse(source))
+        print(source.replace("\n", "; "), "->", checker.errors or "ok")
+
+    for statements, nested in ((20000, True), (200000, False)):
+        ast = go_grammar.parser.parse(generate(statements, nested=nested))
+        nodes = 0
+        pending = [ast]
+        while pending:
+            nodes += 1
+            pending.extend(pending.pop().children)
+        start = time.perf_counter()
+        checker = TypeChecker(ast)
+        seconds = time.perf_counter() - start
+        print("{:>7} statements{}: {} nodes in {:.3f}s, {:,.0f} nodes/s, {} errors".format(
+            statements, " (nested)" if nested else "", nodes, seconds, nodes / seconds, len(checker.errors)))
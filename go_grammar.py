@@ -12,6 +12,24 @@ History:
   - 2024-3-25: Thao Pham created this file.
   - 2024-04-01: Thao Pham edited this file. Working on the core functionality of the compiler. 
   - 2024-04-03: Thao Pham edited this file. Keep working on the core functionality of the compiler.
+  - 2026-10-18: Thao Pham edited this file. The emitter writes the .data/.text sections through a sink.
+  - 2026-10-18: Thao Pham edited this file. Intrinsic nodes carry the function name; constants are folded before emitting.
+  - 2026-10-18: Thao Pham edited this file. The lexer and parser tables are loaded through GrammarCache.
+  - 2026-10-18: Thao Pham edited this file. parser.parse() returns the program node instead of setting a global.
+  - 2026-10-18: Thao Pham edited this file. AST nodes are created by the class in parser.node_class.
+  - 2026-10-18: Thao Pham edited this file. A statement_list holds all the statements of its block; interpret_ast
+                doesn't recurse.
+  - 2026-10-18: Thao Pham edited this file. AST nodes get their line and index; find_column uses a LineIndex.
+  - 2026-10-18: Thao Pham edited this file. A VAR declaration is an assign node with the value ":=".
+  - 2026-10-18: Thao Pham edited this file. interpret_ast compiles to bytecode and runs it on the VM of Bytecode.py
+                instead of walking the tree; it handles variables, if and for statements.
+  - 2026-10-18: Thao Pham edited this file. NUMBER matches the hexadecimal, octal, binary and underscore forms of Go
+                literals; string_to_number classifies them with Common.number_literal.
+  - 2026-10-18: Thao Pham edited this file. A malformed number literal is reported through the lexer's error
+                function (t_error, or the one a CompilerSession sets) instead of being compiled as 0.
+  - 2026-10-18: Thao Pham edited this file. The demo runs LoopOptimizer after folding.
+  - 2026-10-18: Thao Pham edited this file. find_column rfinds back to the start of the line and only builds a
+                LineIndex for lines longer than LineIndex.LONG_LINE.
 
 """
 
@@ -22,8 +40,12 @@ import ply.yacc as yacc             # parser
 from ASTNODE import ASTNODE         # simple class for creating nodes for an Abstract Syntax Tree (AST)
 from Common import Common           # a useful class and method for getting the type of an object
 from ReadFile import ReadFile       # a simple but a useful read file class
-from Stack import Stack             # a simple stack class
-from MIPS32_Emitter import *
+from MIPS32_Emitter import MIPS32Emitter, PrintSink  # MIPS32 code generation
+from ConstantFolder import ConstantFolder  # constant folding and propagation, run before emitting
+from GrammarCache import GrammarCache      # versioned lexer and parser tables
+from LineIndex import source_column        # column of an offset, by rfind or a LineIndex
+from Bytecode import BytecodeCompiler, VirtualMachine  # interpret_ast runs programs on the bytecode VM
+from LoopOptimizer import LoopOptimizer  # loop-invariant code motion and strength reduction
 
 # ------------------------------------------------ STEP 2: SET UP LEXER
 
@@ -66,14 +88,16 @@ tokens += list(reserved.values())
 literals = ["(", ")", "+", "-", "*", "/", "%", "=",
             ";", "{", "}", "<", ">", ","] 
 
-# helper function create a Python int or float as needed
+# helper function create a Python int or float as needed, None for a malformed literal
 def string_to_number(s):
-    try:
-        ans = (int(s), "integer")
-    except ValueError:
-        ans = (float(s), "float")
+    return Common.number_literal(s)
 
-    return ans
+
+# a malformed number literal goes to the lexer's error function as a NUMBER token holding its text; the token
+# is kept with the value 0 so the parser doesn't report errors of its own after it
+def bad_number(lexer, token):
+    lexer.lexerrorf(token)
+    return 0, "integer"
 
 # DEFINE TOKENS PATTERNS
 
@@ -213,11 +237,14 @@ def t_UMINUS(t):
 # noinspection PyPep8Naming
 # noinspection PySingleQuotedDocstring
 def t_NUMBER(t):
-    r'[0-9]*\.?[0-9]+([eE][-+]?[0-9]+)?'  # 2024-02-14, DMW, we'll save floating point for later
+    r'0[xX][0-9a-fA-F_]*(?:\.[0-9a-fA-F_]*)?(?:[pP][-+]?[0-9_]+)?|0[bBoO][0-9_]+|(?:[0-9][0-9_]*\.?|\.[0-9])[0-9_]*(?:[eE][-+]?[0-9_]+)?'
+    # 2026-10-18, TP, every Go int and float literal; malformed ones are reported through t_error()
+    # 2024-02-14, DMW, we'll save floating point for later
     # https://www.regular-expressions.info/floatingpoint.html
     # r'\d+'  # original regular expression -- allow integers only
 
-    t.value = string_to_number(t.value) # int(t.value)
+    value = string_to_number(t.value) # int(t.value)
+    t.value = value if value is not None else bad_number(t.lexer, t)
 
     return t
 
@@ -249,19 +276,26 @@ def t_newline(t):
 # Compute column.
 #     input is the input text string
 #     token is a token instance
+# rfind back to the start of the line, the newlines of the last input_text are only indexed for a long line
+find_column_index = [None, None]  # [input_text, its LineIndex]
+
+
 def find_column(input_text, token):
-    line_start = input_text.rfind('\n', 0, token.lexpos) + 1
-    return (token.lexpos - line_start) + 1
+    return source_column(input_text, token.lexpos, find_column_index)
 
 
 # See sections 4.9 - Error Handling - https://www.dabeaz.com/ply/ply.html
 def t_error(t):
+    if t.type == "NUMBER":  # 2026-10-18, TP, a malformed number literal, already scanned past
+        print("Illegal number literal '%s'" % t.value)
+        return
     print("Illegal character '%s'" % t.value[0])
     t.lexer.skip(1)
 
 # See sections 4.11 - Building and using the lexer - https://www.dabeaz.com/ply/ply.html
-# Build the lexer
-lexer = lex.lex(debug=0)
+# Build the lexer, from the cached tables unless GO_GRAMMAR_DEBUG is set
+grammar_cache = GrammarCache(globals())
+lexer = lex.lex(debug=0, **grammar_cache.lex_options())
 
 # ------------------------------------------------ STEP 3: SET UP THE PARSER
 
@@ -277,17 +311,30 @@ precedence = (
     ('right', 'UMINUS'),
 )
 
-program = None
-
 start = "program"  # set the start production, even though the first production is the start by default
 
 
+# a new AST node of the class the parser building the tree uses, see CompilerSession; its line and index
+# (lexpos) are those of the rule's first token, or of its first child node when the rule starts with one
+def new_node(p, name: str, value=None, children=None):
+    line = index = None
+    for symbol in p.slice[1:]:
+        index = getattr(symbol, "lexpos", None)
+        if index is not None:
+            line = symbol.lineno
+            break
+        index = getattr(symbol.value, "index", None)
+        if index is not None:
+            line = symbol.value.line
+            break
+    return p.parser.node_class(name, value=value, children=children, line=line, index=index)
+
+
 # noinspection PyPep8Naming
 # noinspection PySingleQuotedDocstring
 def p_PROGRAM(p):
     "program : statement_list"
-    global program
-    program = ASTNODE("program", children=[p[1]])
+    p[0] = new_node(p, "program", children=[p[1]])  # returned by parser.parse()
 
 def p_STATEMENTS(p):
     """
@@ -295,18 +342,19 @@ def p_STATEMENTS(p):
                 | statement
     """
     if len(p) == 3:
-        # p[0] = p[1] + [p[2]]
-        p[0] = ASTNODE("statement_list", children=[p[1], p[2]])
+        # one flat statement_list per block instead of a chain nested one level per statement
+        p[1].append_child(p[2])
+        p[0] = p[1]
     else:
         # p[0] = [p[1]]
-        p[0] = ASTNODE("statement_list", children=[p[1]])
+        p[0] = new_node(p, "statement_list", children=[p[1]])
     # ASTNODE.render_tree(p[0])
 
 def p_BLOCK_STATEMENT(p):
     """
     block_statement : '{' statement_list '}'
     """
-    p[0] = ASTNODE("block_statement", children=[p[2]])
+    p[0] = new_node(p, "block_statement", children=[p[2]])
 
 def p_STATEMENT(p):
     """statement : all_prints
@@ -314,7 +362,7 @@ def p_STATEMENT(p):
                 | if_statement
                 | for
                 | expression"""
-    p[0] = ASTNODE("statement", children=[p[1]])
+    p[0] = new_node(p, "statement", children=[p[1]])
 
 def p_all_prints(p):
     """
@@ -333,9 +381,9 @@ def p_if_statement(p):
                  | IF assign block_statement 
     """
     if len(p) == 6:
-        p[0] = ASTNODE("if_statement", children=[p[2], p[3], p[5]])
+        p[0] = new_node(p, "if_statement", children=[p[2], p[3], p[5]])
     else:
-        p[0] = ASTNODE("if_statement", children=[p[2], p[3]])
+        p[0] = new_node(p, "if_statement", children=[p[2], p[3]])
 
 def p_for(p):
     """
@@ -343,9 +391,9 @@ def p_for(p):
         | FOR assign ';' expression ';' statement block_statement
     """
     if len(p) == 4:
-        p[0] = ASTNODE("for", children=[p[2], p[3]])
+        p[0] = new_node(p, "for", children=[p[2], p[3]])
     else: 
-        p[0] = ASTNODE("for", children=[p[2], p[4], p[6], p[7]])
+        p[0] = new_node(p, "for", children=[p[2], p[4], p[6], p[7]])
 
 def p_EXPRESSION(p):
     """
@@ -366,9 +414,9 @@ def p_EXPRESSION(p):
                 | expression ',' expression
     """
     if len(p) == 4:
-        p[0] = ASTNODE("expression", children=[p[1], p[3]])
+        p[0] = new_node(p, "expression", value=p[2], children=[p[1], p[3]])  # keep the operator for the emitter
     else:
-        p[0] = ASTNODE("expression", children=[p[1]])
+        p[0] = new_node(p, "expression", children=[p[1]])
 
 def p_GROUP(p):
     """ 
@@ -382,11 +430,11 @@ def p_expression_UMINUS(p):
 
 def p_number(p):
     "number : NUMBER"
-    p[0] = ASTNODE("number", value=p[1])
+    p[0] = new_node(p, "number", value=p[1])
 
 def p_NAME(p):
     "name : NAME"
-    p[0] = ASTNODE('name', value=p[1])
+    p[0] = new_node(p, 'name', value=p[1])
 
 def p_ASSIGN(p):
     """ 
@@ -398,9 +446,10 @@ def p_ASSIGN(p):
             | name EQ expression
     """
     if len(p) == 4:
-        p[0] = ASTNODE("assign", value=p[2], children=[p[1], p[3]])
+        p[0] = new_node(p, "assign", value=p[2], children=[p[1], p[3]])
     else:
-        p[0] = ASTNODE("assign", value=p[3], children=[p[2], p[4]])
+        # a declaration is marked ":=" so the passes can tell it from an assignment to a visible variable
+        p[0] = new_node(p, "assign", value=":=", children=[p[2], p[4]])
 
 def p_STRING(p):
     """expression : string"""
@@ -410,59 +459,59 @@ def p_EXPRESSION_STRINGS(p):
    """string : SQ_STRING
              | DQ_STRING
    """
-   p[0] = ASTNODE("expression", value=p[1])
+   p[0] = new_node(p, "expression", value=p[1])
 
 # PRINT STATEMENTS:
 
 def p_PRINT(p):
     "print : PRINT '(' expression ')'"
-    p[0] = ASTNODE("print", children=[p[3]])
+    p[0] = new_node(p, "print", children=[p[3]])
 
 def p_PRINTLN(p):
     "println : PRINTLN '(' expression ')'"
-    p[0] = ASTNODE("print", children=[p[3]])
+    p[0] = new_node(p, "print", children=[p[3]])
 
 def p_PRINTF(p):
     "printf : PRINTF '(' expression ')'"
-    p[0] = ASTNODE("print", children=[p[3]])
+    p[0] = new_node(p, "print", children=[p[3]])
 
 def p_FMT_PRINT(p):
     "fmt_print : FMT_PRINT '(' expression ')'"
-    p[0] = ASTNODE("print", children=[p[3]])
+    p[0] = new_node(p, "print", children=[p[3]])
 
 def p_FMT_PRINTLN(p):
     "fmt_println : FMT_PRINTLN '(' expression ')'"
-    p[0] = ASTNODE("print", children=[p[3]])
+    p[0] = new_node(p, "print", children=[p[3]])
 
 def p_FMT_PRINTF(p):
     "fmt_printf : FMT_PRINTF '(' expression ')'"
-    p[0] = ASTNODE("print", children=p[3])
+    p[0] = new_node(p, "print", children=p[3])
 
-# Intrinsic functions
+# Intrinsic functions, the node value is the name of the function
 
 def p_ABS(p):
     "expression : ABS '(' expression ')'"
-    p[0] = ASTNODE("expression", children=[p[3]])
+    p[0] = new_node(p, "expression", value="abs", children=[p[3]])
 
 def p_SIN(p):
     "expression : SIN '(' expression ')'"
-    p[0] = ASTNODE("expression", children=[p[3]])
+    p[0] = new_node(p, "expression", value="sin", children=[p[3]])
 
 def p_COS(p):
     "expression : COS '(' expression ')'"
-    p[0] = ASTNODE("expression", children=[p[3]])
+    p[0] = new_node(p, "expression", value="cos", children=[p[3]])
 
 def p_TAN(p):
     "expression : TAN '(' expression ')'"
-    p[0] = ASTNODE("expression", children=[p[3]])
+    p[0] = new_node(p, "expression", value="tan", children=[p[3]])
 
 def p_MIN(p):
     "expression : MIN '(' expression ',' expression ')'"
-    p[0] = ASTNODE("expression", children=[p[3], p[5]])
+    p[0] = new_node(p, "expression", value="min", children=[p[3], p[5]])
 
 def p_MAX(p):
     "expression : MAX '(' expression ',' expression ')'"
-    p[0] = ASTNODE("expression", children=[p[3], p[5]])
+    p[0] = new_node(p, "expression", value="max", children=[p[3], p[5]])
 
 # a p_error(p) rule is required
 def p_error(p):
@@ -472,35 +521,16 @@ def p_error(p):
         print("Syntax error at EOF")
 
 
-parser = yacc.yacc()
+parser = yacc.yacc(**grammar_cache.yacc_options())
+parser.node_class = ASTNODE  # or any class with the same constructor, like SlotNode
+grammar_cache.compile_tables()
 
 # ------------------------------------------------ STEP 4: USE THE PARSER
 
-ast_stack = Stack()
-
-
-def interpret_ast(_node: ASTNODE) -> None:
-    global ast_stack
-    if _node.name == "program":
-        for child in _node.children:
-            interpret_ast(child)
-    elif _node.name == "statement":
-        for child in _node.children:
-            interpret_ast(child)
-    elif _node.name == "print":
-        for child in _node.children:
-            interpret_ast(child)
-        print(ast_stack.pop())
-    elif _node.name == "expression":
-        for child in _node.children:
-            interpret_ast(child)
-    elif _node.name == "number":
-        ast_stack.push(_node.value)
-    elif _node.name == "string":
-        ast_stack.push(_node.value)
-    else:
-        raise "Unknown node name {}".format(_node.name)
-   
+# compile the program to bytecode and run it, see Bytecode.py; output goes to stream, stdout by default
+def interpret_ast(_node: ASTNODE, stream=None) -> None:
+    VirtualMachine(stream).run(BytecodeCompiler().compile(_node))
+
 
 if __name__ == "__main__":
 
@@ -543,7 +573,7 @@ if __name__ == "__main__":
     }   
     fmt.Println(ans)
     """
-    yacc.parse(prg5, debug=0)
+    program = yacc.parse(prg5, debug=0)
 
     # prg6 = """var n = 10
     # if n <= 0 {fmt.Println(0)} else {
@@ -559,21 +589,19 @@ if __name__ == "__main__":
     # }
     # """
     # show_tokenization(prg6)
-    # yacc.parse(prg6, debug=1)
+    # program = yacc.parse(prg6, debug=1)
     # program.value = {"name" : "Test Program"}
 
 
     # source_code = "18+17"
-    # yacc.parse(source_code, debug=0)
+    # program = yacc.parse(source_code, debug=0)
    
     if program is None:
         print("No AST")
    
     ASTNODE.render_tree(program)
-    emitter = MIPS32Emitter()
-    print(".data")
-    print("x_00000:    .word 0")
-    print("ans_00000:  .word 0")
-    print(".text")
-    emitter.emit_ast(program)
+    ConstantFolder().fold(program)
+    LoopOptimizer().optimize(program)
+    emitter = MIPS32Emitter(PrintSink())
+    emitter.emit_program(program)  # writes the .data and .text sections
     quit(0)
@@ -0,0 +1,7 @@
+"""
+Author: Thao Pham
+Created: 2026-10-18
+Purpose: Generated PLY lexer and parser tables for go_grammar, see GrammarCache.py.
+Course: CSC 486 - Compilers Design and Implementation
+
+"""
@@ -1,89 +0,0 @@
-
-# parsetab.py
-# This file is automatically generated. Do not edit.
-# pylint: disable=W,C,R
-_tabversion = '3.10'
-
-_lr_method = 'LALR'
-
-_lr_signature = "programnonassocIFnonassocELSEleftLTLEEQNEQGEGTleftPLUSMINUSleftTIMESDIVIDEMODrightUMINUSABS COS DIVIDE DQ_STRING ELSE EQ FALSE FMT_PRINT FMT_PRINTF FMT_PRINTLN FOR GE GT IF LE LT MAX MIN MINUS MOD NAME NEQ NUMBER PLUS PRINT PRINTF PRINTLN SIN SQ_STRING TAN TIMES TRUE UMINUS VARprogram : statement_list\n    statement_list : statement_list statement \n                | statement\n    \n    block_statement : '{' statement_list '}'\n    statement : all_prints\n                | assign \n                | if_statement\n                | for\n                | expression\n    all_prints : print\n                | println\n                | printf\n                | fmt_print\n                | fmt_println\n                | fmt_printf\n    \n    if_statement : IF assign block_statement ELSE block_statement\n                 | IF assign block_statement \n    \n    for : FOR assign block_statement\n        | FOR assign ';' expression ';' statement block_statement\n    \n    expression : number\n                | name  \n                | assign \n                | expression PLUS expression\n                | expression MINUS expression\n                | expression TIMES expression\n                | expression DIVIDE expression\n                | expression MOD expression\n                | expression LT expression\n                | expression LE expression\n                | expression EQ expression\n                | expression NEQ expression\n                | expression GE expression\n                | expression GT expression\n                | expression ',' expression\n     \n    expression : '(' expression ')'\n    expression : '-' expression %prec UMINUSnumber : NUMBERname : NAME \n    assign : name '=' expression\n            | VAR name '=' expression\n            | name GT expression\n            | name LT expression\n            | name LE expression\n            | name EQ expression\n    expression : stringstring : SQ_STRING\n             | DQ_STRING\n   print : PRINT '(' expression ')'println : PRINTLN '(' expression ')'printf : PRINTF '(' expression ')'fmt_print : FMT_PRINT '(' expression ')'fmt_println : FMT_PRINTLN '(' expression ')'fmt_printf : FMT_PRINTF '(' expression ')'expression : ABS '(' expression ')'expression : SIN '(' expression ')'expression : COS '(' expression ')'expression : TAN '(' expression ')'expression : MIN '(' expression ',' expression ')'expression : MAX '(' expression ',' expression ')'"
-    
-_lr_action_items = {'VAR':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,17,18,19,20,21,22,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,112,114,116,117,118,119,120,121,122,123,124,125,126,127,128,129,130,134,135,136,],[16,16,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,16,16,-20,16,16,-45,-38,-37,-46,-47,-2,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,-21,-22,-36,16,16,16,16,16,16,16,16,16,16,16,16,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,16,-17,16,-18,16,-35,-40,16,-54,-55,-56,-57,16,16,-48,-49,-50,-51,-52,-53,-16,-4,16,-58,-59,-19,]),'IF':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,22,35,36,37,38,39,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,95,96,97,99,112,114,116,117,118,119,122,123,124,125,126,127,128,129,130,134,135,136,],[17,17,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,-45,-38,-37,-46,-47,-2,-21,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,-17,17,-18,-35,-40,17,-54,-55,-56,-57,-48,-49,-50,-51,-52,-53,-16,-4,17,-58,-59,-19,]),'FOR':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,22,35,36,37,38,39,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,95,96,97,99,112,114,116,117,118,119,122,123,124,125,126,127,128,129,130,134,135,136,],[18,18,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,-45,-38,-37,-46,-47,-2,-21,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,-17,18,-18,-35,-40,18,-54,-55,-56,-57,-48,-49,-50,-51,-52,-53,-16,-4,18,-58,-59,-19,]),'(':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,20,21,22,23,24,25,26,27,28,29,30,31,32,33,34,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,112,114,116,117,118,119,120,121,122,123,124,125,126,127,128,129,130,134,135,136,],[20,20,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,20,20,-45,65,66,67,68,69,70,71,72,73,74,75,76,-38,-37,-46,-47,-2,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,20,-21,-22,-36,20,20,20,20,20,20,20,20,20,20,20,20,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,20,-17,20,-18,20,-35,-40,20,-54,-55,-56,-57,20,20,-48,-49,-50,-51,-52,-53,-16,-4,20,-58,-59,-19,]),'-':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,20,21,22,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,112,114,116,117,118,119,120,121,122,123,124,125,126,127,128,129,130,134,135,136,],[21,21,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,21,21,-45,-38,-37,-46,-47,-2,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,21,-21,-22,-36,21,21,21,21,21,21,21,21,21,21,21,21,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,21,-17,21,-18,21,-35,-40,21,-54,-55,-56,-57,21,21,-48,-49,-50,-51,-52,-53,-16,-4,21,-58,-59,-19,]),'ABS':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,20,21,22,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,112,114,116,117,118,119,120,121,122,123,124,125,126,127,128,129,130,134,135,136,],[23,23,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,23,23,-45,-38,-37,-46,-47,-2,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,23,-21,-22,-36,23,23,23,23,23,23,23,23,23,23,23,23,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,23,-17,23,-18,23,-35,-40,23,-54,-55,-56,-57,23,23,-48,-49,-50,-51,-52,-53,-16,-4,23,-58,-59,-19,]),'SIN':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,20,21,22,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,112,114,116,117,118,119,120,121,122,123,124,125,126,127,128,129,130,134,135,136,],[24,24,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,24,24,-45,-38,-37,-46,-47,-2,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,24,-21,-22,-36,24,24,24,24,24,24,24,24,24,24,24,24,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,24,-17,24,-18,24,-35,-40,24,-54,-55,-56,-57,24,24,-48,-49,-50,-51,-52,-53,-16,-4,24,-58,-59,-19,]),'COS':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,20,21,22,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,112,114,116,117,118,119,120,121,122,123,124,125,126,127,128,129,130,134,135,136,],[25,25,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,25,25,-45,-38,-37,-46,-47,-2,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,25,-21,-22,-36,25,25,25,25,25,25,25,25,25,25,25,25,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,25,-17,25,-18,25,-35,-40,25,-54,-55,-56,-57,25,25,-48,-49,-50,-51,-52,-53,-16,-4,25,-58,-59,-19,]),'TAN':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,20,21,22,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,112,114,116,117,118,119,120,121,122,123,124,125,126,127,128,129,130,134,135,136,],[26,26,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,26,26,-45,-38,-37,-46,-47,-2,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,26,-21,-22,-36,26,26,26,26,26,26,26,26,26,26,26,26,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,26,-17,26,-18,26,-35,-40,26,-54,-55,-56,-57,26,26,-48,-49,-50,-51,-52,-53,-16,-4,26,-58,-59,-19,]),'MIN':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,20,21,22,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,112,114,116,117,118,119,120,121,122,123,124,125,126,127,128,129,130,134,135,136,],[27,27,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,27,27,-45,-38,-37,-46,-47,-2,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,-21,-22,-36,27,27,27,27,27,27,27,27,27,27,27,27,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,27,-17,27,-18,27,-35,-40,27,-54,-55,-56,-57,27,27,-48,-49,-50,-51,-52,-53,-16,-4,27,-58,-59,-19,]),'MAX':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,20,21,22,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,112,114,116,117,118,119,120,121,122,123,124,125,126,127,128,129,130,134,135,136,],[28,28,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,28,28,-45,-38,-37,-46,-47,-2,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,28,-21,-22,-36,28,28,28,28,28,28,28,28,28,28,28,28,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,28,-17,28,-18,28,-35,-40,28,-54,-55,-56,-57,28,28,-48,-49,-50,-51,-52,-53,-16,-4,28,-58,-59,-19,]),'PRINT':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,22,35,36,37,38,39,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,95,96,97,99,112,114,116,117,118,119,122,123,124,125,126,127,128,129,130,134,135,136,],[29,29,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,-45,-38,-37,-46,-47,-2,-21,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,-17,29,-18,-35,-40,29,-54,-55,-56,-57,-48,-49,-50,-51,-52,-53,-16,-4,29,-58,-59,-19,]),'PRINTLN':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,22,35,36,37,38,39,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,95,96,97,99,112,114,116,117,118,119,122,123,124,125,126,127,128,129,130,134,135,136,],[30,30,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,-45,-38,-37,-46,-47,-2,-21,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,-17,30,-18,-35,-40,30,-54,-55,-56,-57,-48,-49,-50,-51,-52,-53,-16,-4,30,-58,-59,-19,]),'PRINTF':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,22,35,36,37,38,39,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,95,96,97,99,112,114,116,117,118,119,122,123,124,125,126,127,128,129,130,134,135,136,],[31,31,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,-45,-38,-37,-46,-47,-2,-21,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,-17,31,-18,-35,-40,31,-54,-55,-56,-57,-48,-49,-50,-51,-52,-53,-16,-4,31,-58,-59,-19,]),'FMT_PRINT':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,22,35,36,37,38,39,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,95,96,97,99,112,114,116,117,118,119,122,123,124,125,126,127,128,129,130,134,135,136,],[32,32,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,-45,-38,-37,-46,-47,-2,-21,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,-17,32,-18,-35,-40,32,-54,-55,-56,-57,-48,-49,-50,-51,-52,-53,-16,-4,32,-58,-59,-19,]),'FMT_PRINTLN':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,22,35,36,37,38,39,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,95,96,97,99,112,114,116,117,118,119,122,123,124,125,126,127,128,129,130,134,135,136,],[33,33,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,-45,-38,-37,-46,-47,-2,-21,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,-17,33,-18,-35,-40,33,-54,-55,-56,-57,-48,-49,-50,-51,-52,-53,-16,-4,33,-58,-59,-19,]),'FMT_PRINTF':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,22,35,36,37,38,39,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,95,96,97,99,112,114,116,117,118,119,122,123,124,125,126,127,128,129,130,134,135,136,],[34,34,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,-45,-38,-37,-46,-47,-2,-21,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,-17,34,-18,-35,-40,34,-54,-55,-56,-57,-48,-49,-50,-51,-52,-53,-16,-4,34,-58,-59,-19,]),'NAME':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,16,17,18,19,20,21,22,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,112,114,116,117,118,119,120,121,122,123,124,125,126,127,128,129,130,134,135,136,],[35,35,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,35,35,35,-20,35,35,-45,-38,-37,-46,-47,-2,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,35,-21,-22,-36,35,35,35,35,35,35,35,35,35,35,35,35,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,35,-17,35,-18,35,-35,-40,35,-54,-55,-56,-57,35,35,-48,-49,-50,-51,-52,-53,-16,-4,35,-58,-59,-19,]),'NUMBER':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,20,21,22,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,112,114,116,117,118,119,120,121,122,123,124,125,126,127,128,129,130,134,135,136,],[36,36,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,36,36,-45,-38,-37,-46,-47,-2,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,36,-21,-22,-36,36,36,36,36,36,36,36,36,36,36,36,36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,36,-17,36,-18,36,-35,-40,36,-54,-55,-56,-57,36,36,-48,-49,-50,-51,-52,-53,-16,-4,36,-58,-59,-19,]),'SQ_STRING':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,20,21,22,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,112,114,116,117,118,119,120,121,122,123,124,125,126,127,128,129,130,134,135,136,],[37,37,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,37,37,-45,-38,-37,-46,-47,-2,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,-21,-22,-36,37,37,37,37,37,37,37,37,37,37,37,37,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,37,-17,37,-18,37,-35,-40,37,-54,-55,-56,-57,37,37,-48,-49,-50,-51,-52,-53,-16,-4,37,-58,-59,-19,]),'DQ_STRING':([0,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,20,21,22,35,36,37,38,39,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,62,63,64,65,66,67,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,94,95,96,97,98,99,112,114,116,117,118,119,120,121,122,123,124,125,126,127,128,129,130,134,135,136,],[38,38,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,38,38,-45,-38,-37,-46,-47,-2,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,38,-21,-22,-36,38,38,38,38,38,38,38,38,38,38,38,38,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,38,-17,38,-18,38,-35,-40,38,-54,-55,-56,-57,38,38,-48,-49,-50,-51,-52,-53,-16,-4,38,-58,-59,-19,]),'$end':([1,2,3,4,5,6,7,8,9,10,11,12,13,14,15,19,22,35,36,37,38,39,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,95,97,99,112,116,117,118,119,122,123,124,125,126,127,128,129,134,135,136,],[0,-1,-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,-45,-38,-37,-46,-47,-2,-21,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,-17,-18,-35,-40,-54,-55,-56,-57,-48,-49,-50,-51,-52,-53,-16,-4,-58,-59,-19,]),'}':([3,4,5,6,7,8,9,10,11,12,13,14,15,19,22,35,36,37,38,39,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,95,97,99,112,114,116,117,118,119,122,123,124,125,126,127,128,129,134,135,136,],[-3,-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,-45,-38,-37,-46,-47,-2,-21,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,-17,-18,-35,-40,129,-54,-55,-56,-57,-48,-49,-50,-51,-52,-53,-16,-4,-58,-59,-19,]),'{':([4,5,6,7,8,9,10,11,12,13,14,15,19,22,35,36,37,38,58,60,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,95,97,99,112,113,116,117,118,119,122,123,124,125,126,127,128,129,133,134,135,136,],[-5,-6,-7,-8,-9,-10,-11,-12,-13,-14,-15,-21,-20,-45,-38,-37,-46,-47,96,96,-21,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,-17,-18,-35,-40,96,-54,-55,-56,-57,-48,-49,-50,-51,-52,-53,-16,-4,96,-58,-59,-19,]),'PLUS':([5,8,15,19,22,35,36,37,38,61,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,99,100,101,102,103,104,105,106,107,108,109,110,111,112,115,116,117,118,119,131,132,134,135,],[-22,40,-21,-20,-45,-38,-37,-46,-47,40,-21,-22,-36,-23,-24,-25,-26,-27,40,40,40,40,40,40,40,40,40,40,40,40,-35,40,40,40,40,40,40,40,40,40,40,40,40,40,40,-54,-55,-56,-57,40,40,-58,-59,]),'MINUS':([5,8,15,19,22,35,36,37,38,61,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,99,100,101,102,103,104,105,106,107,108,109,110,111,112,115,116,117,118,119,131,132,134,135,],[-22,41,-21,-20,-45,-38,-37,-46,-47,41,-21,-22,-36,-23,-24,-25,-26,-27,41,41,41,41,41,41,41,41,41,41,41,41,-35,41,41,41,41,41,41,41,41,41,41,41,41,41,41,-54,-55,-56,-57,41,41,-58,-59,]),'TIMES':([5,8,15,19,22,35,36,37,38,61,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,99,100,101,102,103,104,105,106,107,108,109,110,111,112,115,116,117,118,119,131,132,134,135,],[-22,42,-21,-20,-45,-38,-37,-46,-47,42,-21,-22,-36,42,42,-25,-26,-27,42,42,42,42,42,42,42,42,42,42,42,42,-35,42,42,42,42,42,42,42,42,42,42,42,42,42,42,-54,-55,-56,-57,42,42,-58,-59,]),'DIVIDE':([5,8,15,19,22,35,36,37,38,61,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,99,100,101,102,103,104,105,106,107,108,109,110,111,112,115,116,117,118,119,131,132,134,135,],[-22,43,-21,-20,-45,-38,-37,-46,-47,43,-21,-22,-36,43,43,-25,-26,-27,43,43,43,43,43,43,43,43,43,43,43,43,-35,43,43,43,43,43,43,43,43,43,43,43,43,43,43,-54,-55,-56,-57,43,43,-58,-59,]),'MOD':([5,8,15,19,22,35,36,37,38,61,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,99,100,101,102,103,104,105,106,107,108,109,110,111,112,115,116,117,118,119,131,132,134,135,],[-22,44,-21,-20,-45,-38,-37,-46,-47,44,-21,-22,-36,44,44,-25,-26,-27,44,44,44,44,44,44,44,44,44,44,44,44,-35,44,44,44,44,44,44,44,44,44,44,44,44,44,44,-54,-55,-56,-57,44,44,-58,-59,]),'LT':([5,8,15,19,22,35,36,37,38,59,61,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,99,100,101,102,103,104,105,106,107,108,109,110,111,112,115,116,117,118,119,131,132,134,135,],[-22,45,54,-20,-45,-38,-37,-46,-47,54,45,54,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,45,45,-41,-42,-43,-44,-35,45,45,45,45,45,45,45,45,45,45,45,45,45,45,-54,-55,-56,-57,45,45,-58,-59,]),'LE':([5,8,15,19,22,35,36,37,38,59,61,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,99,100,101,102,103,104,105,106,107,108,109,110,111,112,115,116,117,118,119,131,132,134,135,],[-22,46,55,-20,-45,-38,-37,-46,-47,55,46,55,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,46,46,-41,-42,-43,-44,-35,46,46,46,46,46,46,46,46,46,46,46,46,46,46,-54,-55,-56,-57,46,46,-58,-59,]),'EQ':([5,8,15,19,22,35,36,37,38,59,61,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,99,100,101,102,103,104,105,106,107,108,109,110,111,112,115,116,117,118,119,131,132,134,135,],[-22,47,56,-20,-45,-38,-37,-46,-47,56,47,56,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,47,47,-41,-42,-43,-44,-35,47,47,47,47,47,47,47,47,47,47,47,47,47,47,-54,-55,-56,-57,47,47,-58,-59,]),'NEQ':([5,8,15,19,22,35,36,37,38,61,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,99,100,101,102,103,104,105,106,107,108,109,110,111,112,115,116,117,118,119,131,132,134,135,],[-22,48,-21,-20,-45,-38,-37,-46,-47,48,-21,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,48,48,-41,-42,-43,-44,-35,48,48,48,48,48,48,48,48,48,48,48,48,48,48,-54,-55,-56,-57,48,48,-58,-59,]),'GE':([5,8,15,19,22,35,36,37,38,61,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,99,100,101,102,103,104,105,106,107,108,109,110,111,112,115,116,117,118,119,131,132,134,135,],[-22,49,-21,-20,-45,-38,-37,-46,-47,49,-21,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,49,49,-41,-42,-43,-44,-35,49,49,49,49,49,49,49,49,49,49,49,49,49,49,-54,-55,-56,-57,49,49,-58,-59,]),'GT':([5,8,15,19,22,35,36,37,38,59,61,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,99,100,101,102,103,104,105,106,107,108,109,110,111,112,115,116,117,118,119,131,132,134,135,],[-22,50,53,-20,-45,-38,-37,-46,-47,53,50,53,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,50,50,-41,-42,-43,-44,-35,50,50,50,50,50,50,50,50,50,50,50,50,50,50,-54,-55,-56,-57,50,50,-58,-59,]),',':([5,8,15,19,22,35,36,37,38,61,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,99,100,101,102,103,104,105,106,107,108,109,110,111,112,115,116,117,118,119,131,132,134,135,],[-22,51,-21,-20,-45,-38,-37,-46,-47,51,-21,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,51,51,-41,-42,-43,-44,-35,51,51,51,51,120,121,51,51,51,51,51,51,51,51,-54,-55,-56,-57,51,51,-58,-59,]),'=':([15,35,57,59,62,],[52,-38,94,52,52,]),')':([19,22,35,36,37,38,61,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,99,100,101,102,103,106,107,108,109,110,111,112,116,117,118,119,131,132,134,135,],[-20,-45,-38,-37,-46,-47,99,-21,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,-35,116,117,118,119,122,123,124,125,126,127,-40,-54,-55,-56,-57,134,135,-58,-59,]),';':([19,22,35,36,37,38,60,62,63,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,99,112,115,116,117,118,119,134,135,],[-20,-45,-38,-37,-46,-47,98,-21,-22,-36,-23,-24,-25,-26,-27,-28,-29,-30,-31,-32,-33,-34,-39,-41,-42,-43,-44,-35,-40,130,-54,-55,-56,-57,-58,-59,]),'ELSE':([95,129,],[113,-4,]),}
-
-_lr_action = {}
-for _k, _v in _lr_action_items.items():
-   for _x,_y in zip(_v[0],_v[1]):
-      if not _x in _lr_action:  _lr_action[_x] = {}
-      _lr_action[_x][_k] = _y
-del _lr_action_items
-
-_lr_goto_items = {'program':([0,],[1,]),'statement_list':([0,96,],[2,114,]),'statement':([0,2,96,114,130,],[3,39,3,39,133,]),'all_prints':([0,2,96,114,130,],[4,4,4,4,4,]),'assign':([0,2,17,18,20,21,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,65,66,67,68,69,70,71,72,73,74,75,76,94,96,98,114,120,121,130,],[5,5,58,60,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,5,63,5,63,63,5,]),'if_statement':([0,2,96,114,130,],[6,6,6,6,6,]),'for':([0,2,96,114,130,],[7,7,7,7,7,]),'expression':([0,2,20,21,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,65,66,67,68,69,70,71,72,73,74,75,76,94,96,98,114,120,121,130,],[8,8,61,64,77,78,79,80,81,82,83,84,85,86,87,88,89,90,91,92,93,100,101,102,103,104,105,106,107,108,109,110,111,112,8,115,8,131,132,8,]),'print':([0,2,96,114,130,],[9,9,9,9,9,]),'println':([0,2,96,114,130,],[10,10,10,10,10,]),'printf':([0,2,96,114,130,],[11,11,11,11,11,]),'fmt_print':([0,2,96,114,130,],[12,12,12,12,12,]),'fmt_println':([0,2,96,114,130,],[13,13,13,13,13,]),'fmt_printf':([0,2,96,114,130,],[14,14,14,14,14,]),'name':([0,2,16,17,18,20,21,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,65,66,67,68,69,70,71,72,73,74,75,76,94,96,98,114,120,121,130,],[15,15,57,59,59,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,15,62,15,62,62,15,]),'number':([0,2,20,21,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,65,66,67,68,69,70,71,72,73,74,75,76,94,96,98,114,120,121,130,],[19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,19,]),'string':([0,2,20,21,40,41,42,43,44,45,46,47,48,49,50,51,52,53,54,55,56,65,66,67,68,69,70,71,72,73,74,75,76,94,96,98,114,120,121,130,],[22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,22,]),'block_statement':([58,60,113,133,],[95,97,128,136,]),}
-
-_lr_goto = {}
-for _k, _v in _lr_goto_items.items():
-   for _x, _y in zip(_v[0], _v[1]):
-       if not _x in _lr_goto: _lr_goto[_x] = {}
-       _lr_goto[_x][_k] = _y
-del _lr_goto_items
-_lr_productions = [
-  ("S' -> program","S'",1,None,None,None),
-  ('program -> statement_list','program',1,'p_PROGRAM','go_grammar.py',288),
-  ('statement_list -> statement_list statement','statement_list',2,'p_STATEMENTS','go_grammar.py',294),
-  ('statement_list -> statement','statement_list',1,'p_STATEMENTS','go_grammar.py',295),
-  ('block_statement -> { statement_list }','block_statement',3,'p_BLOCK_STATEMENT','go_grammar.py',307),
-  ('statement -> all_prints','statement',1,'p_STATEMENT','go_grammar.py',312),
-  ('statement -> assign','statement',1,'p_STATEMENT','go_grammar.py',313),
-  ('statement -> if_statement','statement',1,'p_STATEMENT','go_grammar.py',314),
-  ('statement -> for','statement',1,'p_STATEMENT','go_grammar.py',315),
-  ('statement -> expression','statement',1,'p_STATEMENT','go_grammar.py',316),
-  ('all_prints -> print','all_prints',1,'p_all_prints','go_grammar.py',321),
-  ('all_prints -> println','all_prints',1,'p_all_prints','go_grammar.py',322),
-  ('all_prints -> printf','all_prints',1,'p_all_prints','go_grammar.py',323),
-  ('all_prints -> fmt_print','all_prints',1,'p_all_prints','go_grammar.py',324),
-  ('all_prints -> fmt_println','all_prints',1,'p_all_prints','go_grammar.py',325),
-  ('all_prints -> fmt_printf','all_prints',1,'p_all_prints','go_grammar.py',326),
-  ('if_statement -> IF assign block_statement ELSE block_statement','if_statement',5,'p_if_statement','go_grammar.py',332),
-  ('if_statement -> IF assign block_statement','if_statement',3,'p_if_statement','go_grammar.py',333),
-  ('for -> FOR assign block_statement','for',3,'p_for','go_grammar.py',339),
-  ('for -> FOR assign ; expression ; statement block_statement','for',7,'p_for','go_grammar.py',340),
-  ('expression -> number','expression',1,'p_EXPRESSION','go_grammar.py',349),
-  ('expression -> name','expression',1,'p_EXPRESSION','go_grammar.py',350),
-  ('expression -> assign','expression',1,'p_EXPRESSION','go_grammar.py',351),
-  ('expression -> expression PLUS expression','expression',3,'p_EXPRESSION','go_grammar.py',352),
-  ('expression -> expression MINUS expression','expression',3,'p_EXPRESSION','go_grammar.py',353),
-  ('expression -> expression TIMES expression','expression',3,'p_EXPRESSION','go_grammar.py',354),
-  ('expression -> expression DIVIDE expression','expression',3,'p_EXPRESSION','go_grammar.py',355),
-  ('expression -> expression MOD expression','expression',3,'p_EXPRESSION','go_grammar.py',356),
-  ('expression -> expression LT expression','expression',3,'p_EXPRESSION','go_grammar.py',357),
-  ('expression -> expression LE expression','expression',3,'p_EXPRESSION','go_grammar.py',358),
-  ('expression -> expression EQ expression','expression',3,'p_EXPRESSION','go_grammar.py',359),
-  ('expression -> expression NEQ expression','expression',3,'p_EXPRESSION','go_grammar.py',360),
-  ('expression -> expression GE expression','expression',3,'p_EXPRESSION','go_grammar.py',361),
-  ('expression -> expression GT expression','expression',3,'p_EXPRESSION','go_grammar.py',362),
-  ('expression -> expression , expression','expression',3,'p_EXPRESSION','go_grammar.py',363),
-  ('expression -> ( expression )','expression',3,'p_GROUP','go_grammar.py',372),
-  ('expression -> - expression','expression',2,'p_expression_UMINUS','go_grammar.py',377),
-  ('number -> NUMBER','number',1,'p_number','go_grammar.py',381),
-  ('name -> NAME','name',1,'p_NAME','go_grammar.py',385),
-  ('assign -> name = expression','assign',3,'p_ASSIGN','go_grammar.py',390),
-  ('assign -> VAR name = expression','assign',4,'p_ASSIGN','go_grammar.py',391),
-  ('assign -> name GT expression','assign',3,'p_ASSIGN','go_grammar.py',392),
-  ('assign -> name LT expression','assign',3,'p_ASSIGN','go_grammar.py',393),
-  ('assign -> name LE expression','assign',3,'p_ASSIGN','go_grammar.py',394),
-  ('assign -> name EQ expression','assign',3,'p_ASSIGN','go_grammar.py',395),
-  ('expression -> string','expression',1,'p_STRING','go_grammar.py',403),
-  ('string -> SQ_STRING','string',1,'p_EXPRESSION_STRINGS','go_grammar.py',407),
-  ('string -> DQ_STRING','string',1,'p_EXPRESSION_STRINGS','go_grammar.py',408),
-  ('print -> PRINT ( expression )','print',4,'p_PRINT','go_grammar.py',415),
-  ('println -> PRINTLN ( expression )','println',4,'p_PRINTLN','go_grammar.py',419),
-  ('printf -> PRINTF ( expression )','printf',4,'p_PRINTF','go_grammar.py',423),
-  ('fmt_print -> FMT_PRINT ( expression )','fmt_print',4,'p_FMT_PRINT','go_grammar.py',427),
-  ('fmt_println -> FMT_PRINTLN ( expression )','fmt_println',4,'p_FMT_PRINTLN','go_grammar.py',431),
-  ('fmt_printf -> FMT_PRINTF ( expression )','fmt_printf',4,'p_FMT_PRINTF','go_grammar.py',435),
-  ('expression -> ABS ( expression )','expression',4,'p_ABS','go_grammar.py',441),
-  ('expression -> SIN ( expression )','expression',4,'p_SIN','go_grammar.py',445),
-  ('expression -> COS ( expression )','expression',4,'p_COS','go_grammar.py',449),
-  ('expression -> TAN ( expression )','expression',4,'p_TAN','go_grammar.py',453),
-  ('expression -> MIN ( expression , expression )','expression',6,'p_MIN','go_grammar.py',457),
-  ('expression -> MAX ( expression , expression )','expression',6,'p_MAX','go_grammar.py',461),
-]